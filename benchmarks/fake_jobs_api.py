@@ -0,0 +1,337 @@
+import json
+import random
+import re
+import threading
+import time
+import uuid
+from collections import Counter
+from datetime import datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, NamedTuple, Optional
+from urllib.parse import parse_qs, urlparse
+
+from dagster_scaleway.metrics import get_api_operation
+
+PATH_RE = re.compile(
+    r"^/serverless-jobs/v1alpha1/regions/(?P<region>[^/]+)/"
+    r"(?P<collection>job-definitions|job-runs)(?:/(?P<id>[^/]+))?(?:/(?P<action>start|stop))?$"
+)
+
+# Project of the pre-existing job definitions, to use as SCW_DEFAULT_PROJECT_ID
+FAKE_PROJECT_ID = str(uuid.UUID(int=0))
+
+
+class FakeJobsApiConfig(NamedTuple):
+    # Added to every request, uniformly jittered by latency_jitter
+    latency: float = 0.0
+    latency_jitter: float = 0.0
+    # Page sizes above this are truncated, like the real API does
+    max_page_size: int = 100
+    # Job definitions existing before the benchmark starts
+    job_definitions: int = 0
+    # Fraction of the requests answered with error_status instead of being handled
+    error_rate: float = 0.0
+    error_status: int = 503
+    # Time job runs spend queued, then running (forever if None)
+    queue_time: float = 0.0
+    run_time: Optional[float] = None
+    # Whether stopping a queued job run is refused, like the API may do
+    refuse_stopping_queued: bool = False
+    # Regions where starting a job run fails with a quota error
+    quota_exceeded_regions: tuple[str, ...] = ()
+    seed: int = 0
+
+
+def _format_datetime(value: Optional[datetime]) -> Optional[str]:
+    return value.isoformat() if value else None
+
+
+class FakeJobsApi:
+    """In-process HTTP stand-in for the Serverless Jobs v1alpha1 endpoints used by the
+    launcher, to point `SCW_API_URL` at.
+
+    Everything is kept in memory. Job runs move from queued to running to succeeded
+    with time, and every request is counted by operation in `request_counts`.
+    """
+
+    def __init__(self, config: FakeJobsApiConfig = FakeJobsApiConfig()):
+        self.config = config
+        self.request_counts: Counter[str] = Counter()
+        self._lock = threading.Lock()
+        self._random = random.Random(config.seed)
+        self._job_definitions: dict[str, dict[str, Any]] = {}
+        self._job_runs: dict[str, dict[str, Any]] = {}
+        # Monotonic creation time of the job runs, to advance their state
+        self._job_run_clock: dict[str, float] = {}
+        self._server: Optional[ThreadingHTTPServer] = None
+
+        created_at = datetime.now(timezone.utc) - timedelta(days=1)
+        for i in range(config.job_definitions):
+            self._create_job_definition(
+                {
+                    "name": f"existing-{i}",
+                    "description": "Pre-existing job definition",
+                    "image_uri": "rg.fr-par.scw.cloud/benchmark/existing:latest",
+                    "command": "true",
+                    "cpu_limit": 1000,
+                    "memory_limit": 2048,
+                    "environment_variables": {},
+                    "project_id": FAKE_PROJECT_ID,
+                },
+                "fr-par",
+                created_at + timedelta(seconds=i),
+            )
+
+    @property
+    def url(self) -> str:
+        server = self._server
+        assert server is not None, "The fake API is not started"
+        return f"http://127.0.0.1:{server.server_port}"
+
+    def start(self) -> "FakeJobsApi":
+        api = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            # Headers and body in one segment, delayed ACKs would add 40ms otherwise
+            wbufsize = -1
+            disable_nagle_algorithm = True
+
+            def _handle(self):
+                length = int(self.headers.get("Content-Length") or 0)
+                body = json.loads(self.rfile.read(length)) if length else {}
+                status, payload = api.handle(self.command, self.path, body)
+                data = payload.encode("utf8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            do_GET = do_POST = do_PATCH = do_DELETE = _handle
+
+            def log_message(self, format, *args):
+                pass
+
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self._server.daemon_threads = True
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        return self
+
+    def stop(self) -> None:
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+    def __enter__(self) -> "FakeJobsApi":
+        return self.start()
+
+    def __exit__(self, *exc_info) -> None:
+        self.stop()
+
+    def reset_counts(self) -> Counter[str]:
+        with self._lock:
+            counts, self.request_counts = self.request_counts, Counter()
+        return counts
+
+    def handle(self, method: str, raw_path: str, body: dict) -> tuple[int, str]:
+        """Answers a request with its status and JSON body."""
+        url = urlparse(raw_path)
+        params = {key: values[-1] for key, values in parse_qs(url.query).items()}
+        _, operation = get_api_operation(method, url.path)
+
+        config = self.config
+        with self._lock:
+            self.request_counts[operation] += 1
+            delay = config.latency + self._random.uniform(0, config.latency_jitter)
+            inject_error = self._random.random() < config.error_rate
+        if delay:
+            time.sleep(delay)
+        if inject_error:
+            return config.error_status, json.dumps(
+                {
+                    "message": "Injected error",
+                    "type": "too_many_requests"
+                    if config.error_status == 429
+                    else "internal_error",
+                }
+            )
+
+        match = PATH_RE.match(url.path)
+        if match is None:
+            return 404, json.dumps({"message": "Unknown path", "type": "not_found"})
+
+        # Serialized under the lock, the resources are mutated by concurrent requests
+        with self._lock:
+            status, payload = self._route(
+                method,
+                match.group("region"),
+                match.group("collection"),
+                match.group("id"),
+                match.group("action"),
+                params,
+                body,
+            )
+            return status, json.dumps(payload)
+
+    def _route(
+        self,
+        method: str,
+        region: str,
+        collection: str,
+        resource_id: Optional[str],
+        action: Optional[str],
+        params: dict[str, str],
+        body: dict,
+    ) -> tuple[int, Any]:
+        if collection == "job-definitions":
+            if resource_id is None:
+                if method == "GET":
+                    return 200, self._list(
+                        self._job_definitions, "job_definitions", params
+                    )
+                if method == "POST":
+                    return 200, self._create_job_definition(
+                        body, region, datetime.now(timezone.utc)
+                    )
+            else:
+                job_def = self._job_definitions.get(resource_id)
+                if job_def is None:
+                    return 404, {"message": "Job definition not found"}
+                if action == "start" and method == "POST":
+                    if region in self.config.quota_exceeded_regions:
+                        return 403, {
+                            "message": "Quota exceeded for job runs",
+                            "type": "quotas_exceeded",
+                        }
+                    return 200, {"job_runs": [self._start(job_def, body)]}
+                if action is None and method == "GET":
+                    return 200, job_def
+                if action is None and method == "PATCH":
+                    job_def.update(
+                        {key: value for key, value in body.items() if value is not None}
+                    )
+                    job_def["updated_at"] = _format_datetime(datetime.now(timezone.utc))
+                    return 200, job_def
+                if action is None and method == "DELETE":
+                    del self._job_definitions[resource_id]
+                    return 204, {}
+        else:
+            if resource_id is None and method == "GET":
+                for job_run in self._job_runs.values():
+                    self._advance(job_run)
+                return 200, self._list(self._job_runs, "job_runs", params)
+            job_run = self._job_runs.get(resource_id or "")
+            if job_run is None:
+                return 404, {"message": "Job run not found"}
+            self._advance(job_run)
+            if action is None and method == "GET":
+                return 200, job_run
+            if action == "stop" and method == "POST":
+                if self.config.refuse_stopping_queued and job_run["state"] == "queued":
+                    return 412, {
+                        "message": "Job run has not started yet",
+                        "type": "precondition_failed",
+                    }
+                self._terminate(job_run, "canceled")
+                return 200, job_run
+
+        return 405, {"message": "Method not allowed"}
+
+    def _list(
+        self, resources: dict[str, dict[str, Any]], key: str, params: dict[str, str]
+    ) -> dict[str, Any]:
+        items = list(resources.values())
+        if params.get("project_id"):
+            items = [
+                item
+                for item in items
+                if item.get("project_id", params["project_id"]) == params["project_id"]
+            ]
+        # Resources are kept in creation order
+        if params.get("order_by", "created_at_asc").endswith("_desc"):
+            items.reverse()
+        page = int(params.get("page", 1))
+        page_size = min(int(params.get("page_size", 20)), self.config.max_page_size)
+        return {
+            key: items[(page - 1) * page_size : page * page_size],
+            "total_count": len(items),
+        }
+
+    def _create_job_definition(
+        self, body: dict, region: str, created_at: datetime
+    ) -> dict[str, Any]:
+        job_def = {
+            "id": str(uuid.uuid4()),
+            "name": body.get("name", ""),
+            "description": body.get("description", ""),
+            "image_uri": body.get("image_uri", ""),
+            "command": body.get("command", ""),
+            "cpu_limit": body.get("cpu_limit", 0),
+            "memory_limit": body.get("memory_limit", 0),
+            "environment_variables": body.get("environment_variables") or {},
+            "project_id": body.get("project_id"),
+            "local_storage_capacity": body.get("local_storage_capacity") or 0,
+            "job_timeout": body.get("job_timeout"),
+            "cron_schedule": None,
+            "region": region,
+            "created_at": _format_datetime(created_at),
+            "updated_at": _format_datetime(created_at),
+        }
+        self._job_definitions[job_def["id"]] = job_def
+        return job_def
+
+    def _start(self, job_def: dict[str, Any], body: dict) -> dict[str, Any]:
+        now = datetime.now(timezone.utc)
+        job_run = {
+            "id": str(uuid.uuid4()),
+            "job_definition_id": job_def["id"],
+            "project_id": job_def["project_id"],
+            "state": "queued",
+            "created_at": _format_datetime(now),
+            "updated_at": _format_datetime(now),
+            "terminated_at": None,
+            "exit_code": None,
+            "run_duration": None,
+            "error_message": "",
+            "cpu_limit": job_def["cpu_limit"],
+            "memory_limit": job_def["memory_limit"],
+            "command": job_def["command"],
+            "environment_variables": body.get("environment_variables")
+            or job_def["environment_variables"],
+            "local_storage_capacity": job_def["local_storage_capacity"],
+            "region": job_def["region"],
+        }
+        self._job_runs[job_run["id"]] = job_run
+        self._job_run_clock[job_run["id"]] = time.monotonic()
+        return job_run
+
+    def _advance(self, job_run: dict[str, Any]) -> None:
+        if job_run["state"] not in ("queued", "running"):
+            return
+        elapsed = time.monotonic() - self._job_run_clock[job_run["id"]]
+        config = self.config
+        if (
+            config.run_time is not None
+            and elapsed >= config.queue_time + config.run_time
+        ):
+            self._terminate(job_run, "succeeded", exit_code=0)
+        elif elapsed >= config.queue_time and job_run["state"] == "queued":
+            job_run["state"] = "running"
+            job_run["updated_at"] = _format_datetime(datetime.now(timezone.utc))
+
+    def _terminate(
+        self, job_run: dict[str, Any], state: str, exit_code: Optional[int] = None
+    ) -> None:
+        now = datetime.now(timezone.utc)
+        job_run["state"] = state
+        job_run["exit_code"] = exit_code
+        job_run["updated_at"] = job_run["terminated_at"] = _format_datetime(now)
+        ran_for = max(
+            time.monotonic()
+            - self._job_run_clock[job_run["id"]]
+            - self.config.queue_time,
+            0.0,
+        )
+        job_run["run_duration"] = f"{ran_for:.3f}s"
@@ -0,0 +1,371 @@
+"""Benchmarks the run launcher against the fake Jobs API.
+
+    python -m benchmarks.harness --baseline benchmarks/baseline.json
+
+Measures the throughput and latency of `launch_run`, `check_run_worker_health` and
+`terminate`, and the number of Scaleway API requests each of them costs. With
+`--baseline`, exits with an error when a result regressed beyond the tolerance.
+"""
+
+import argparse
+import functools
+import json
+import logging
+import math
+import os
+import sys
+import tempfile
+import threading
+import time
+import uuid
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, NamedTuple, Optional, Sequence, TypeVar
+
+from dagster import DagsterInstance, job, op
+from dagster._core.definitions.reconstruct import ReconstructableJob
+from dagster._core.instance import InstanceRef, InstanceType
+from dagster._core.launcher import LaunchRunContext
+from dagster._core.run_coordinator import DefaultRunCoordinator
+from dagster._core.storage.event_log import InMemoryEventLogStorage
+from dagster._core.storage.noop_compute_log_manager import NoOpComputeLogManager
+from dagster._core.storage.root import LocalArtifactStorage
+from dagster._core.storage.runs import InMemoryRunStorage
+
+from dagster_scaleway import ScalewayServerlessJobRunLauncher
+
+from .fake_jobs_api import FAKE_PROJECT_ID, FakeJobsApi, FakeJobsApiConfig
+
+BENCHMARK_OPS = 20
+
+NOISE_FLOOR_MS = 250
+
+# Factor by which API requests per call may grow, as they only vary with the
+# background refreshes racing a phase
+REQUESTS_TOLERANCE = 1.02
+
+T = TypeVar("T")
+
+
+def _make_op(i: int):
+    @op(name=f"op_{i}")
+    def _op():
+        pass
+
+    return _op
+
+
+_OPS = [_make_op(i) for i in range(BENCHMARK_OPS)]
+
+
+@job
+def benchmark_job():
+    for benchmark_op in _OPS:
+        benchmark_op()
+
+
+class PhaseResult(NamedTuple):
+    calls: int
+    errors: int
+    seconds: float
+    p50_ms: float
+    p99_ms: float
+    # Scaleway API requests per call
+    api_requests: float
+
+    @property
+    def throughput(self) -> float:
+        return self.calls / self.seconds if self.seconds else 0.0
+
+    def to_dict(self) -> dict[str, float]:
+        return {
+            "calls": self.calls,
+            "errors": self.errors,
+            "throughput": round(self.throughput, 2),
+            "p50_ms": round(self.p50_ms, 2),
+            "p99_ms": round(self.p99_ms, 2),
+            "api_requests": round(self.api_requests, 3),
+        }
+
+
+def _percentile(values: Sequence[float], pct: float) -> float:
+    ordered = sorted(values)
+    if not ordered:
+        return 0.0
+    return ordered[max(math.ceil(pct / 100 * len(ordered)), 1) - 1]
+
+
+def _serialized(storage: T) -> T:
+    """In-memory storages are SQLite databases too, failing the queries of threads
+    finding a table locked. Serialize them in process instead, which costs little
+    without a disk behind.
+    """
+    lock = threading.RLock()
+
+    def serialized(method):
+        @functools.wraps(method)
+        def wrapper(*args, **kwargs):
+            with lock:
+                return method(*args, **kwargs)
+
+        return wrapper
+
+    for name in dir(type(storage)):
+        if not name.startswith("_") and callable(getattr(type(storage), name)):
+            setattr(storage, name, serialized(getattr(storage, name)))
+    return storage
+
+
+def _in_memory_instance(dagster_home: str) -> DagsterInstance:
+    """An instance keeping runs and events in memory, so that latencies measure the
+    launcher rather than threads waiting on a SQLite file.
+
+    Unlike `DagsterInstance.ephemeral()`, it has a ref for the launcher to put in the
+    commands of the job runs, which the fake API never runs.
+    """
+    return DagsterInstance(
+        instance_type=InstanceType.EPHEMERAL,
+        local_artifact_storage=LocalArtifactStorage(dagster_home),
+        run_storage=_serialized(InMemoryRunStorage()),
+        event_storage=_serialized(InMemoryEventLogStorage()),
+        compute_log_manager=NoOpComputeLogManager(),
+        run_coordinator=DefaultRunCoordinator(),
+        run_launcher=None,
+        ref=InstanceRef.from_dir(dagster_home),
+    )
+
+
+def run_phase(
+    api: FakeJobsApi,
+    calls: Sequence[Callable[[], Any]],
+    concurrency: int,
+) -> PhaseResult:
+    errors: Counter[str] = Counter()
+
+    def timed(call: Callable[[], Any]) -> tuple[float, bool]:
+        started = time.perf_counter()
+        try:
+            call()
+            ok = True
+        except Exception as e:
+            errors[f"{type(e).__name__}: {e}"] += 1
+            ok = False
+        return time.perf_counter() - started, ok
+
+    api.reset_counts()
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        results = list(executor.map(timed, calls))
+    seconds = time.perf_counter() - started
+    requests = sum(api.reset_counts().values())
+    for error, count in errors.most_common(5):
+        print(f"{count} x {error}", file=sys.stderr)
+
+    latencies = [latency * 1000 for latency, _ in results]
+    return PhaseResult(
+        calls=len(calls),
+        errors=sum(1 for _, ok in results if not ok),
+        seconds=seconds,
+        p50_ms=_percentile(latencies, 50),
+        p99_ms=_percentile(latencies, 99),
+        api_requests=requests / len(calls) if calls else 0.0,
+    )
+
+
+def run_benchmark(args: argparse.Namespace) -> dict[str, dict[str, float]]:
+    config = FakeJobsApiConfig(
+        latency=args.latency,
+        latency_jitter=args.latency_jitter,
+        max_page_size=args.page_size,
+        job_definitions=args.job_definitions,
+        error_rate=args.error_rate,
+        error_status=args.error_status,
+    )
+    with FakeJobsApi(config) as api, tempfile.TemporaryDirectory() as dagster_home:
+        os.environ.update(
+            {
+                "SCW_API_URL": api.url,
+                "SCW_ACCESS_KEY": "SCWXXXXXXXXXXXXXXXXX",
+                "SCW_SECRET_KEY": str(uuid.uuid4()),
+                "SCW_DEFAULT_PROJECT_ID": FAKE_PROJECT_ID,
+                "SCW_DEFAULT_ORGANIZATION_ID": FAKE_PROJECT_ID,
+                "SCW_DEFAULT_REGION": "fr-par",
+            }
+        )
+        instance = _in_memory_instance(dagster_home)
+        launcher = ScalewayServerlessJobRunLauncher(
+            docker_image="rg.fr-par.scw.cloud/benchmark/launcher:latest",
+            region="fr-par",
+            launch_concurrency=args.concurrency,
+        )
+        launcher.register_instance(instance)
+
+        origin = ReconstructableJob.for_module(
+            __name__, benchmark_job.name
+        ).get_python_origin()
+        runs = [
+            instance.create_run_for_job(
+                job_def=benchmark_job,
+                job_code_origin=origin,
+                # Runs share a job definition per op, some definitions are reused
+                op_selection=[f"op_{i % BENCHMARK_OPS}"],
+            )
+            for i in range(args.runs)
+        ]
+
+        results = {
+            "launch_run": run_phase(
+                api,
+                [
+                    lambda run=run: launcher.launch_run(
+                        LaunchRunContext(dagster_run=run, workspace=None)
+                    )
+                    for run in runs
+                ],
+                args.concurrency,
+            )
+        }
+
+        runs = [instance.get_run_by_id(run.run_id) for run in runs]
+        results["check_run_worker_health"] = run_phase(
+            api,
+            [lambda run=run: launcher.check_run_worker_health(run) for run in runs],
+            args.concurrency,
+        )
+        results["terminate"] = run_phase(
+            api,
+            [lambda run=run: launcher.terminate(run.run_id) for run in runs],
+            args.concurrency,
+        )
+
+        launcher.dispose()
+        instance.dispose()
+
+    return {name: result.to_dict() for name, result in results.items()}
+
+
+def find_regressions(
+    results: dict[str, dict[str, float]],
+    baseline: dict[str, dict[str, float]],
+    tolerance: float,
+) -> list[str]:
+    """Latencies may grow and throughput shrink by `tolerance`, API requests per call
+    by `REQUESTS_TOLERANCE` only.
+
+    Changes smaller than `NOISE_FLOOR_MS` (on latencies and on the phase duration) are
+    ignored, sub-millisecond phases vary too much between machines to be compared.
+    """
+    regressions = []
+    for phase, expected in baseline.items():
+        actual = results.get(phase)
+        if actual is None:
+            continue
+        for metric in ("p50_ms", "p99_ms"):
+            if (
+                actual[metric] > expected[metric] * tolerance
+                and actual[metric] - expected[metric] > NOISE_FLOOR_MS
+            ):
+                regressions.append(
+                    f"{phase} {metric}: {actual[metric]} > {expected[metric]} x {tolerance}"
+                )
+        duration_ms = actual["calls"] / actual["throughput"] * 1000
+        expected_duration_ms = expected["calls"] / expected["throughput"] * 1000
+        if (
+            actual["throughput"] < expected["throughput"] / tolerance
+            and duration_ms - expected_duration_ms > NOISE_FLOOR_MS
+        ):
+            regressions.append(
+                f"{phase} throughput: {actual['throughput']} < {expected['throughput']} / {tolerance}"
+            )
+        # The absolute margin covers the rounding of the results
+        if (
+            actual["api_requests"]
+            > expected["api_requests"] * REQUESTS_TOLERANCE + 0.005
+        ):
+            regressions.append(
+                f"{phase} api_requests: {actual['api_requests']} > {expected['api_requests']} x {REQUESTS_TOLERANCE}"
+            )
+        if actual["errors"] > expected["errors"]:
+            regressions.append(
+                f"{phase} errors: {actual['errors']} > {expected['errors']}"
+            )
+    return regressions
+
+
+parser = argparse.ArgumentParser(
+    prog="python -m benchmarks.harness",
+    description="Benchmark the Scaleway run launcher against a local fake Jobs API",
+)
+parser.add_argument("--runs", type=int, default=500)
+parser.add_argument("--concurrency", type=int, default=128)
+parser.add_argument(
+    "--job-definitions",
+    type=int,
+    default=2000,
+    help="Job definitions existing in the project before the runs are launched",
+)
+parser.add_argument(
+    "--latency", type=float, default=0.005, help="Seconds added to every API request"
+)
+parser.add_argument("--latency-jitter", type=float, default=0.002)
+parser.add_argument("--page-size", type=int, default=100)
+parser.add_argument(
+    "--error-rate",
+    type=float,
+    default=0.0,
+    help="Fraction of the API requests failing with --error-status",
+)
+parser.add_argument("--error-status", type=int, default=503)
+parser.add_argument("--output", help="Write the results to this JSON file")
+parser.add_argument("--baseline", help="Compare the results to this JSON file")
+parser.add_argument(
+    "--tolerance",
+    type=float,
+    default=1.5,
+    help="Factor by which latencies and throughput may regress from the baseline",
+)
+parser.add_argument(
+    "--update-baseline",
+    action="store_true",
+    help="Write the results to the --baseline file instead of comparing them",
+)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    args = parser.parse_args(argv)
+    # The fake API is configured from the environment only
+    logging.getLogger("scaleway").setLevel(logging.ERROR)
+    results = run_benchmark(args)
+
+    print(
+        f"{'':<24}{'calls/s':>10}{'p50 ms':>10}{'p99 ms':>10}{'requests':>10}{'errors':>8}"
+    )
+    for phase, result in results.items():
+        print(
+            f"{phase:<24}{result['throughput']:>10}{result['p50_ms']:>10}"
+            f"{result['p99_ms']:>10}{result['api_requests']:>10}{result['errors']:>8}"
+        )
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+
+    if not args.baseline:
+        return 0
+
+    if args.update_baseline:
+        with open(args.baseline, "w") as f:
+            json.dump(results, f, indent=2)
+            f.write("\n")
+        return 0
+
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    regressions = find_regressions(results, baseline, args.tolerance)
+    for regression in regressions:
+        print(f"Regression: {regression}", file=sys.stderr)
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
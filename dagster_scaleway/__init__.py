@@ -1,4 +1,42 @@
 # ruff: noqa: F401
-# needed for dagster to find the module
+import importlib
+from typing import TYPE_CHECKING, Any
 
-from .serverless_job_launcher import ScalewayServerlessJobRunLauncher
+if TYPE_CHECKING:
+    from .compute_log_manager import ScalewayComputeLogManager
+    from .executor import scaleway_serverless_executor
+    from .io_manager import ScalewayObjectStorageIOManager
+    from .pipes import (
+        PipesObjectStorageContextInjector,
+        PipesObjectStorageMessageReader,
+        PipesScalewayServerlessJobClient,
+    )
+    from .serverless_job_launcher import ScalewayServerlessJobRunLauncher
+
+# Needed for dagster to find the classes of the module. They are imported on first
+# access, so that the job wrapper or a code location only using e.g. the IO manager
+# does not import the launcher, the Scaleway SDK and the Dagster internals they need
+_EXPORTS = {
+    "ScalewayServerlessJobRunLauncher": ".serverless_job_launcher",
+    "scaleway_serverless_executor": ".executor",
+    "PipesObjectStorageContextInjector": ".pipes",
+    "PipesObjectStorageMessageReader": ".pipes",
+    "PipesScalewayServerlessJobClient": ".pipes",
+    "ScalewayObjectStorageIOManager": ".io_manager",
+    "ScalewayComputeLogManager": ".compute_log_manager",
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name: str) -> Any:
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted({*globals(), *_EXPORTS})
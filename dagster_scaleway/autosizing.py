@@ -0,0 +1,156 @@
+import math
+import threading
+import time
+from typing import TYPE_CHECKING, NamedTuple, Optional, Sequence
+
+from dagster import DagsterRunStatus, RunsFilter
+
+from .usage import (
+    AUTOSIZING_KEY_TAG,
+    MEMORY_LIMIT_TAG,
+    USAGE_CPU_SECONDS_TAG,
+    USAGE_DURATION_TAG,
+    USAGE_MAX_MEMORY_TAG,
+    USAGE_OOM_TAG,
+)
+
+if TYPE_CHECKING:
+    from dagster import DagsterInstance
+
+# How long a recommendation is reused, so that bursts of launches query the history once
+RECOMMENDATION_CACHE_TTL = 60
+
+# Recommendations are rounded up to these steps so that small variations of the usage
+# don't rewrite the job definition on every launch
+MEMORY_LIMIT_STEP = 128
+CPU_LIMIT_STEP = 100
+
+
+class AutosizingConfig(NamedTuple):
+    percentile: float = 95
+    headroom: float = 1.2
+    history_size: int = 20
+    min_samples: int = 3
+    oom_memory_factor: float = 2.0
+    max_memory_limit: Optional[int] = None
+    max_cpu_limit: Optional[int] = None
+
+
+class SizeRecommendation(NamedTuple):
+    memory_limit: Optional[int]
+    cpu_limit: Optional[int]
+    samples: int
+    after_oom: bool
+
+
+def percentile(values: Sequence[float], pct: float) -> float:
+    """Nearest-rank percentile."""
+    ordered = sorted(values)
+    rank = max(math.ceil(pct / 100 * len(ordered)), 1)
+    return ordered[rank - 1]
+
+
+def _round_up(value: float, step: int) -> int:
+    return max(math.ceil(value / step), 1) * step
+
+
+class ResourceAutosizer:
+    """Recommends the limits of a job from the usage of its past runs.
+
+    The usage is recorded by the `dagster-scaleway` wrapper as tags of the Dagster runs,
+    so the history lives in the instance's run storage and follows its retention. Only
+    the last `history_size` finished runs with the same autosizing key are considered.
+    """
+
+    def __init__(self, config: AutosizingConfig):
+        self.config = config
+        self._lock = threading.Lock()
+        self._recommendations: dict[
+            str, tuple[float, Optional[SizeRecommendation]]
+        ] = {}
+
+    def recommend(
+        self, instance: "DagsterInstance", key: str
+    ) -> Optional[SizeRecommendation]:
+        now = time.monotonic()
+        with self._lock:
+            cached = self._recommendations.get(key)
+            if cached and cached[0] > now:
+                return cached[1]
+
+        recommendation = self._compute(instance, key)
+
+        with self._lock:
+            self._recommendations[key] = (
+                now + RECOMMENDATION_CACHE_TTL,
+                recommendation,
+            )
+        return recommendation
+
+    def _compute(
+        self, instance: "DagsterInstance", key: str
+    ) -> Optional[SizeRecommendation]:
+        config = self.config
+        runs = instance.get_runs(
+            filters=RunsFilter(
+                tags={AUTOSIZING_KEY_TAG: key},
+                statuses=[DagsterRunStatus.SUCCESS, DagsterRunStatus.FAILURE],
+            ),
+            limit=config.history_size,
+        )
+        if not runs:
+            return None
+
+        memory_samples = []
+        cpu_samples = []
+        for run in runs:
+            tags = run.tags
+            # OOM killed runs only tell us that the limit was too low
+            if USAGE_MAX_MEMORY_TAG not in tags or USAGE_OOM_TAG in tags:
+                continue
+            memory_samples.append(float(tags[USAGE_MAX_MEMORY_TAG]))
+            duration = float(tags.get(USAGE_DURATION_TAG, 0))
+            if duration > 0:
+                cpu_samples.append(
+                    float(tags.get(USAGE_CPU_SECONDS_TAG, 0)) / duration * 1000
+                )
+
+        memory_limit = None
+        cpu_limit = None
+        if len(memory_samples) >= config.min_samples:
+            memory_limit = _round_up(
+                percentile(memory_samples, config.percentile) * config.headroom,
+                MEMORY_LIMIT_STEP,
+            )
+        if len(cpu_samples) >= config.min_samples:
+            cpu_limit = _round_up(
+                percentile(cpu_samples, config.percentile) * config.headroom,
+                CPU_LIMIT_STEP,
+            )
+
+        # Runs are listed newest first
+        latest = runs[0]
+        after_oom = USAGE_OOM_TAG in latest.tags and MEMORY_LIMIT_TAG in latest.tags
+        if after_oom:
+            memory_limit = max(
+                memory_limit or 0,
+                _round_up(
+                    int(latest.tags[MEMORY_LIMIT_TAG]) * config.oom_memory_factor,
+                    MEMORY_LIMIT_STEP,
+                ),
+            )
+
+        if memory_limit and config.max_memory_limit:
+            memory_limit = min(memory_limit, config.max_memory_limit)
+        if cpu_limit and config.max_cpu_limit:
+            cpu_limit = min(cpu_limit, config.max_cpu_limit)
+
+        if memory_limit is None and cpu_limit is None:
+            return None
+
+        return SizeRecommendation(
+            memory_limit=memory_limit,
+            cpu_limit=cpu_limit,
+            samples=len(memory_samples),
+            after_oom=after_oom,
+        )
@@ -0,0 +1,53 @@
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable
+
+
+class BoundedThreadPoolExecutor:
+    """Thread pool that accepts at most `max_workers + max_queue_depth` pending tasks.
+
+    `submit` blocks when the pool is full, pushing back on the caller instead of
+    buffering an unbounded amount of work in memory.
+    """
+
+    def __init__(
+        self,
+        max_workers: int,
+        max_queue_depth: int,
+        thread_name_prefix: str = "",
+    ):
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix=thread_name_prefix
+        )
+        self._slots = threading.BoundedSemaphore(max_workers + max_queue_depth)
+        self._pending_lock = threading.Lock()
+        self._pending = 0
+
+    @property
+    def pending(self) -> int:
+        """Number of tasks submitted and not yet finished."""
+        with self._pending_lock:
+            return self._pending
+
+    def submit(self, fn: Callable[..., Any], *args, **kwargs) -> Future:
+        self._slots.acquire()
+
+        with self._pending_lock:
+            self._pending += 1
+
+        try:
+            future = self._executor.submit(fn, *args, **kwargs)
+        except BaseException:
+            self._release()
+            raise
+
+        future.add_done_callback(lambda _: self._release())
+        return future
+
+    def shutdown(self, wait: bool = True) -> None:
+        self._executor.shutdown(wait=wait)
+
+    def _release(self) -> None:
+        with self._pending_lock:
+            self._pending -= 1
+        self._slots.release()
@@ -1,30 +1,452 @@
 import argparse
+import json
 import os
+import signal
 import subprocess
+import sys
+import time
+from datetime import datetime, timezone
+from typing import IO, Optional
 
+from .payload import decode_payload
+from .usage import MIB, UsageMeter
+
+# Reference point for the startup times reported with --report-startup
+_STARTED_AT = time.perf_counter()
+
+# Possibly compressed or offloaded by the launcher, decoded in main()
 INPUT_JSON = os.getenv("INPUT_JSON")
 
+LOG_MODE_RAW = "raw"
+LOG_MODE_LINE = "line"
+LOG_MODE_TIMESTAMPED = "timestamped"
+
+# Size of the reads from the child's output in raw mode
+RELAY_CHUNK_SIZE = 64 * 1024
+
+FORWARDED_SIGNALS = (signal.SIGTERM, signal.SIGINT)
+
+DAGSTER_EXECUTABLE = "dagster"
+
 parser = argparse.ArgumentParser()
+parser.add_argument(
+    "--log-mode",
+    choices=[LOG_MODE_RAW, LOG_MODE_LINE, LOG_MODE_TIMESTAMPED],
+    default=os.getenv("DAGSTER_SCALEWAY_LOG_MODE", LOG_MODE_RAW),
+    help=(
+        "How the output of the wrapped command is relayed: as raw chunks (fastest), "
+        "flushed line by line, or line by line prefixed with a UTC timestamp"
+    ),
+)
+parser.add_argument(
+    "--in-process",
+    action="store_true",
+    default=os.getenv("DAGSTER_SCALEWAY_IN_PROCESS", "").lower() in ("1", "true"),
+    help=(
+        "Run the wrapped Dagster command in this interpreter instead of a subprocess, "
+        "saving the startup of a second interpreter and the import of Dagster"
+    ),
+)
+parser.add_argument(
+    "--report-startup",
+    action="store_true",
+    default=os.getenv("DAGSTER_SCALEWAY_REPORT_STARTUP", "").lower() in ("1", "true"),
+    help="Print how long it took to get ready to run the wrapped command",
+)
+parser.add_argument(
+    "--record-usage",
+    action="store_true",
+    default=os.getenv("DAGSTER_SCALEWAY_RECORD_USAGE", "").lower() in ("1", "true"),
+    help=(
+        "Record the peak memory, CPU time and duration of the run as tags of the Dagster "
+        "run, which the launcher uses to size later runs"
+    ),
+)
 parser.add_argument(
     "wrapped", nargs=argparse.REMAINDER, help="The wrapped Dagster CLI command"
 )
 
 
-def main():
-    args = parser.parse_args()
+gc_parser = argparse.ArgumentParser(
+    prog="dagster-scaleway gc",
+    description=(
+        "Delete the job definitions created by the ScalewayServerlessJobRunLauncher "
+        "that were neither updated nor run recently"
+    ),
+)
+gc_parser.add_argument(
+    "--region", help="Defaults to the region of the Scaleway configuration"
+)
+gc_parser.add_argument(
+    "--project-id", help="Defaults to the project of the Scaleway configuration"
+)
+gc_parser.add_argument(
+    "--max-age-days",
+    type=float,
+    default=7,
+    help="Keep job definitions updated or run more recently than this",
+)
+gc_parser.add_argument(
+    "--dry-run",
+    action="store_true",
+    help="Only list the job definitions that would be deleted",
+)
+gc_parser.add_argument(
+    "--concurrency", type=int, default=8, help="Number of concurrent deletions"
+)
+gc_parser.add_argument(
+    "--requests-per-second",
+    type=float,
+    default=10,
+    help="Rate limit of the calls to the Scaleway API",
+)
 
-    if not INPUT_JSON:
-        print("INPUT_JSON not set")
-        exit(1)
 
+# Modules profiled by default, by the process they start in
+STARTUP_PROFILE_MODULES = {
+    "wrapper": "dagster_scaleway.cli",
+    "launcher": "dagster_scaleway.serverless_job_launcher",
+    "executor": "dagster_scaleway.executor",
+    "pipes": "dagster_scaleway.pipes",
+    "io_manager": "dagster_scaleway.io_manager",
+    "compute_log_manager": "dagster_scaleway.compute_log_manager",
+    # What any Dagster process pays anyway
+    "dagster": "dagster",
+    # What a subprocess pays before running the Dagster command, saved in-process
+    "dagster_cli": "dagster._cli",
+}
+
+# Imports a module in a fresh interpreter and prints what it cost as JSON
+STARTUP_PROFILE_PROBE = """
+import importlib, json, resource, sys, time
+loaded = len(sys.modules)
+started_at = time.perf_counter()
+importlib.import_module(sys.argv[1])
+import_seconds = time.perf_counter() - started_at
+max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+print(json.dumps({
+    "import_seconds": import_seconds,
+    "max_rss": max_rss if sys.platform == "darwin" else max_rss * 1024,
+    "modules": len(sys.modules) - loaded,
+    "imports_dagster": "dagster" in sys.modules,
+    "imports_scaleway": "scaleway" in sys.modules,
+}))
+"""
+
+startup_profile_parser = argparse.ArgumentParser(
+    prog="dagster-scaleway startup-profile",
+    description=(
+        "Measure the import time and memory of the dagster-scaleway components, each "
+        "imported in a fresh interpreter like in the daemon and in job runs"
+    ),
+)
+startup_profile_parser.add_argument(
+    "--module",
+    action="append",
+    metavar="[NAME=]MODULE",
+    help=(
+        "Profile this module instead of the dagster-scaleway components, e.g. the "
+        "definitions of a code location. Can be repeated"
+    ),
+)
+startup_profile_parser.add_argument(
+    "--repeat",
+    type=int,
+    default=3,
+    help="Import each module this many times and keep the fastest",
+)
+startup_profile_parser.add_argument(
+    "--top",
+    type=int,
+    default=0,
+    help="Also list the N imports that took the longest, from python -X importtime",
+)
+startup_profile_parser.add_argument(
+    "--json", action="store_true", help="Print the results as JSON"
+)
+
+
+def _write_all(fd: int, data: bytes):
+    view = memoryview(data)
+    while view:
+        written = os.write(fd, view)
+        view = view[written:]
+
+
+def _relay_raw(src: IO[bytes], dst_fd: int):
+    src_fd = src.fileno()
+    while True:
+        chunk = os.read(src_fd, RELAY_CHUNK_SIZE)
+        if not chunk:
+            return
+        _write_all(dst_fd, chunk)
+
+
+def _relay_lines(src: IO[bytes], dst_fd: int, timestamped: bool):
+    for line in src:
+        if timestamped:
+            timestamp = datetime.now(timezone.utc).isoformat(timespec="milliseconds")
+            line = timestamp.encode() + b" " + line
+        _write_all(dst_fd, line)
+
+
+def _forward_signals(proc: subprocess.Popen):
+    # Scaleway stops a job run by sending SIGTERM to the wrapper, pass it to Dagster so
+    # that the run can be marked as canceled instead of being killed abruptly
+    def handler(signum, _frame):
+        if proc.poll() is None:
+            proc.send_signal(signum)
+
+    for signum in FORWARDED_SIGNALS:
+        signal.signal(signum, handler)
+
+
+def _exit_like(returncode: int):
+    if returncode < 0:
+        # The child was killed by a signal, die the same way so that it is visible to our parent
+        signum = -returncode
+        if signum not in (signal.SIGKILL, signal.SIGSTOP):
+            signal.signal(signum, signal.SIG_DFL)
+        os.kill(os.getpid(), signum)
+        sys.exit(128 + signum)
+    sys.exit(returncode)
+
+
+def _report_startup(mode: str, ready_after: float):
+    # What a subprocess would have cost is measured by startup-profile, not here: it
+    # would put that very cost back on the run
+    print(
+        f"dagster-scaleway: ready to run the Dagster command after {ready_after:.2f}s ({mode})",
+        file=sys.stderr,
+        flush=True,
+    )
+
+
+def _run_in_process(args) -> int:
+    from dagster._cli import ENV_PREFIX, cli
+
+    if args.report_startup:
+        _report_startup("in-process", time.perf_counter() - _STARTED_AT)
+
+    # Dagster handles SIGINT by interrupting the run cleanly, use it for SIGTERM as well
+    signal.signal(signal.SIGTERM, lambda *_: os.kill(os.getpid(), signal.SIGINT))
+
+    try:
+        cli.main(
+            args=args.wrapped[1:] + [INPUT_JSON],
+            prog_name=DAGSTER_EXECUTABLE,
+            auto_envvar_prefix=ENV_PREFIX,
+        )
+    except SystemExit as e:
+        if e.code is None:
+            return 0
+        if isinstance(e.code, int):
+            return e.code
+        print(e.code, file=sys.stderr)
+        return 1
+    return 0
+
+
+def _run_subprocess(args) -> int:
     with subprocess.Popen(
         args.wrapped + [INPUT_JSON],
         env=os.environ,
         stdout=subprocess.PIPE,
         stderr=subprocess.STDOUT,
     ) as proc:
-        for line in proc.stdout:
-            print(line.decode("utf8"))
+        _forward_signals(proc)
+
+        if args.report_startup:
+            _report_startup("subprocess", time.perf_counter() - _STARTED_AT)
+
+        stdout_fd = sys.stdout.fileno()
+        if args.log_mode == LOG_MODE_RAW:
+            _relay_raw(proc.stdout, stdout_fd)
+        else:
+            _relay_lines(
+                proc.stdout,
+                stdout_fd,
+                timestamped=args.log_mode == LOG_MODE_TIMESTAMPED,
+            )
+
+        return proc.wait()
+
+
+def _record_usage(usage_meter: UsageMeter, returncode: int):
+    usage = usage_meter.stop(killed_by_sigkill=returncode == -signal.SIGKILL)
+
+    # Imported late so that recording the usage doesn't slow down the startup
+    from dagster import DagsterInstance
+    from dagster._grpc.types import ExecuteRunArgs, ResumeRunArgs
+    from dagster._serdes import deserialize_value
+
+    try:
+        run_args = deserialize_value(INPUT_JSON, (ExecuteRunArgs, ResumeRunArgs))
+        with DagsterInstance.from_ref(run_args.instance_ref) as instance:
+            instance.add_run_tags(run_args.run_id, usage.to_tags())
+    except Exception as e:
+        # Never fail the run because its usage could not be recorded
+        print(
+            f"dagster-scaleway: unable to record the resource usage: {e}",
+            file=sys.stderr,
+            flush=True,
+        )
+
+
+def gc(argv: list[str]) -> int:
+    from datetime import timedelta
+
+    from .client_pool import ScalewayClientPool
+    from .job_definition_gc import collect_job_definitions
+    from .rate_limit import RateLimiter, RegionRateLimit
+
+    args = gc_parser.parse_args(argv)
+
+    rate_limiter = RateLimiter(
+        RegionRateLimit(requests_per_second=args.requests_per_second)
+    )
+    client_pool = ScalewayClientPool(get_rate_limiter=lambda _region: rate_limiter)
+    try:
+        api = client_pool.get_api(args.region)
+        report = collect_job_definitions(
+            api,
+            region=args.region or api.client.default_region,
+            project_id=args.project_id or api.client.default_project_id,
+            max_age=timedelta(days=args.max_age_days),
+            dry_run=args.dry_run,
+            concurrency=args.concurrency,
+        )
+    finally:
+        client_pool.close()
+
+    print(report.format())
+    return 1 if report.failed else 0
+
+
+def _profile_import(module: str, importtime: bool = False) -> tuple[dict, str]:
+    command = [sys.executable, "-c", STARTUP_PROFILE_PROBE, module]
+    if importtime:
+        command[1:1] = ["-X", "importtime"]
+    started_at = time.perf_counter()
+    proc = subprocess.run(command, capture_output=True, text=True)
+    process_seconds = time.perf_counter() - started_at
+    if proc.returncode:
+        raise RuntimeError(proc.stderr.strip().splitlines()[-1])
+    profile = json.loads(proc.stdout.strip().splitlines()[-1])
+    profile["process_seconds"] = process_seconds
+    return profile, proc.stderr
+
+
+def _get_slowest_imports(importtime_output: str, top: int) -> list[dict]:
+    imports = []
+    for line in importtime_output.splitlines():
+        # import time: self [us] | cumulative | imported package
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:") :].split("|")
+        imports.append(
+            {
+                "module": name.strip(),
+                "self_seconds": int(self_us) / 1e6,
+                "cumulative_seconds": int(cumulative_us) / 1e6,
+            }
+        )
+    return sorted(imports, key=lambda i: i["self_seconds"], reverse=True)[:top]
+
+
+def _print_startup_profile(results: dict[str, dict]):
+    print(
+        f"{'':<24}{'import s':>10}{'process s':>11}{'peak RSS MiB':>14}"
+        f"{'modules':>9}{'dagster':>9}{'scaleway':>10}"
+    )
+    for name, profile in results.items():
+        if "error" in profile:
+            print(f"{name:<24}failed: {profile['error']}")
+            continue
+        print(
+            f"{name:<24}{profile['import_seconds']:>10.3f}{profile['process_seconds']:>11.3f}"
+            f"{profile['max_rss'] / MIB:>14.1f}{profile['modules']:>9}"
+            f"{'yes' if profile['imports_dagster'] else 'no':>9}"
+            f"{'yes' if profile['imports_scaleway'] else 'no':>10}"
+        )
+        for slow_import in profile.get("slowest_imports", []):
+            print(
+                f"  {slow_import['module']:<52}{slow_import['self_seconds']:>8.3f}s"
+                f" (cumulative {slow_import['cumulative_seconds']:.3f}s)"
+            )
+
+
+def startup_profile(argv: list[str]) -> int:
+    args = startup_profile_parser.parse_args(argv)
+
+    if args.module:
+        modules = dict(
+            module.split("=", 1) if "=" in module else (module, module)
+            for module in args.module
+        )
+    else:
+        modules = STARTUP_PROFILE_MODULES
+
+    results: dict[str, dict] = {}
+    for name, module in modules.items():
+        try:
+            runs = [_profile_import(module)[0] for _ in range(max(args.repeat, 1))]
+            profile = {
+                key: min(run[key] for run in runs)
+                for key in ("import_seconds", "process_seconds", "max_rss")
+            }
+            profile.update(
+                {
+                    key: runs[0][key]
+                    for key in ("modules", "imports_dagster", "imports_scaleway")
+                }
+            )
+            if args.top > 0:
+                _, importtime_output = _profile_import(module, importtime=True)
+                profile["slowest_imports"] = _get_slowest_imports(
+                    importtime_output, args.top
+                )
+        except RuntimeError as e:
+            profile = {"error": str(e)}
+        results[name] = {"module": module, **profile}
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        _print_startup_profile(results)
+    return 1 if any("error" in profile for profile in results.values()) else 0
+
+
+# Subcommands of the wrapper, anything else is a command to wrap
+SUBCOMMANDS = {
+    "gc": gc,
+    "startup-profile": startup_profile,
+}
+
+
+def main():
+    subcommand = SUBCOMMANDS.get(sys.argv[1]) if len(sys.argv) > 1 else None
+    if subcommand:
+        sys.exit(subcommand(sys.argv[2:]))
+
+    args = parser.parse_args()
+
+    global INPUT_JSON
+    if not INPUT_JSON:
+        print("INPUT_JSON not set")
+        sys.exit(1)
+    INPUT_JSON = decode_payload(INPUT_JSON)
+
+    usage_meter: Optional[UsageMeter] = UsageMeter() if args.record_usage else None
+
+    # Only Dagster commands can run in-process, anything else still needs a subprocess
+    if args.in_process and args.wrapped[:1] == [DAGSTER_EXECUTABLE]:
+        returncode = _run_in_process(args)
+        if usage_meter:
+            _record_usage(usage_meter, returncode)
+        sys.exit(returncode)
 
-        if proc.returncode:
-            exit(proc.returncode)
+    returncode = _run_subprocess(args)
+    if usage_meter:
+        _record_usage(usage_meter, returncode)
+    _exit_like(returncode)
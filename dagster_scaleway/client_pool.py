@@ -0,0 +1,204 @@
+import os
+import threading
+import time
+import types
+from typing import Any, Callable, Dict, Optional, Tuple
+
+import requests
+import scaleway
+import scaleway.jobs.v1alpha1 as scw
+import scaleway_core.api
+from requests.adapters import HTTPAdapter
+from scaleway_core.api import Body, Params
+
+from .metrics import LaunchMetrics
+from .rate_limit import RateLimiter, get_throttle_stats
+
+DEFAULT_POOL_MAXSIZE = 32
+
+# How long the Scaleway configuration is assumed unchanged between two checks
+CREDENTIALS_CHECK_INTERVAL = 5.0
+
+
+class _SessionRequests:
+    """Stands in for the `requests` module in the SDK's `API._request`, sending the
+    requests through `session`."""
+
+    def __init__(self, session: requests.Session):
+        self._session = session
+
+    def request(self, method: str, url: str, **kwargs: Any) -> requests.Response:
+        return self._session.request(method, url, **kwargs)
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(requests, name)
+
+
+def _bind_session(session: requests.Session) -> Callable[..., requests.Response]:
+    """The SDK's `API._request`, sending its requests through `session`.
+
+    The SDK sends every call with `requests.request`, which opens a new connection (and
+    TLS handshake) each time. The function is rebuilt with its own globals, so that
+    only the APIs of the pool use the session and the SDK module is left untouched.
+    """
+    request = scaleway_core.api.API._request
+    return types.FunctionType(
+        request.__code__,
+        {**request.__globals__, "requests": _SessionRequests(session)},
+        request.__name__,
+        request.__defaults__,
+        request.__closure__,
+    )
+
+
+class PooledJobsV1Alpha1API(scw.JobsV1Alpha1API):
+    """Jobs API sending its requests through a shared `requests.Session`, rate limited
+    and measured."""
+
+    def __init__(
+        self,
+        client: scaleway.Client,
+        session: requests.Session,
+        rate_limiter: Optional[RateLimiter] = None,
+        metrics: Optional[LaunchMetrics] = None,
+    ):
+        super().__init__(client)
+        self._session = session
+        self._send_request = _bind_session(session)
+        self._rate_limiter = rate_limiter
+        self._metrics = metrics
+
+    def _request(
+        self,
+        method: str,
+        path: str,
+        params: Params = {},
+        headers: Dict[str, str] = {},
+        body: Optional[Body] = None,
+    ) -> requests.Response:
+        def send() -> requests.Response:
+            return self._send_request(
+                self, method, path, params=params, headers=headers, body=body
+            )
+
+        stats = get_throttle_stats()
+        retries, waited = stats.retries, stats.waited
+        started = time.perf_counter()
+        status = "connection_error"
+        try:
+            response = (
+                self._rate_limiter.send(method.upper(), send)
+                if self._rate_limiter
+                else send()
+            )
+            status = str(response.status_code)
+        finally:
+            if self._metrics:
+                self._metrics.api_request(
+                    method.upper(),
+                    path,
+                    status,
+                    duration=time.perf_counter() - started,
+                    retries=stats.retries - retries,
+                    waited=stats.waited - waited,
+                )
+
+        return response
+
+
+def _get_credentials_key() -> Tuple:
+    """Identifies the Scaleway configuration currently in effect.
+
+    Changes to any SCW_* environment variable or to the config file (e.g. rotated
+    keys) yield a different key, which makes the pool build fresh clients.
+    """
+    env = tuple(sorted((k, v) for k, v in os.environ.items() if k.startswith("SCW_")))
+    config_path = scaleway.Client.get_default_config_file_path()
+    try:
+        config_mtime: Optional[float] = os.stat(config_path).st_mtime
+    except OSError:
+        config_mtime = None
+    return (env, config_path, config_mtime)
+
+
+class ScalewayClientPool:
+    """Thread-safe cache of Scaleway clients and Jobs APIs, one per region.
+
+    All APIs share a single HTTP session so that repeated calls from the daemon reuse
+    warm keep-alive connections.
+    """
+
+    def __init__(
+        self,
+        pool_maxsize: int = DEFAULT_POOL_MAXSIZE,
+        get_rate_limiter: Optional[Callable[[Optional[str]], RateLimiter]] = None,
+        metrics: Optional[LaunchMetrics] = None,
+    ):
+        self._pool_maxsize = pool_maxsize
+        self._get_rate_limiter = get_rate_limiter
+        self._metrics = metrics
+        self._lock = threading.Lock()
+        self._credentials_key: Optional[Tuple] = None
+        self._credentials_checked_at = float("-inf")
+        self._session: Optional[requests.Session] = None
+        self._apis: dict[Optional[str], PooledJobsV1Alpha1API] = {}
+
+    def _new_session(self) -> requests.Session:
+        session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=self._pool_maxsize, pool_maxsize=self._pool_maxsize
+        )
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        return session
+
+    def _check_credentials(self) -> None:
+        """Drops the clients when the Scaleway configuration changed, checked at most
+        every CREDENTIALS_CHECK_INTERVAL seconds."""
+        now = time.monotonic()
+        if now - self._credentials_checked_at < CREDENTIALS_CHECK_INTERVAL:
+            return
+        self._credentials_checked_at = now
+        credentials_key = _get_credentials_key()
+        if credentials_key != self._credentials_key:
+            self._close_session()
+            self._credentials_key = credentials_key
+
+    def get_api(self, region: Optional[str]) -> PooledJobsV1Alpha1API:
+        with self._lock:
+            self._check_credentials()
+
+            api = self._apis.get(region)
+            if api is None:
+                client = scaleway.Client.from_config_file_and_env()
+                if region:
+                    client.default_region = region
+                if self._session is None:
+                    self._session = self._new_session()
+                api = PooledJobsV1Alpha1API(
+                    client,
+                    self._session,
+                    rate_limiter=self._get_rate_limiter(region)
+                    if self._get_rate_limiter
+                    else None,
+                    metrics=self._metrics,
+                )
+                self._apis[region] = api
+
+            return api
+
+    def get_client(self, region: Optional[str]) -> scaleway.Client:
+        return self.get_api(region).client
+
+    def _close_session(self) -> None:
+        # Requests in flight complete, their connections are closed once released
+        if self._session is not None:
+            self._session.close()
+        self._apis.clear()
+        self._session = None
+
+    def close(self) -> None:
+        with self._lock:
+            self._close_session()
+            self._credentials_key = None
+            self._credentials_checked_at = float("-inf")
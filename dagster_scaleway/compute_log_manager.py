@@ -0,0 +1,367 @@
+import logging
+import os
+import shutil
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Iterator, Mapping, Optional, Sequence
+
+import dagster._check as check
+import dagster._seven as seven
+from dagster import Field, IntSource, StringSource
+from dagster._core.storage.captured_log_manager import CapturedLogContext
+from dagster._core.storage.cloud_storage_compute_log_manager import (
+    CloudStorageComputeLogManager,
+    PollingComputeLogSubscriptionManager,
+)
+from dagster._core.storage.compute_log_manager import ComputeIOType
+from dagster._core.storage.local_compute_log_manager import (
+    IO_TYPE_EXTENSION,
+    LocalComputeLogManager,
+)
+from dagster._serdes import ConfigurableClass
+from dagster._serdes.config_class import ConfigurableClassData
+from typing_extensions import Self
+
+from .object_storage import get_object_storage_client
+from .regions import REGION_FR_PAR
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_COMPUTE_LOG_PREFIX = "dagster-scaleway/compute-logs"
+DEFAULT_COMPUTE_LOG_UPLOAD_INTERVAL = 5
+DEFAULT_COMPUTE_LOG_CHUNK_SIZE = 1024 * 1024
+
+# How often the captured files are checked for a full chunk to upload
+CHUNK_POLL_INTERVAL = 1.0
+
+# Chunk keys end with their byte offset, padded so that they are listed in order
+CHUNK_OFFSET_DIGITS = 16
+
+DELETE_BATCH_SIZE = 1000
+
+
+class ScalewayComputeLogManager(CloudStorageComputeLogManager, ConfigurableClass):
+    """Streams the stdout and stderr of steps to a Scaleway Object Storage bucket.
+
+    Output is captured to local files, whose new bytes are uploaded as objects of at
+    most `chunk_size` bytes, as soon as a chunk is full or every `upload_interval`
+    seconds. Chunks are named after their byte offset in the log, so that the webserver
+    reads logs from a cursor with a listing and ranged GETs, while the step runs.
+    Requires the `object-storage` extra.
+    """
+
+    def __init__(
+        self,
+        bucket: str,
+        region: str = REGION_FR_PAR,
+        prefix: str = DEFAULT_COMPUTE_LOG_PREFIX,
+        local_dir: Optional[str] = None,
+        upload_interval: int = DEFAULT_COMPUTE_LOG_UPLOAD_INTERVAL,
+        chunk_size: int = DEFAULT_COMPUTE_LOG_CHUNK_SIZE,
+        inst_data: Optional[ConfigurableClassData] = None,
+    ):
+        self._inst_data = inst_data
+        self.bucket = check.str_param(bucket, "bucket")
+        self.region = region
+        self.prefix = prefix.rstrip("/")
+        self._upload_interval = check.int_param(upload_interval, "upload_interval")
+        self.chunk_size = check.int_param(chunk_size, "chunk_size")
+        self._local_manager = LocalComputeLogManager(
+            local_dir or seven.get_system_temp_directory()
+        )
+        self._subscription_manager = PollingComputeLogSubscriptionManager(self)
+        self._s3 = None
+        self._lock = threading.Lock()
+        # Bytes of each captured file already uploaded
+        self._uploaded: dict[tuple[tuple[str, ...], ComputeIOType], int] = {}
+
+    @property
+    def inst_data(self):
+        return self._inst_data
+
+    @classmethod
+    def config_type(cls):
+        return {
+            "bucket": Field(StringSource, description="The bucket to store logs in"),
+            "region": Field(
+                StringSource,
+                is_required=False,
+                default_value=REGION_FR_PAR,
+                description="The region of the bucket",
+            ),
+            "prefix": Field(
+                StringSource,
+                is_required=False,
+                default_value=DEFAULT_COMPUTE_LOG_PREFIX,
+                description="The prefix of the log keys",
+            ),
+            "local_dir": Field(
+                StringSource,
+                is_required=False,
+                description="Where logs are captured before their upload",
+            ),
+            "upload_interval": Field(
+                IntSource,
+                is_required=False,
+                default_value=DEFAULT_COMPUTE_LOG_UPLOAD_INTERVAL,
+                description="Maximum time in seconds before new output is uploaded",
+            ),
+            "chunk_size": Field(
+                IntSource,
+                is_required=False,
+                default_value=DEFAULT_COMPUTE_LOG_CHUNK_SIZE,
+                description="Maximum size in bytes of the uploaded chunks",
+            ),
+        }
+
+    @classmethod
+    def from_config_value(
+        cls, inst_data: ConfigurableClassData, config_value: Mapping[str, Any]
+    ) -> Self:
+        return cls(inst_data=inst_data, **config_value)
+
+    @property
+    def local_manager(self) -> LocalComputeLogManager:
+        return self._local_manager
+
+    @property
+    def upload_interval(self) -> Optional[int]:
+        return self._upload_interval
+
+    def _get_s3(self) -> Any:
+        if self._s3 is None:
+            self._s3 = get_object_storage_client(self.region)
+        return self._s3
+
+    def _get_base_key(self, log_key: Sequence[str]) -> str:
+        return "/".join([self.prefix, *log_key])
+
+    def _get_chunk_prefix(self, log_key: Sequence[str], io_type: ComputeIOType) -> str:
+        return f"{self._get_base_key(log_key)}/{IO_TYPE_EXTENSION[io_type]}/"
+
+    def _get_complete_key(self, log_key: Sequence[str], io_type: ComputeIOType) -> str:
+        return f"{self._get_base_key(log_key)}/{IO_TYPE_EXTENSION[io_type]}.complete"
+
+    def _get_chunk_key(
+        self, log_key: Sequence[str], io_type: ComputeIOType, offset: int
+    ) -> str:
+        return f"{self._get_chunk_prefix(log_key, io_type)}{offset:0{CHUNK_OFFSET_DIGITS}d}"
+
+    @contextmanager
+    def capture_logs(self, log_key: Sequence[str]) -> Iterator[CapturedLogContext]:
+        with super().capture_logs(log_key) as context:
+            yield context
+        with self._lock:
+            for io_type in (ComputeIOType.STDOUT, ComputeIOType.STDERR):
+                self._uploaded.pop((tuple(log_key), io_type), None)
+
+    @contextmanager
+    def _poll_for_local_upload(self, log_key: Sequence[str]) -> Iterator[None]:
+        # Joined before the final upload, so that chunks are never uploaded twice
+        thread_exit = threading.Event()
+        thread = threading.Thread(
+            target=self._stream_chunks,
+            args=(log_key, thread_exit),
+            name="dagster-scaleway-compute-logs",
+            daemon=True,
+        )
+        thread.start()
+        try:
+            yield
+        finally:
+            thread_exit.set()
+            thread.join()
+
+    def _stream_chunks(self, log_key: Sequence[str], thread_exit: threading.Event):
+        flushed_at = time.monotonic()
+        while not thread_exit.wait(CHUNK_POLL_INTERVAL):
+            flush = time.monotonic() - flushed_at >= self._upload_interval
+            try:
+                for io_type in (ComputeIOType.STDOUT, ComputeIOType.STDERR):
+                    self._upload_chunks(log_key, io_type, flush=flush)
+            except Exception:
+                # Retried on the next poll, from the last uploaded offset
+                logger.exception("Failed to upload the compute logs of %s", log_key)
+            if flush:
+                flushed_at = time.monotonic()
+
+    def _upload_chunks(
+        self, log_key: Sequence[str], io_type: ComputeIOType, flush: bool
+    ) -> None:
+        """Uploads the full chunks of new output, and the last partial one if `flush`."""
+        path = self.local_manager.get_captured_local_path(
+            log_key, IO_TYPE_EXTENSION[io_type]
+        )
+        if not os.path.exists(path):
+            return
+
+        key = (tuple(log_key), io_type)
+        with self._lock:
+            offset = self._uploaded.get(key, 0)
+            size = os.path.getsize(path)
+            with open(path, "rb") as f:
+                f.seek(offset)
+                while size - offset >= self.chunk_size or (flush and size > offset):
+                    data = f.read(min(self.chunk_size, size - offset))
+                    if not data:
+                        break
+                    self._get_s3().put_object(
+                        Bucket=self.bucket,
+                        Key=self._get_chunk_key(log_key, io_type, offset),
+                        Body=data,
+                        ContentType="text/plain",
+                    )
+                    offset += len(data)
+                    self._uploaded[key] = offset
+
+    def upload_to_cloud_storage(
+        self, log_key: Sequence[str], io_type: ComputeIOType, partial: bool = False
+    ) -> None:
+        self._upload_chunks(log_key, io_type, flush=True)
+        if not partial:
+            self._get_s3().put_object(
+                Bucket=self.bucket,
+                Key=self._get_complete_key(log_key, io_type),
+                Body=b"",
+            )
+
+    def _has_objects(self, prefix: str) -> bool:
+        res = self._get_s3().list_objects_v2(
+            Bucket=self.bucket, Prefix=prefix, MaxKeys=1
+        )
+        return bool(res.get("Contents"))
+
+    def cloud_storage_has_logs(
+        self, log_key: Sequence[str], io_type: ComputeIOType, partial: bool = False
+    ) -> bool:
+        if partial:
+            return self._has_objects(self._get_chunk_prefix(log_key, io_type))
+        return self._has_objects(self._get_complete_key(log_key, io_type))
+
+    def _list_chunks(
+        self,
+        log_key: Sequence[str],
+        io_type: ComputeIOType,
+        start_after: int = -1,
+        end: Optional[int] = None,
+    ) -> Iterator[tuple[int, int, str]]:
+        """Offset, size and key of the chunks starting after `start_after` and before `end`."""
+        prefix = self._get_chunk_prefix(log_key, io_type)
+        kwargs = {"Bucket": self.bucket, "Prefix": prefix}
+        if start_after >= 0:
+            kwargs["StartAfter"] = self._get_chunk_key(log_key, io_type, start_after)
+
+        paginator = self._get_s3().get_paginator("list_objects_v2")
+        for page in paginator.paginate(**kwargs):
+            for obj in page.get("Contents", []):
+                offset = int(obj["Key"][len(prefix) :])
+                if end is not None and offset >= end:
+                    return
+                yield offset, obj["Size"], obj["Key"]
+
+    def _read_chunks(
+        self,
+        log_key: Sequence[str],
+        io_type: ComputeIOType,
+        offset: int,
+        max_bytes: Optional[int],
+    ) -> tuple[Optional[bytes], int]:
+        end = None if max_bytes is None else offset + max_bytes
+        # No chunk is larger than chunk_size, so the one holding `offset`, or ending
+        # there once caught up, starts after this
+        chunks = list(
+            self._list_chunks(log_key, io_type, offset - self.chunk_size - 1, end)
+        )
+        if offset and (not chunks or chunks[0][0] > offset):
+            # Written with a larger chunk_size
+            chunks = list(self._list_chunks(log_key, io_type, end=end))
+
+        data = bytearray()
+        position = offset
+        for start, size, key in chunks:
+            if start + size <= position:
+                continue
+            stop = start + size if end is None else min(start + size, end)
+            if start > position or stop <= position:
+                break
+            res = self._get_s3().get_object(
+                Bucket=self.bucket,
+                Key=key,
+                Range=f"bytes={position - start}-{stop - start - 1}",
+            )
+            data += res["Body"].read()
+            position = stop
+        return (bytes(data) if data else None), position
+
+    def log_data_for_type(
+        self,
+        log_key: Sequence[str],
+        io_type: ComputeIOType,
+        offset: int,
+        max_bytes: Optional[int],
+    ):
+        if self.has_local_file(log_key, io_type):
+            return super().log_data_for_type(log_key, io_type, offset, max_bytes)
+        return self._read_chunks(log_key, io_type, offset, max_bytes)
+
+    def download_from_cloud_storage(
+        self, log_key: Sequence[str], io_type: ComputeIOType, partial: bool = False
+    ) -> None:
+        path = self.local_manager.get_captured_local_path(
+            log_key, IO_TYPE_EXTENSION[io_type], partial=partial
+        )
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "wb") as f:
+            for _, _, key in self._list_chunks(log_key, io_type):
+                res = self._get_s3().get_object(Bucket=self.bucket, Key=key)
+                shutil.copyfileobj(res["Body"], f)
+
+    def download_url_for_type(
+        self, log_key: Sequence[str], io_type: ComputeIOType
+    ) -> Optional[str]:
+        # Logs are split in chunks, there is no single object to download
+        return None
+
+    def display_path_for_type(
+        self, log_key: Sequence[str], io_type: ComputeIOType
+    ) -> str:
+        return f"s3://{self.bucket}/{self._get_chunk_prefix(log_key, io_type)}"
+
+    def delete_logs(
+        self,
+        log_key: Optional[Sequence[str]] = None,
+        prefix: Optional[Sequence[str]] = None,
+    ) -> None:
+        self.local_manager.delete_logs(log_key=log_key, prefix=prefix)
+        key_prefix = self._get_base_key(
+            check.not_none(log_key or prefix, "Must pass in either log_key or prefix")
+        )
+
+        s3 = self._get_s3()
+        paginator = s3.get_paginator("list_objects_v2")
+        keys = [
+            obj["Key"]
+            for page in paginator.paginate(Bucket=self.bucket, Prefix=f"{key_prefix}/")
+            for obj in page.get("Contents", [])
+        ]
+        for i in range(0, len(keys), DELETE_BATCH_SIZE):
+            s3.delete_objects(
+                Bucket=self.bucket,
+                Delete={
+                    "Objects": [
+                        {"Key": key} for key in keys[i : i + DELETE_BATCH_SIZE]
+                    ],
+                    "Quiet": True,
+                },
+            )
+
+    def on_subscribe(self, subscription):
+        self._subscription_manager.add_subscription(subscription)
+
+    def on_unsubscribe(self, subscription):
+        self._subscription_manager.remove_subscription(subscription)
+
+    def dispose(self):
+        self._subscription_manager.dispose()
+        self._local_manager.dispose()
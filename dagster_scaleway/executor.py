@@ -0,0 +1,282 @@
+from typing import Any, Iterator, Mapping, Optional
+
+import dagster._check as check
+import scaleway.jobs.v1alpha1 as scw
+from dagster import Field, IntSource, MetadataValue, executor
+from dagster._annotations import experimental
+from dagster._core.definitions.executor_definition import (
+    multiple_process_executor_requirements,
+)
+from dagster._core.errors import DagsterUnmetExecutorRequirementsError
+from dagster._core.events import DagsterEvent, EngineEventData
+from dagster._core.execution.retries import RetryMode, get_retries_config
+from dagster._core.execution.tags import get_tag_concurrency_limits_config
+from dagster._core.executor.base import Executor
+from dagster._core.executor.init import InitExecutorContext
+from dagster._core.executor.step_delegating import StepDelegatingExecutor
+from dagster._core.executor.step_delegating.step_handler.base import (
+    CheckStepHealthResult,
+    StepHandler,
+    StepHandlerContext,
+)
+from dagster._utils.merger import merge_dicts
+
+import scaleway
+
+from .rate_limit import reset_throttle_stats
+from .serverless_job_context import (
+    SCALEWAY_CONFIG_TAG,
+    SCALEWAY_SERVERLESS_JOB_CONTEXT_SCHEMA,
+    ScalewayServerlessJobContext,
+)
+from .serverless_job_launcher import ScalewayServerlessJobRunLauncher
+
+SCALEWAY_SERVERLESS_EXECUTOR_SCHEMA = merge_dicts(
+    SCALEWAY_SERVERLESS_JOB_CONTEXT_SCHEMA,
+    {
+        # No default here, steps run in the region of the run unless told otherwise
+        "region": Field(
+            str,
+            is_required=False,
+            description="The region to use for the step serverless jobs",
+        ),
+        "retries": get_retries_config(),
+        "max_concurrent": Field(
+            IntSource,
+            is_required=False,
+            description=(
+                "Limit on the number of steps running as serverless jobs at the same time "
+                "for a given run. Defaults to no limit."
+            ),
+        ),
+        "tag_concurrency_limits": get_tag_concurrency_limits_config(),
+    },
+)
+
+# Step job runs that are over but didn't succeed
+FAILED_JOB_RUN_STATES = (
+    scw.JobRunState.FAILED,
+    scw.JobRunState.INTERNAL_ERROR,
+    # Stopped outside of Dagster, the step will never report its outcome
+    scw.JobRunState.CANCELED,
+)
+
+
+@executor(
+    name="scaleway_serverless",
+    config_schema=SCALEWAY_SERVERLESS_EXECUTOR_SCHEMA,
+    requirements=multiple_process_executor_requirements(),
+)
+@experimental
+def scaleway_serverless_executor(init_context: InitExecutorContext) -> Executor:
+    """Executor which launches each step as its own Scaleway Serverless Job.
+
+    Requires the instance to use the `ScalewayServerlessJobRunLauncher`, whose job
+    definitions, client pool and rate limits are reused for the steps. The executor
+    config accepts the same keys as the run launcher (`docker_image`, `env_vars`,
+    `region`, `memory_limit`, `cpu_limit`), which are merged over the run's config.
+    Ops and assets can override it for their own step with a `dagster-scaleway/config`
+    tag, e.g. `op_tags={"dagster-scaleway/config": {"cpu_limit": 4000}}`.
+
+    .. code-block:: python
+
+        from dagster_scaleway.executor import scaleway_serverless_executor
+
+        @job(executor_def=scaleway_serverless_executor)
+        def scaleway_job():
+            pass
+
+    .. code-block:: yaml
+
+        execution:
+          config:
+            cpu_limit: 2000
+            memory_limit: 4096
+            max_concurrent: 16
+    """
+    run_launcher = init_context.instance.run_launcher
+    if not isinstance(run_launcher, ScalewayServerlessJobRunLauncher):
+        raise DagsterUnmetExecutorRequirementsError(
+            "This executor is only compatible with a ScalewayServerlessJobRunLauncher; "
+            "configure the ScalewayServerlessJobRunLauncher on your instance to use it."
+        )
+
+    config = init_context.executor_config
+
+    return StepDelegatingExecutor(
+        ScalewayServerlessStepHandler(
+            run_launcher,
+            {
+                key: config[key]
+                for key in SCALEWAY_SERVERLESS_JOB_CONTEXT_SCHEMA
+                if config.get(key) is not None
+            },
+        ),
+        retries=check.not_none(RetryMode.from_config(config["retries"])),
+        max_concurrent=check.opt_int_elem(config, "max_concurrent"),
+        tag_concurrency_limits=check.opt_list_elem(config, "tag_concurrency_limits"),
+    )
+
+
+class ScalewayServerlessStepHandler(StepHandler):
+    """Runs each step with `dagster-scaleway dagster api execute_step` in a serverless job.
+
+    Step job runs are tracked in the run launcher's job run cache, so the health checks
+    of all the steps of a run are served by a few list calls per cache TTL window.
+    """
+
+    def __init__(
+        self,
+        run_launcher: ScalewayServerlessJobRunLauncher,
+        step_config: Mapping[str, Any],
+    ):
+        super().__init__()
+        self._run_launcher = run_launcher
+        self._step_config = step_config
+        # Scaleway job run of each step attempt launched by this handler
+        self._job_run_ids: dict[str, str] = {}
+
+    @property
+    def name(self) -> str:
+        return "ScalewayServerlessStepHandler"
+
+    def _get_step_key(self, step_handler_context: StepHandlerContext) -> str:
+        step_keys_to_execute = check.not_none(
+            step_handler_context.execute_step_args.step_keys_to_execute
+        )
+        assert (
+            len(step_keys_to_execute) == 1
+        ), "Launching multiple steps is not currently supported"
+        return step_keys_to_execute[0]
+
+    def _get_step_attempt_key(self, step_handler_context: StepHandlerContext) -> str:
+        step_key = self._get_step_key(step_handler_context)
+        known_state = step_handler_context.execute_step_args.known_state
+        retry_number = (
+            known_state.get_retry_state().get_attempt_count(step_key)
+            if known_state
+            else 0
+        )
+        return f"{step_key}:{retry_number}"
+
+    def _get_serverless_job_context(
+        self, step_handler_context: StepHandlerContext
+    ) -> ScalewayServerlessJobContext:
+        run_context = self._run_launcher.get_serverless_job_context(
+            step_handler_context.dagster_run
+        )
+        step_tags = step_handler_context.step_tags[
+            self._get_step_key(step_handler_context)
+        ]
+        return run_context.merge_config(self._step_config).merge_config(
+            ScalewayServerlessJobContext.get_config_from_tag(
+                step_tags.get(SCALEWAY_CONFIG_TAG)
+            )
+        )
+
+    def _get_docker_image(self, step_handler_context: StepHandlerContext) -> str:
+        if self._step_config.get("docker_image"):
+            return self._step_config["docker_image"]
+        return self._run_launcher._get_docker_image(
+            step_handler_context.execute_step_args.job_origin
+        )
+
+    def launch_step(
+        self, step_handler_context: StepHandlerContext
+    ) -> Iterator[DagsterEvent]:
+        step_key = self._get_step_key(step_handler_context)
+        run = step_handler_context.dagster_run
+        serverless_job_context = self._get_serverless_job_context(step_handler_context)
+        docker_image = self._get_docker_image(step_handler_context)
+        api = self._run_launcher._get_api(serverless_job_context)
+
+        # The compressed step input is passed as the last argument, like INPUT_JSON
+        command = list(step_handler_context.execute_step_args.get_command_args())
+
+        reset_throttle_stats()
+        try:
+            job_def, job_run = self._run_launcher._start_job_run(
+                api,
+                run,
+                docker_image,
+                command,
+                serverless_job_context=serverless_job_context,
+                step_key=step_key,
+            )
+        finally:
+            self._run_launcher._report_throttling(run)
+
+        self._job_run_ids[self._get_step_attempt_key(step_handler_context)] = job_run.id
+
+        yield DagsterEvent.step_worker_starting(
+            step_handler_context.get_step_context(step_key),
+            message=f"Launching step in Scaleway serverless job {job_def.name}.",
+            metadata={
+                "Scaleway job definition id": MetadataValue.text(job_def.id),
+                "Scaleway job run id": MetadataValue.text(job_run.id),
+            },
+        )
+
+    def _get_job_run(
+        self, step_handler_context: StepHandlerContext, refresh: bool = False
+    ) -> Optional[scw.JobRun]:
+        job_run_id = self._job_run_ids.get(
+            self._get_step_attempt_key(step_handler_context)
+        )
+        if not job_run_id:
+            return None
+
+        serverless_job_context = self._get_serverless_job_context(step_handler_context)
+        api = self._run_launcher._get_api(serverless_job_context)
+        try:
+            return self._run_launcher._job_run_cache.get(
+                api,
+                self._run_launcher._get_job_definition_scope(api.client),
+                job_run_id,
+                refresh=refresh,
+            )
+        except scaleway.ScalewayException:
+            return None
+
+    def check_step_health(
+        self, step_handler_context: StepHandlerContext
+    ) -> CheckStepHealthResult:
+        step_key = self._get_step_key(step_handler_context)
+
+        job_run = self._get_job_run(step_handler_context)
+        if job_run is None:
+            return CheckStepHealthResult.unhealthy(
+                reason=f"Scaleway job run for step {step_key} could not be found."
+            )
+
+        if job_run.state in FAILED_JOB_RUN_STATES:
+            reason = (
+                f"Scaleway job run {job_run.id} for step {step_key} is {job_run.state}."
+            )
+            if job_run.error_message:
+                reason += f" {job_run.error_message}"
+            return CheckStepHealthResult.unhealthy(reason=reason)
+
+        return CheckStepHealthResult.healthy()
+
+    def terminate_step(
+        self, step_handler_context: StepHandlerContext
+    ) -> Iterator[DagsterEvent]:
+        step_key = self._get_step_key(step_handler_context)
+
+        job_run = self._get_job_run(step_handler_context, refresh=True)
+        if job_run is None or job_run.state not in scw.JOB_RUN_TRANSIENT_STATUSES:
+            return
+
+        yield DagsterEvent.engine_event(
+            step_handler_context.get_step_context(step_key),
+            message=f"Stopping Scaleway job run {job_run.id} for step.",
+            event_specific_data=EngineEventData(),
+        )
+
+        serverless_job_context = self._get_serverless_job_context(step_handler_context)
+        api = self._run_launcher._get_api(serverless_job_context)
+        job_run = api.stop_job_run(job_run_id=job_run.id)
+        self._run_launcher._job_run_cache.track(
+            self._run_launcher._get_job_definition_scope(api.client), job_run
+        )
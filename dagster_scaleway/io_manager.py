@@ -0,0 +1,284 @@
+import io
+import pickle
+import sys
+import tempfile
+from typing import IO, Any, Optional, Sequence, Union
+
+from dagster import (
+    ConfigurableIOManager,
+    InputContext,
+    MetadataValue,
+    MultiPartitionKey,
+    OutputContext,
+)
+from pydantic import Field, PrivateAttr
+
+from .object_storage import get_object_storage_client
+from .regions import REGION_FR_PAR
+
+PARQUET_CONTENT_TYPE = "application/vnd.apache.parquet"
+PICKLE_CONTENT_TYPE = "application/x-python-pickle"
+
+MIB = 1024 * 1024
+
+
+class _ObjectRangeReader(io.RawIOBase):
+    """Seekable file over an object, reading the requested bytes with ranged GETs.
+
+    Unbuffered, as Parquet readers request the footer and each column chunk at once.
+    """
+
+    def __init__(self, s3: Any, bucket: str, key: str, size: int):
+        self._s3 = s3
+        self._bucket = bucket
+        self._key = key
+        self._size = size
+        self._position = 0
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def tell(self) -> int:
+        return self._position
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        base = {io.SEEK_SET: 0, io.SEEK_CUR: self._position, io.SEEK_END: self._size}
+        self._position = max(base[whence] + offset, 0)
+        return self._position
+
+    def readinto(self, buffer: Any) -> int:
+        if self._position >= self._size or not len(buffer):
+            return 0
+        end = min(self._position + len(buffer), self._size) - 1
+        data = self._s3.get_object(
+            Bucket=self._bucket, Key=self._key, Range=f"bytes={self._position}-{end}"
+        )["Body"].read()
+        buffer[: len(data)] = data
+        self._position += len(data)
+        return len(data)
+
+
+def _is_instance(obj: Any, module: str, name: str) -> bool:
+    # The optional libraries are loaded if the object comes from them
+    cls = getattr(sys.modules.get(module), name, None)
+    return cls is not None and isinstance(obj, cls)
+
+
+def _import_pyarrow():
+    try:
+        import pyarrow
+        import pyarrow.parquet
+    except ImportError as e:
+        raise ImportError(
+            "Storing DataFrames and tables as Parquet requires pyarrow, install it with "
+            "`pip install pyarrow`"
+        ) from e
+    return pyarrow
+
+
+class ScalewayObjectStorageIOManager(ConfigurableIOManager):
+    """Stores the outputs of ops and assets in a Scaleway Object Storage bucket.
+
+    pandas DataFrames and pyarrow tables are stored as Parquet, written row group by row
+    group, other objects are pickled. Objects are spooled to disk then transferred with
+    parallel multipart uploads and downloads, so the memory used by a transfer is
+    bounded by the spool and part sizes. Inputs with a `columns` metadata entry only
+    fetch the byte ranges of these columns.
+
+    Credentials are the Scaleway ones, from the config file and the environment. Requires
+    the `object-storage` extra, and pyarrow for Parquet.
+    """
+
+    bucket: str = Field(description="The bucket to store the objects in")
+    region: str = Field(default=REGION_FR_PAR, description="The region of the bucket")
+    prefix: str = Field(
+        default="dagster", description="The prefix of the keys of the objects"
+    )
+    multipart_threshold: int = Field(
+        default=64 * MIB,
+        description=(
+            "Size in bytes from which objects are spooled to disk and transferred in "
+            "parts"
+        ),
+    )
+    multipart_chunk_size: int = Field(
+        default=16 * MIB,
+        description=(
+            "Size in bytes of the parts. Scaleway allows 1000 parts per object, so the "
+            "default caps objects at 16 GiB"
+        ),
+    )
+    max_concurrency: int = Field(
+        default=10, description="Number of parts transferred in parallel"
+    )
+    parquet_row_group_size: int = Field(
+        default=128 * 1024, description="Number of rows of the Parquet row groups"
+    )
+    parquet_compression: str = Field(
+        default="zstd", description="Compression codec of the Parquet files"
+    )
+
+    _s3: Any = PrivateAttr(default=None)
+
+    @classmethod
+    def _is_dagster_maintained(cls) -> bool:
+        return False
+
+    def _get_s3(self) -> Any:
+        if self._s3 is None:
+            self._s3 = get_object_storage_client(self.region)
+        return self._s3
+
+    def _get_transfer_config(self) -> Any:
+        from boto3.s3.transfer import TransferConfig
+
+        return TransferConfig(
+            multipart_threshold=self.multipart_threshold,
+            multipart_chunksize=self.multipart_chunk_size,
+            max_concurrency=self.max_concurrency,
+        )
+
+    def _spool(self) -> IO[bytes]:
+        return tempfile.SpooledTemporaryFile(max_size=self.multipart_threshold)
+
+    def _get_base_path(self, context: Union[InputContext, OutputContext]) -> list[str]:
+        if context.has_asset_key:
+            return list(context.asset_key.path)
+        output_context = (
+            context.upstream_output if isinstance(context, InputContext) else context
+        )
+        assert output_context is not None
+        return list(output_context.get_identifier())
+
+    def _get_key(self, path: Sequence[str]) -> str:
+        return "/".join([self.prefix.rstrip("/"), *path])
+
+    def _get_partition_keys(
+        self, context: Union[InputContext, OutputContext]
+    ) -> dict[str, str]:
+        """Object keys by partition key, dimensions of multi-partitions being nested."""
+        base_path = self._get_base_path(context)
+        keys = {}
+        for partition_key in context.asset_partition_keys:
+            if isinstance(partition_key, MultiPartitionKey):
+                partition_path = [
+                    key for _, key in sorted(partition_key.keys_by_dimension.items())
+                ]
+            else:
+                partition_path = [partition_key]
+            keys[partition_key] = self._get_key([*base_path, *partition_path])
+        return keys
+
+    def handle_output(self, context: OutputContext, obj: Any) -> None:
+        if context.dagster_type.is_nothing:
+            return
+
+        if context.has_asset_partitions:
+            key = self._get_partition_keys(context)[context.asset_partition_key]
+        else:
+            key = self._get_key(self._get_base_path(context))
+
+        metadata = {}
+        with self._spool() as f:
+            if _is_instance(obj, "pandas", "DataFrame") or _is_instance(
+                obj, "pyarrow", "Table"
+            ):
+                metadata["row_count"] = MetadataValue.int(self._write_parquet(obj, f))
+                content_type = PARQUET_CONTENT_TYPE
+            else:
+                pickle.dump(obj, f, protocol=pickle.HIGHEST_PROTOCOL)
+                content_type = PICKLE_CONTENT_TYPE
+            size = f.tell()
+            f.seek(0)
+            self._get_s3().upload_fileobj(
+                f,
+                self.bucket,
+                key,
+                ExtraArgs={"ContentType": content_type},
+                Config=self._get_transfer_config(),
+            )
+
+        context.add_output_metadata(
+            {
+                **metadata,
+                "uri": MetadataValue.path(f"s3://{self.bucket}/{key}"),
+                "size_bytes": MetadataValue.int(size),
+            }
+        )
+
+    def _write_parquet(self, obj: Any, f: IO[bytes]) -> int:
+        pa = _import_pyarrow()
+
+        if isinstance(obj, pa.Table):
+            schema = obj.schema
+            batches = obj.to_batches(max_chunksize=self.parquet_row_group_size)
+        else:
+            # Converted slice by slice instead of the whole DataFrame at once
+            schema = pa.Schema.from_pandas(obj)
+            batches = (
+                pa.RecordBatch.from_pandas(
+                    obj.iloc[i : i + self.parquet_row_group_size], schema=schema
+                )
+                for i in range(0, len(obj), self.parquet_row_group_size)
+            )
+
+        with pa.parquet.ParquetWriter(
+            f, schema, compression=self.parquet_compression
+        ) as writer:
+            for batch in batches:
+                writer.write_batch(batch, row_group_size=self.parquet_row_group_size)
+        return len(obj)
+
+    def load_input(self, context: InputContext) -> Any:
+        if context.dagster_type.is_nothing:
+            return None
+
+        columns = (context.metadata or {}).get("columns")
+        if not context.has_asset_partitions:
+            return self._load(
+                context, self._get_key(self._get_base_path(context)), columns
+            )
+
+        keys = self._get_partition_keys(context)
+        if len(keys) == 1:
+            (key,) = keys.values()
+            return self._load(context, key, columns)
+        return {
+            partition_key: self._load(context, key, columns)
+            for partition_key, key in keys.items()
+        }
+
+    def _load(
+        self, context: InputContext, key: str, columns: Optional[Sequence[str]]
+    ) -> Any:
+        s3 = self._get_s3()
+        head = s3.head_object(Bucket=self.bucket, Key=key)
+        context.log.debug(f"Loading s3://{self.bucket}/{key}")
+
+        if head.get("ContentType") != PARQUET_CONTENT_TYPE:
+            with self._spool() as f:
+                s3.download_fileobj(
+                    self.bucket, key, f, Config=self._get_transfer_config()
+                )
+                f.seek(0)
+                return pickle.load(f)
+
+        pa = _import_pyarrow()
+        if columns is not None:
+            # Only the footer and the chunks of the projected columns are fetched
+            with _ObjectRangeReader(s3, self.bucket, key, head["ContentLength"]) as f:
+                table = pa.parquet.read_table(f, columns=list(columns))
+        else:
+            with tempfile.NamedTemporaryFile() as f:
+                s3.download_fileobj(
+                    self.bucket, key, f, Config=self._get_transfer_config()
+                )
+                f.flush()
+                table = pa.parquet.read_table(f.name, memory_map=True)
+
+        if context.dagster_type.typing_type is pa.Table:
+            return table
+        return table.to_pandas()
@@ -0,0 +1,130 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Iterable, Optional, Tuple
+
+import scaleway.jobs.v1alpha1 as scw
+
+# (region, project_id) a job definition lives in
+Scope = Tuple[str, str]
+
+DEFAULT_JOB_DEFINITION_CACHE_TTL = 300
+DEFAULT_JOB_DEFINITION_CACHE_SIZE = 1024
+
+
+class JobDefinitionCache:
+    """Thread-safe index of job definitions by name, with TTL and LRU eviction.
+
+    Besides positive entries, the cache remembers the names of the scopes that have
+    been fully listed recently, so that a name missing from a complete listing can be
+    answered without paging through every definition of the project again, even when
+    the project has more definitions than the cache keeps.
+
+    It also hands out the locks that keep concurrent launches from listing a scope or
+    writing a definition more than once, see `listing` and `writing`.
+    """
+
+    def __init__(
+        self,
+        ttl: float = DEFAULT_JOB_DEFINITION_CACHE_TTL,
+        max_size: int = DEFAULT_JOB_DEFINITION_CACHE_SIZE,
+    ):
+        self._ttl = ttl
+        self._max_size = max_size
+        self._lock = threading.Lock()
+        self._entries: OrderedDict[
+            Tuple[Scope, str], Tuple[float, scw.JobDefinition]
+        ] = OrderedDict()
+        # Expiry and names of the fully listed scopes
+        self._complete_scopes: dict[Scope, Tuple[float, set[str]]] = {}
+        # Bumped whenever an entry of the scope is invalidated, see mark_complete
+        self._generations: dict[Scope, int] = {}
+        # Never cleared, as other threads may be holding them
+        self._listing_locks: dict[Scope, threading.Lock] = {}
+        self._writing_locks: dict[Tuple[Scope, str], threading.Lock] = {}
+
+    def lookup(
+        self, scope: Scope, name: str
+    ) -> Tuple[bool, Optional[scw.JobDefinition]]:
+        """Returns (True, job_def) on a hit, (True, None) if the name is known not to exist
+        and (False, None) if the API has to be queried.
+        """
+        now = time.monotonic()
+        key = (scope, name)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                expires_at, job_def = entry
+                if expires_at > now:
+                    self._entries.move_to_end(key)
+                    return True, job_def
+                del self._entries[key]
+                self._forget_scope(scope)
+
+            complete = self._complete_scopes.get(scope)
+            # Evicted names exist but have to be listed again
+            if complete is not None and complete[0] > now and name not in complete[1]:
+                return True, None
+
+            return False, None
+
+    def put(self, scope: Scope, job_def: scw.JobDefinition) -> None:
+        key = (scope, job_def.name)
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self._ttl, job_def)
+            self._entries.move_to_end(key)
+            complete = self._complete_scopes.get(scope)
+            if complete is not None:
+                complete[1].add(job_def.name)
+            while len(self._entries) > self._max_size:
+                self._entries.popitem(last=False)
+
+    def generation(self, scope: Scope) -> int:
+        with self._lock:
+            return self._generations.get(scope, 0)
+
+    def mark_complete(
+        self, scope: Scope, generation: int, names: Iterable[str]
+    ) -> None:
+        """Records the `names` of every definition of the scope.
+
+        Ignored if an entry of the scope was invalidated since `generation` was read, as
+        the listing may then have missed a change.
+        """
+        with self._lock:
+            if self._generations.get(scope, 0) == generation:
+                # Including the definitions created after the listing read their page
+                listed = set(names)
+                listed.update(
+                    name for entry_scope, name in self._entries if entry_scope == scope
+                )
+                self._complete_scopes[scope] = (time.monotonic() + self._ttl, listed)
+
+    def invalidate(self, scope: Scope, name: str) -> None:
+        with self._lock:
+            self._entries.pop((scope, name), None)
+            self._forget_scope(scope)
+
+    def _forget_scope(self, scope: Scope) -> None:
+        self._complete_scopes.pop(scope, None)
+        self._generations[scope] = self._generations.get(scope, 0) + 1
+
+    def listing(self, scope: Scope) -> threading.Lock:
+        """Lock held while paging through the definitions of a scope, so that misses
+        wait for the listing in progress, which likely indexes their names too.
+        """
+        with self._lock:
+            return self._listing_locks.setdefault(scope, threading.Lock())
+
+    def writing(self, scope: Scope, name: str) -> threading.Lock:
+        """Lock held while creating or updating a definition, so that concurrent
+        launches of a new spec write it once and reuse it.
+        """
+        with self._lock:
+            return self._writing_locks.setdefault((scope, name), threading.Lock())
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._complete_scopes.clear()
+            self._generations.clear()
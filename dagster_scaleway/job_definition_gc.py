@@ -0,0 +1,156 @@
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from typing import NamedTuple, Optional
+
+import scaleway
+import scaleway.jobs.v1alpha1 as scw
+
+# Written in the description of every job definition created by the run launcher
+JOB_DEFINITION_DESCRIPTION_MARKER = (
+    "Created by the ServerlessJobRunLauncher from dagster-scaleway."
+)
+
+DEFAULT_GC_MAX_AGE = timedelta(days=7)
+DEFAULT_GC_CONCURRENCY = 8
+
+GC_PAGE_SIZE = 100
+
+
+class JobDefinitionGcReport(NamedTuple):
+    dry_run: bool
+    # Deleted job definitions, or the ones that would be deleted in a dry run
+    deleted: list[scw.JobDefinition]
+    failed: list[tuple[scw.JobDefinition, str]]
+    kept: int
+
+    def format(self) -> str:
+        action = "Would delete" if self.dry_run else "Deleted"
+        lines = [
+            f"{action} {job_def.name} ({job_def.id}, last updated {job_def.updated_at or job_def.created_at})"
+            for job_def in self.deleted
+        ]
+        lines.extend(
+            f"Failed to delete {job_def.name} ({job_def.id}): {error}"
+            for job_def, error in self.failed
+        )
+        lines.append(
+            f"{action} {len(self.deleted)} job definitions, "
+            f"{len(self.failed)} failed, {self.kept} kept"
+        )
+        return "\n".join(lines)
+
+
+def _list_launcher_job_definitions(
+    api: scw.JobsV1Alpha1API, region: Optional[str], project_id: Optional[str]
+) -> list[scw.JobDefinition]:
+    job_defs = []
+    page = 1
+    while True:
+        res = api.list_job_definitions(
+            region=region,
+            project_id=project_id,
+            page=page,
+            page_size=GC_PAGE_SIZE,
+        )
+        job_defs.extend(
+            job_def
+            for job_def in res.job_definitions
+            if JOB_DEFINITION_DESCRIPTION_MARKER in (job_def.description or "")
+        )
+        if (
+            len(res.job_definitions) < GC_PAGE_SIZE
+            or page * GC_PAGE_SIZE >= res.total_count
+        ):
+            return job_defs
+        page += 1
+
+
+def _get_recently_used_job_definition_ids(
+    api: scw.JobsV1Alpha1API,
+    region: Optional[str],
+    project_id: Optional[str],
+    cutoff: datetime,
+) -> set[str]:
+    """Job definitions with a job run started after `cutoff` or still in progress.
+
+    Job runs can't be listed by state, and a job run queued or running for long was
+    created before the cutoff: every page is read, not only the recent ones.
+    """
+    job_def_ids = set()
+    page = 1
+    while True:
+        res = api.list_job_runs(
+            region=region,
+            project_id=project_id,
+            page=page,
+            page_size=GC_PAGE_SIZE,
+            order_by=scw.ListJobRunsRequestOrderBy.CREATED_AT_DESC,
+        )
+        for job_run in res.job_runs:
+            if (
+                job_run.created_at and job_run.created_at >= cutoff
+            ) or job_run.state in scw.JOB_RUN_TRANSIENT_STATUSES:
+                job_def_ids.add(job_run.job_definition_id)
+
+        if len(res.job_runs) < GC_PAGE_SIZE or page * GC_PAGE_SIZE >= res.total_count:
+            return job_def_ids
+        page += 1
+
+
+def collect_job_definitions(
+    api: scw.JobsV1Alpha1API,
+    region: Optional[str] = None,
+    project_id: Optional[str] = None,
+    max_age: timedelta = DEFAULT_GC_MAX_AGE,
+    dry_run: bool = False,
+    concurrency: int = DEFAULT_GC_CONCURRENCY,
+) -> JobDefinitionGcReport:
+    """Deletes the job definitions created by the run launcher that were neither updated
+    nor run in the last `max_age`.
+
+    Deletions run `concurrency` at a time, rate limited by the API's rate limiter when it
+    comes from a `ScalewayClientPool`.
+    """
+    cutoff = datetime.now(timezone.utc) - max_age
+
+    job_defs = _list_launcher_job_definitions(api, region, project_id)
+    recently_used = _get_recently_used_job_definition_ids(
+        api, region, project_id, cutoff
+    )
+    stale = [
+        job_def
+        for job_def in job_defs
+        if job_def.id not in recently_used
+        and (job_def.updated_at or job_def.created_at or cutoff) < cutoff
+    ]
+    kept = len(job_defs) - len(stale)
+
+    if dry_run or not stale:
+        return JobDefinitionGcReport(
+            dry_run=dry_run, deleted=stale, failed=[], kept=kept
+        )
+
+    def delete(job_def: scw.JobDefinition) -> Optional[str]:
+        try:
+            api.delete_job_definition(job_definition_id=job_def.id, region=region)
+        except scaleway.ScalewayException as e:
+            # Already gone is as good as deleted
+            if e.status_code != 404:
+                return str(e)
+        return None
+
+    with ThreadPoolExecutor(
+        max_workers=concurrency, thread_name_prefix="dagster-scaleway-gc"
+    ) as executor:
+        errors = list(executor.map(delete, stale))
+
+    return JobDefinitionGcReport(
+        dry_run=False,
+        deleted=[job_def for job_def, error in zip(stale, errors) if error is None],
+        failed=[
+            (job_def, error)
+            for job_def, error in zip(stale, errors)
+            if error is not None
+        ],
+        kept=kept,
+    )
@@ -0,0 +1,294 @@
+import threading
+import time
+from datetime import datetime, timedelta
+from typing import Callable, Optional, Sequence
+
+import scaleway.jobs.v1alpha1 as scw
+
+from .job_definition_cache import Scope
+
+DEFAULT_JOB_RUN_CACHE_TTL = 5
+
+JOB_RUNS_PAGE_SIZE = 100
+
+QUEUED_JOB_RUN_STATES = (scw.JobRunState.QUEUED, scw.JobRunState.SCHEDULED)
+
+
+def get_job_run_queue_duration(job_run: scw.JobRun) -> Optional[float]:
+    """Seconds a job run that left the queue spent in it, if the API tells.
+
+    Finished job runs know their run duration, running ones only their last update,
+    which is the start as long as they are observed shortly after it.
+    """
+    if job_run.created_at is None:
+        return None
+    started_at = job_run.updated_at
+    if job_run.terminated_at and job_run.run_duration:
+        try:
+            run_duration = float(job_run.run_duration.rstrip("s"))
+        except ValueError:
+            pass
+        else:
+            started_at = job_run.terminated_at - timedelta(seconds=run_duration)
+    if started_at is None:
+        return None
+    return max((started_at - job_run.created_at).total_seconds(), 0.0)
+
+
+class _ScopeState:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.refreshed_at: Optional[float] = None
+        # Number of threads listing the job runs of the scope
+        self.refreshing = 0
+        self.job_runs: dict[str, scw.JobRun] = {}
+        # Job runs still in a transient state, with their creation date if known
+        self.tracked: dict[str, Optional[datetime]] = {}
+
+
+class JobRunStateCache:
+    """Shared view of the state of the job runs started by the launcher.
+
+    All tracked job runs of a scope are refreshed together by paging through the
+    project's job runs newest first, so checking the health of N runs costs a few
+    list calls per TTL window instead of N individual GETs.
+
+    API calls are made without holding the lock of the scope: while a thread refreshes
+    it, the others keep reading the previous states instead of waiting for the pages.
+    """
+
+    def __init__(
+        self,
+        ttl: float = DEFAULT_JOB_RUN_CACHE_TTL,
+        on_dequeued: Optional[Callable[[Scope, scw.JobRun], None]] = None,
+    ):
+        self._ttl = ttl
+        # Called when a job run is first seen out of the queue
+        self._on_dequeued = on_dequeued
+        self._lock = threading.Lock()
+        self._scopes: dict[Scope, _ScopeState] = {}
+
+    def _get_scope_state(self, scope: Scope) -> _ScopeState:
+        with self._lock:
+            return self._scopes.setdefault(scope, _ScopeState())
+
+    def track(self, scope: Scope, job_run: scw.JobRun) -> None:
+        state = self._get_scope_state(scope)
+        with state.lock:
+            self._store(scope, state, job_run)
+
+    def get(
+        self,
+        api: scw.JobsV1Alpha1API,
+        scope: Scope,
+        job_run_id: str,
+        refresh: bool = False,
+    ) -> scw.JobRun:
+        """Returns the job run, refreshing every tracked job run of the scope if stale.
+
+        Job runs the cache has never seen, e.g. after a daemon restart, are fetched
+        individually once and tracked from then on. `refresh` forces an individual GET.
+        """
+        state = self._get_scope_state(scope)
+        with state.lock:
+            known = not refresh and job_run_id in state.job_runs
+        if not known:
+            return self._fetch(api, scope, state, job_run_id)
+
+        self._refresh(api, scope, state)
+
+        with state.lock:
+            job_run = state.job_runs.get(job_run_id)
+        if job_run is None:
+            # Dropped from the cache during the refresh, see _refresh
+            job_run = self._fetch(api, scope, state, job_run_id)
+        return job_run
+
+    def get_many(
+        self, api: scw.JobsV1Alpha1API, scope: Scope, job_run_ids: Sequence[str]
+    ) -> dict[str, scw.JobRun]:
+        """Returns the job runs found among `job_run_ids`, by job run ID.
+
+        Unknown job runs are tracked before the refresh, so they are looked up by the
+        same list calls instead of one GET each.
+        """
+        state = self._get_scope_state(scope)
+        with state.lock:
+            job_runs = {}
+            unknown = False
+            for job_run_id in job_run_ids:
+                job_run = state.job_runs.get(job_run_id)
+                if job_run is None:
+                    state.tracked.setdefault(job_run_id, None)
+                    unknown = True
+                elif job_run_id not in state.tracked:
+                    # Finished, read before the refresh forgets it
+                    job_runs[job_run_id] = job_run
+
+        # A refresh already in progress may have missed the job runs tracked above
+        self._refresh(api, scope, state, force=unknown)
+
+        with state.lock:
+            for job_run_id in job_run_ids:
+                if job_run_id not in job_runs and job_run_id in state.job_runs:
+                    job_runs[job_run_id] = state.job_runs[job_run_id]
+        return job_runs
+
+    def count_active(self, api: scw.JobsV1Alpha1API, scope: Scope) -> int:
+        """Number of tracked job runs of the scope still queued or running."""
+        state = self._get_scope_state(scope)
+        self._refresh(api, scope, state)
+        with state.lock:
+            return len(state.tracked)
+
+    def count_queued(self, api: scw.JobsV1Alpha1API, scope: Scope) -> int:
+        """Number of tracked job runs of the scope still waiting in Scaleway's queue."""
+        state = self._get_scope_state(scope)
+        self._refresh(api, scope, state)
+        with state.lock:
+            return sum(
+                1
+                for job_run_id in state.tracked
+                if job_run_id in state.job_runs
+                and state.job_runs[job_run_id].state in QUEUED_JOB_RUN_STATES
+            )
+
+    def invalidate(self, scope: Scope, job_run_id: str) -> None:
+        state = self._get_scope_state(scope)
+        with state.lock:
+            state.job_runs.pop(job_run_id, None)
+            state.tracked.pop(job_run_id, None)
+
+    def _is_stale(self, state: _ScopeState) -> bool:
+        return (
+            state.refreshed_at is None
+            or time.monotonic() - state.refreshed_at > self._ttl
+        )
+
+    def _store(self, scope: Scope, state: _ScopeState, job_run: scw.JobRun) -> None:
+        previous = state.job_runs.get(job_run.id)
+        if (
+            self._on_dequeued
+            and previous is not None
+            and previous.state in QUEUED_JOB_RUN_STATES
+            and job_run.state not in QUEUED_JOB_RUN_STATES
+        ):
+            self._on_dequeued(scope, job_run)
+
+        state.job_runs[job_run.id] = job_run
+        if job_run.state in scw.JOB_RUN_TRANSIENT_STATUSES:
+            state.tracked[job_run.id] = job_run.created_at
+        else:
+            state.tracked.pop(job_run.id, None)
+
+    def _fetch(
+        self,
+        api: scw.JobsV1Alpha1API,
+        scope: Scope,
+        state: _ScopeState,
+        job_run_id: str,
+    ) -> scw.JobRun:
+        job_run = api.get_job_run(job_run_id=job_run_id, region=scope[0])
+        with state.lock:
+            self._store(scope, state, job_run)
+        return job_run
+
+    def _refresh(
+        self,
+        api: scw.JobsV1Alpha1API,
+        scope: Scope,
+        state: _ScopeState,
+        force: bool = False,
+    ) -> None:
+        """Lists the tracked job runs of the scope if stale, unless another thread
+        already does, or `force` is set."""
+        with state.lock:
+            if not force and (state.refreshing or not self._is_stale(state)):
+                return
+
+            # Finished job runs were readable for a whole TTL window, forget them
+            state.job_runs = {
+                job_run_id: job_run
+                for job_run_id, job_run in state.job_runs.items()
+                if job_run_id in state.tracked
+            }
+            if not state.tracked:
+                state.refreshed_at = time.monotonic()
+                return
+
+            state.refreshing += 1
+            missing = dict(state.tracked)
+            previous = {
+                job_run_id: state.job_runs.get(job_run_id) for job_run_id in missing
+            }
+
+        try:
+            found = self._list_tracked(api, scope, missing)
+        except BaseException:
+            with state.lock:
+                state.refreshing -= 1
+            raise
+
+        with state.lock:
+            state.refreshing -= 1
+            # Job runs stored by another thread meanwhile were read after the listing
+            for job_run in found:
+                if state.job_runs.get(job_run.id) is previous[job_run.id]:
+                    self._store(scope, state, job_run)
+
+            # Not listed anymore (deleted?), fall back to individual GETs on next access
+            for job_run_id in missing:
+                if state.job_runs.get(job_run_id) is previous[job_run_id]:
+                    state.job_runs.pop(job_run_id, None)
+                    state.tracked.pop(job_run_id, None)
+
+            state.refreshed_at = time.monotonic()
+
+    def _list_tracked(
+        self,
+        api: scw.JobsV1Alpha1API,
+        scope: Scope,
+        missing: dict[str, Optional[datetime]],
+    ) -> list[scw.JobRun]:
+        """Pages through the job runs of the scope until all of `missing` are found.
+
+        Found job runs are removed from `missing`.
+        """
+        found = []
+        region, project_id = scope
+        page = 1
+        while missing:
+            res = api.list_job_runs(
+                region=region or None,
+                project_id=project_id or None,
+                page=page,
+                page_size=JOB_RUNS_PAGE_SIZE,
+                order_by=scw.ListJobRunsRequestOrderBy.CREATED_AT_DESC,
+            )
+            for job_run in res.job_runs:
+                if job_run.id in missing:
+                    del missing[job_run.id]
+                    found.append(job_run)
+
+            if (
+                not missing
+                or len(res.job_runs) < JOB_RUNS_PAGE_SIZE
+                or page * JOB_RUNS_PAGE_SIZE >= res.total_count
+            ):
+                break
+
+            # Pages are sorted newest first: once past the oldest run we are looking
+            # for, the remaining ones are gone
+            oldest_on_page = res.job_runs[-1].created_at
+            oldest_missing = [
+                created_at for created_at in missing.values() if created_at
+            ]
+            if (
+                oldest_on_page
+                and len(oldest_missing) == len(missing)
+                and oldest_on_page < min(oldest_missing)
+            ):
+                break
+            page += 1
+
+        return found
@@ -0,0 +1,128 @@
+from typing import Optional
+
+from dagster import DagsterInstance
+from dagster._core.definitions.data_version import (
+    CachingStaleStatusResolver,
+    StaleStatus,
+    extract_data_provenance_from_entry,
+)
+from dagster._core.definitions.external_asset_graph import ExternalAssetGraph
+from dagster._core.events import DagsterEvent, DagsterEventType
+from dagster._core.host_representation import ExternalRepository
+from dagster._core.storage.dagster_run import DagsterRun
+from dagster._core.storage.tags import (
+    ASSET_PARTITION_RANGE_START_TAG,
+    BACKFILL_ID_TAG,
+    PARTITION_NAME_TAG,
+)
+from dagster._core.workspace.context import IWorkspace
+
+# Set on the runs that were not launched because their assets were up to date
+MEMOIZED_TAG = "dagster-scaleway/memoized"
+
+
+def _get_external_repository(
+    workspace: IWorkspace, run: DagsterRun
+) -> ExternalRepository:
+    origin = run.external_job_origin
+    assert origin is not None
+    repository_origin = origin.external_repository_origin
+    return workspace.get_code_location(
+        repository_origin.code_location_origin.location_name
+    ).get_repository(repository_origin.repository_name)
+
+
+def get_launch_reason(
+    instance: DagsterInstance, workspace: Optional[IWorkspace], run: DagsterRun
+) -> Optional[str]:
+    """Why the run must be launched, or None if it only materializes assets that are
+    up to date.
+
+    An asset is up to date when it has a code version, its latest materialization was
+    made with that code version, and Dagster reports it as fresh: none of its upstream
+    assets got a new data version since.
+    """
+    if workspace is None or run.external_job_origin is None:
+        return "its code location is not known"
+    if run.parent_run_id:
+        return "it is a re-execution"
+    if run.asset_check_selection:
+        return "it executes asset checks"
+    if ASSET_PARTITION_RANGE_START_TAG in run.tags:
+        return "it targets a range of partitions"
+    backfill_id = run.tags.get(BACKFILL_ID_TAG)
+    if backfill_id:
+        backfill = instance.get_backfill(backfill_id)
+        if backfill is not None and backfill.is_asset_backfill:
+            # The backfill waits for the materializations of the partitions it requested
+            return "it is part of an asset backfill"
+
+    external_repository = _get_external_repository(workspace, run)
+    asset_nodes = {
+        node.asset_key: node
+        for node in external_repository.get_external_asset_nodes(run.job_name)
+        if not node.is_source
+    }
+    job_snapshot = instance.get_job_snapshot(run.job_snapshot_id)
+    node_names = {
+        node.node_name
+        for node in job_snapshot.dep_structure_snapshot.node_invocation_snaps
+    }
+    if not node_names <= {node.op_name for node in asset_nodes.values()}:
+        return "it executes ops that are not assets"
+    asset_keys = run.asset_selection or {
+        key for key, node in asset_nodes.items() if node.op_name in node_names
+    }
+
+    asset_graph = ExternalAssetGraph.from_external_repository(external_repository)
+    resolver = CachingStaleStatusResolver(instance, asset_graph)
+    partition_key = run.tags.get(PARTITION_NAME_TAG)
+    for asset_key in sorted(asset_keys):
+        name = asset_key.to_user_string()
+        code_version = asset_graph.get_code_version(asset_key)
+        if code_version is None:
+            return f"{name} has no code version"
+        if asset_graph.is_partitioned(asset_key) != (partition_key is not None):
+            return f"{name} is not materialized for a single partition"
+
+        record = instance.get_latest_data_version_record(
+            asset_key, is_source=False, partition_key=partition_key
+        )
+        provenance = (
+            extract_data_provenance_from_entry(record.event_log_entry)
+            if record
+            else None
+        )
+        if provenance is None or provenance.code_version != code_version:
+            return f"{name} has no materialization with code version {code_version}"
+
+        status = resolver.get_status(asset_key, partition_key)
+        if status != StaleStatus.FRESH:
+            causes = resolver.get_stale_root_causes(asset_key, partition_key)
+            return f"{name} is {status.value.lower()}" + (
+                f", {causes[0].key.asset_key.to_user_string()} {causes[0].reason}"
+                if causes
+                else ""
+            )
+
+    return None
+
+
+def report_memoized_run(instance: DagsterInstance, run: DagsterRun) -> None:
+    """Marks the run as started then succeeded, without executing anything."""
+    instance.add_run_tags(run.run_id, {MEMOIZED_TAG: "true"})
+    for event_type, message in (
+        (DagsterEventType.RUN_START, "Skipped launching the run."),
+        (
+            DagsterEventType.RUN_SUCCESS,
+            "All the assets of the run are up to date, nothing to execute.",
+        ),
+    ):
+        instance.report_dagster_event(
+            DagsterEvent(
+                event_type_value=event_type.value,
+                job_name=run.job_name,
+                message=message,
+            ),
+            run_id=run.run_id,
+        )
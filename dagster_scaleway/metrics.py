@@ -0,0 +1,328 @@
+import logging
+import os
+import re
+import tempfile
+import threading
+import time
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from typing import Any, Iterator, Mapping, Optional
+
+from dagster import Field, IntSource, StringSource
+from dagster._serdes import ConfigurableClass
+from dagster._serdes.config_class import ConfigurableClassData
+from typing_extensions import Self
+
+logger = logging.getLogger(__name__)
+
+API_REQUESTS = "dagster_scaleway_api_requests_total"
+API_ERRORS = "dagster_scaleway_api_errors_total"
+API_RETRIES = "dagster_scaleway_api_retries_total"
+API_REQUEST_DURATION = "dagster_scaleway_api_request_duration_seconds"
+API_THROTTLE_WAIT = "dagster_scaleway_api_throttle_wait_seconds"
+LAUNCH_SPAN_DURATION = "dagster_scaleway_launch_span_duration_seconds"
+JOB_RUN_QUEUE_DURATION = "dagster_scaleway_job_run_queue_duration_seconds"
+
+METRIC_DESCRIPTIONS = {
+    API_REQUESTS: "Scaleway API requests, after retries",
+    API_ERRORS: "Scaleway API requests that failed, after retries",
+    API_RETRIES: "Scaleway API requests retried by the rate limiter",
+    API_REQUEST_DURATION: "Duration of Scaleway API requests, retries included",
+    API_THROTTLE_WAIT: "Time Scaleway API requests waited on the rate limiter",
+    LAUNCH_SPAN_DURATION: "Duration of the steps of launching a run",
+    JOB_RUN_QUEUE_DURATION: "Time job runs spent queued on Scaleway before running",
+}
+
+DEFAULT_PROMETHEUS_FLUSH_INTERVAL = 15
+
+# e.g. /serverless-jobs/v1alpha1/regions/fr-par/job-definitions/<id>/start
+API_PATH_RE = re.compile(r"^/[^/]+/[^/]+/regions/(?P<region>[^/]+)/(?P<resource>.*)$")
+UUID_RE = re.compile(
+    r"[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}", re.IGNORECASE
+)
+
+
+def get_api_operation(method: str, path: str) -> tuple[str, str]:
+    """Region and low cardinality name of an API call, e.g. `POST job-definitions/{id}/start`."""
+    match = API_PATH_RE.match(path)
+    region, resource = (
+        (match.group("region"), match.group("resource")) if match else ("", path)
+    )
+    return region, f"{method} {UUID_RE.sub('{id}', resource)}"
+
+
+class MetricsSink(ABC):
+    """Receives the metrics of the run launcher.
+
+    Implementations must also implement `ConfigurableClass` to be set in the run
+    launcher's `metrics_sink` config. They are called from the launch threads and must
+    be thread-safe.
+    """
+
+    @abstractmethod
+    def increment(self, name: str, value: float, tags: Mapping[str, str]) -> None:
+        """Adds `value` to a counter."""
+
+    @abstractmethod
+    def observe(self, name: str, value: float, tags: Mapping[str, str]) -> None:
+        """Records a duration in seconds."""
+
+
+_local = threading.local()
+
+
+class LaunchMetrics:
+    """Records the launcher's metrics to its sink, if any.
+
+    Launch spans are also collected per thread, to be reported on the launched run.
+    Failures of the sink are logged and never fail a launch.
+    """
+
+    def __init__(self, sink: Optional[MetricsSink] = None):
+        self.sink = sink
+
+    def _emit(self, kind: str, name: str, value: float, tags: Mapping[str, str]):
+        if self.sink is None:
+            return
+        try:
+            getattr(self.sink, kind)(name, value, tags)
+        except Exception:
+            logger.exception("Failed to record metric %s", name)
+
+    def increment(self, name: str, tags: Mapping[str, str], value: float = 1):
+        self._emit("increment", name, value, tags)
+
+    def observe(self, name: str, value: float, tags: Mapping[str, str]):
+        self._emit("observe", name, value, tags)
+
+    def record_span(self, name: str, region: Optional[str], duration: float):
+        self.observe(
+            LAUNCH_SPAN_DURATION, duration, {"span": name, "region": region or ""}
+        )
+        spans = getattr(_local, "spans", None)
+        if spans is not None:
+            spans[name] = spans.get(name, 0.0) + duration
+
+    @contextmanager
+    def span(self, name: str, region: Optional[str]) -> Iterator[None]:
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record_span(name, region, time.perf_counter() - started)
+
+    def start_spans(self) -> None:
+        """Starts collecting the spans of the current thread."""
+        _local.spans = {}
+
+    def collect_spans(self) -> dict[str, float]:
+        """Total duration of each span since `start_spans`, and stops collecting."""
+        spans = getattr(_local, "spans", None) or {}
+        _local.spans = None
+        return spans
+
+    def api_request(
+        self,
+        method: str,
+        path: str,
+        status: str,
+        duration: float,
+        retries: int,
+        waited: float,
+    ):
+        region, operation = get_api_operation(method, path)
+        tags = {"region": region, "operation": operation}
+        self.increment(API_REQUESTS, {**tags, "status": status})
+        if not status.isdigit() or int(status) >= 400:
+            self.increment(API_ERRORS, {**tags, "status": status})
+        if retries:
+            self.increment(API_RETRIES, tags, retries)
+        if waited:
+            self.observe(API_THROTTLE_WAIT, waited, tags)
+        self.observe(API_REQUEST_DURATION, duration, tags)
+
+    def job_run_dequeued(self, region: str, queued: float):
+        self.observe(JOB_RUN_QUEUE_DURATION, queued, {"region": region})
+
+
+def _escape_label_value(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(tags: tuple[tuple[str, str], ...]) -> str:
+    if not tags:
+        return ""
+    labels = ",".join(f'{key}="{_escape_label_value(value)}"' for key, value in tags)
+    return "{" + labels + "}"
+
+
+class PrometheusTextfileMetricsSink(MetricsSink, ConfigurableClass):
+    """Aggregates the metrics in memory and writes them in the Prometheus text format.
+
+    The file is meant for the node exporter's textfile collector, or any sidecar serving
+    it. Durations are exported as summaries (`_sum` and `_count`). It is rewritten at
+    most every `flush_interval` seconds.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        flush_interval: int = DEFAULT_PROMETHEUS_FLUSH_INTERVAL,
+        inst_data: Optional[ConfigurableClassData] = None,
+    ):
+        self._inst_data = inst_data
+        self.path = path
+        self.flush_interval = flush_interval
+        self._lock = threading.Lock()
+        self._counters: dict[tuple[str, tuple], float] = {}
+        self._summaries: dict[tuple[str, tuple], tuple[float, int]] = {}
+        self._flushed_at = 0.0
+
+    @property
+    def inst_data(self):
+        return self._inst_data
+
+    @classmethod
+    def config_type(cls):
+        return {
+            "path": Field(
+                StringSource, description="The file the metrics are written to"
+            ),
+            "flush_interval": Field(
+                IntSource,
+                is_required=False,
+                default_value=DEFAULT_PROMETHEUS_FLUSH_INTERVAL,
+                description="Minimum time in seconds between two writes of the file",
+            ),
+        }
+
+    @classmethod
+    def from_config_value(
+        cls, inst_data: ConfigurableClassData, config_value: Mapping[str, Any]
+    ) -> Self:
+        return cls(inst_data=inst_data, **config_value)
+
+    def increment(self, name: str, value: float, tags: Mapping[str, str]) -> None:
+        key = (name, tuple(sorted(tags.items())))
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0.0) + value
+        self._maybe_flush()
+
+    def observe(self, name: str, value: float, tags: Mapping[str, str]) -> None:
+        key = (name, tuple(sorted(tags.items())))
+        with self._lock:
+            total, count = self._summaries.get(key, (0.0, 0))
+            self._summaries[key] = (total + value, count + 1)
+        self._maybe_flush()
+
+    def render(self) -> str:
+        lines = []
+        with self._lock:
+            counters = sorted(self._counters.items())
+            summaries = sorted(self._summaries.items())
+
+        last_name = None
+        for (name, tags), value in counters:
+            if name != last_name:
+                lines.append(f"# HELP {name} {METRIC_DESCRIPTIONS.get(name, name)}")
+                lines.append(f"# TYPE {name} counter")
+                last_name = name
+            lines.append(f"{name}{_format_labels(tags)} {value:g}")
+        for (name, tags), (total, count) in summaries:
+            if name != last_name:
+                lines.append(f"# HELP {name} {METRIC_DESCRIPTIONS.get(name, name)}")
+                lines.append(f"# TYPE {name} summary")
+                last_name = name
+            lines.append(f"{name}_sum{_format_labels(tags)} {total:.6f}")
+            lines.append(f"{name}_count{_format_labels(tags)} {count}")
+        return "\n".join(lines) + "\n"
+
+    def _maybe_flush(self):
+        now = time.monotonic()
+        with self._lock:
+            if now - self._flushed_at < self.flush_interval:
+                return
+            self._flushed_at = now
+        self.flush()
+
+    def flush(self) -> None:
+        """Writes the file atomically so that it is never scraped half written."""
+        directory = os.path.dirname(os.path.abspath(self.path))
+        fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w") as f:
+                f.write(self.render())
+            os.chmod(tmp_path, 0o644)
+            os.replace(tmp_path, self.path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+
+
+class OpenTelemetryMetricsSink(MetricsSink, ConfigurableClass):
+    """Records the metrics with the OpenTelemetry meter provider set up in the process.
+
+    Counters become OpenTelemetry counters and durations histograms. Requires the
+    OpenTelemetry SDK and an exporter, installed and configured by the deployment (e.g.
+    with `opentelemetry-instrument`).
+    """
+
+    def __init__(
+        self,
+        meter_name: str = "dagster_scaleway",
+        inst_data: Optional[ConfigurableClassData] = None,
+    ):
+        self._inst_data = inst_data
+        self.meter_name = meter_name
+        try:
+            from opentelemetry import metrics
+        except ImportError as e:
+            raise ImportError(
+                "OpenTelemetry metrics require opentelemetry-api, install it with "
+                "`pip install opentelemetry-sdk`"
+            ) from e
+
+        self._meter = metrics.get_meter(meter_name)
+        self._lock = threading.Lock()
+        self._instruments: dict[str, Any] = {}
+
+    @property
+    def inst_data(self):
+        return self._inst_data
+
+    @classmethod
+    def config_type(cls):
+        return {
+            "meter_name": Field(
+                StringSource,
+                is_required=False,
+                default_value="dagster_scaleway",
+                description="The name of the OpenTelemetry meter",
+            ),
+        }
+
+    @classmethod
+    def from_config_value(
+        cls, inst_data: ConfigurableClassData, config_value: Mapping[str, Any]
+    ) -> Self:
+        return cls(inst_data=inst_data, **config_value)
+
+    def _get_instrument(self, name: str, histogram: bool) -> Any:
+        with self._lock:
+            instrument = self._instruments.get(name)
+            if instrument is None:
+                description = METRIC_DESCRIPTIONS.get(name, "")
+                instrument = self._instruments[name] = (
+                    self._meter.create_histogram(
+                        name, unit="s", description=description
+                    )
+                    if histogram
+                    else self._meter.create_counter(name, description=description)
+                )
+            return instrument
+
+    def increment(self, name: str, value: float, tags: Mapping[str, str]) -> None:
+        self._get_instrument(name, histogram=False).add(value, attributes=dict(tags))
+
+    def observe(self, name: str, value: float, tags: Mapping[str, str]) -> None:
+        self._get_instrument(name, histogram=True).record(value, attributes=dict(tags))
@@ -0,0 +1,37 @@
+from typing import TYPE_CHECKING, Any, Optional
+
+if TYPE_CHECKING:
+    import scaleway
+
+
+def get_object_storage_endpoint(region: str) -> str:
+    return f"https://s3.{region}.scw.cloud"
+
+
+def get_object_storage_client(
+    region: str, client: Optional["scaleway.Client"] = None
+) -> Any:
+    """S3 client for Scaleway Object Storage, authenticated with the Scaleway credentials.
+
+    Requires boto3, which is installed with the `object-storage` extra.
+    """
+    try:
+        import boto3
+    except ImportError as e:
+        raise ImportError(
+            "Scaleway Object Storage support requires boto3, install it with "
+            "`pip install dagster-scaleway[object-storage]`"
+        ) from e
+
+    if client is None:
+        import scaleway
+
+        client = scaleway.Client.from_config_file_and_env()
+
+    return boto3.client(
+        "s3",
+        region_name=region,
+        endpoint_url=get_object_storage_endpoint(region),
+        aws_access_key_id=client.access_key,
+        aws_secret_access_key=client.secret_key,
+    )
@@ -0,0 +1,37 @@
+import base64
+import urllib.request
+import zlib
+
+# INPUT_JSON values are either the serialized Dagster arguments as is, or one of these.
+# Neither JSON nor base64 (the compressed arguments of execute_step) contain ":" at
+# this position, so the prefixes can't be mistaken for a plain payload.
+COMPRESSED_PAYLOAD_PREFIX = "zlib+base64:"
+URL_PAYLOAD_PREFIX = "zlib+url:"
+
+FETCH_TIMEOUT = 60
+
+
+def compress_payload(payload: str) -> bytes:
+    return zlib.compress(payload.encode("utf8"), level=9)
+
+
+def encode_compressed_payload(compressed: bytes) -> str:
+    return COMPRESSED_PAYLOAD_PREFIX + base64.b64encode(compressed).decode("ascii")
+
+
+def encode_payload_url(url: str) -> str:
+    return URL_PAYLOAD_PREFIX + url
+
+
+def decode_payload(value: str) -> str:
+    """Returns the payload an INPUT_JSON value stands for, fetching it if offloaded."""
+    if value.startswith(COMPRESSED_PAYLOAD_PREFIX):
+        compressed = base64.b64decode(value[len(COMPRESSED_PAYLOAD_PREFIX) :])
+    elif value.startswith(URL_PAYLOAD_PREFIX):
+        with urllib.request.urlopen(
+            value[len(URL_PAYLOAD_PREFIX) :], timeout=FETCH_TIMEOUT
+        ) as response:
+            compressed = response.read()
+    else:
+        return value
+    return zlib.decompress(compressed).decode("utf8")
@@ -0,0 +1,100 @@
+from abc import ABC, abstractmethod
+from typing import Any, Mapping, Optional
+
+from dagster import Field, IntSource, StringSource
+from dagster._serdes import ConfigurableClass
+from dagster._serdes.config_class import ConfigurableClassData
+from typing_extensions import Self
+
+from .object_storage import get_object_storage_client
+from .regions import REGION_FR_PAR
+
+DEFAULT_PAYLOAD_URL_EXPIRATION = 7 * 24 * 3600
+
+
+class PayloadStore(ABC):
+    """Stores the INPUT_JSON payloads too large to be passed as environment variables.
+
+    Implementations must also implement `ConfigurableClass` to be set in the run
+    launcher's `payload_store` config.
+    """
+
+    @abstractmethod
+    def put(self, key: str, data: bytes) -> str:
+        """Stores `data` and returns a URL the job run can GET it from without credentials."""
+
+
+class ObjectStoragePayloadStore(PayloadStore, ConfigurableClass):
+    """Stores payloads in a Scaleway Object Storage bucket, shared with presigned URLs.
+
+    Objects are not deleted once read, add a lifecycle rule expiring the prefix.
+    """
+
+    def __init__(
+        self,
+        bucket: str,
+        region: str = REGION_FR_PAR,
+        prefix: str = "dagster-scaleway/payloads",
+        url_expiration: int = DEFAULT_PAYLOAD_URL_EXPIRATION,
+        inst_data: Optional[ConfigurableClassData] = None,
+    ):
+        self._inst_data = inst_data
+        self.bucket = bucket
+        self.region = region
+        self.prefix = prefix
+        self.url_expiration = url_expiration
+        self._s3 = None
+
+    @property
+    def inst_data(self):
+        return self._inst_data
+
+    @classmethod
+    def config_type(cls):
+        return {
+            "bucket": Field(
+                StringSource, description="The bucket to store payloads in"
+            ),
+            "region": Field(
+                StringSource,
+                is_required=False,
+                default_value=REGION_FR_PAR,
+                description="The region of the bucket",
+            ),
+            "prefix": Field(
+                StringSource,
+                is_required=False,
+                default_value="dagster-scaleway/payloads",
+                description="The prefix of the payload keys",
+            ),
+            "url_expiration": Field(
+                IntSource,
+                is_required=False,
+                default_value=DEFAULT_PAYLOAD_URL_EXPIRATION,
+                description=(
+                    "How long in seconds the job run can fetch its payload, which must cover "
+                    "the time the run can spend queued"
+                ),
+            ),
+        }
+
+    @classmethod
+    def from_config_value(
+        cls, inst_data: ConfigurableClassData, config_value: Mapping[str, Any]
+    ) -> Self:
+        return cls(inst_data=inst_data, **config_value)
+
+    def _get_s3(self):
+        if self._s3 is None:
+            self._s3 = get_object_storage_client(self.region)
+        return self._s3
+
+    def put(self, key: str, data: bytes) -> str:
+        s3 = self._get_s3()
+        object_key = f"{self.prefix.rstrip('/')}/{key}"
+        s3.put_object(Bucket=self.bucket, Key=object_key, Body=data)
+        return s3.generate_presigned_url(
+            "get_object",
+            Params={"Bucket": self.bucket, "Key": object_key},
+            ExpiresIn=self.url_expiration,
+        )
@@ -0,0 +1,349 @@
+import json
+import shlex
+import time
+import uuid
+from contextlib import contextmanager
+from typing import Any, Iterator, Mapping, Optional, Sequence, Union
+
+import dagster._check as check
+import scaleway
+import scaleway.jobs.v1alpha1 as scw
+from dagster import OpExecutionContext
+from dagster._annotations import experimental, public
+from dagster._core.definitions.resource_annotation import ResourceParam
+from dagster._core.errors import (
+    DagsterExecutionInterruptedError,
+    DagsterPipesExecutionError,
+)
+from dagster._core.pipes.client import (
+    PipesClient,
+    PipesClientCompletedInvocation,
+    PipesContextInjector,
+    PipesMessageReader,
+    PipesParams,
+)
+from dagster._core.pipes.context import PipesContextData
+from dagster._core.pipes.utils import (
+    PipesBlobStoreMessageReader,
+    PipesEnvContextInjector,
+    PipesLogReader,
+    open_pipes_session,
+)
+from dagster_pipes import PipesExtras
+
+from .job_definition_cache import Scope
+from .object_storage import get_object_storage_client
+from .regions import REGION_FR_PAR
+from .serverless_job_launcher import (
+    ScalewayServerlessJobRunLauncher,
+    build_job_definition_spec,
+)
+
+# Polling starts fast for short workloads and slows down to poll_interval
+FIRST_POLL_INTERVAL = 1.0
+POLL_BACKOFF = 1.5
+DEFAULT_POLL_INTERVAL = 10.0
+
+DEFAULT_PIPES_KEY_PREFIX = "dagster-scaleway/pipes"
+
+
+@experimental
+class PipesObjectStorageContextInjector(PipesContextInjector):
+    """Injects the Pipes context through a Scaleway Object Storage bucket.
+
+    Use it when the context is too large for the job run's environment variables. The
+    external process reads it with `dagster_pipes.PipesS3ContextLoader`, given an S3
+    client for the Scaleway endpoint.
+    """
+
+    def __init__(
+        self,
+        bucket: str,
+        region: str = REGION_FR_PAR,
+        key_prefix: str = DEFAULT_PIPES_KEY_PREFIX,
+        client: Optional[Any] = None,
+    ):
+        self.bucket = check.str_param(bucket, "bucket")
+        self.key_prefix = key_prefix.rstrip("/")
+        self._s3 = client or get_object_storage_client(region)
+
+    @contextmanager
+    def inject_context(self, context: PipesContextData) -> Iterator[PipesParams]:
+        key = f"{self.key_prefix}/{uuid.uuid4()}/context.json"
+        self._s3.put_object(
+            Bucket=self.bucket, Key=key, Body=json.dumps(context).encode("utf8")
+        )
+        try:
+            yield {"bucket": self.bucket, "key": key}
+        finally:
+            self._s3.delete_object(Bucket=self.bucket, Key=key)
+
+    def no_messages_debug_text(self) -> str:
+        return (
+            "Attempted to inject context via Scaleway Object Storage. Expected a "
+            "PipesS3ContextLoader to be explicitly passed to open_dagster_pipes in the "
+            "external process."
+        )
+
+
+@experimental
+class PipesObjectStorageMessageReader(PipesBlobStoreMessageReader):
+    """Reads the Pipes messages written to a Scaleway Object Storage bucket.
+
+    The external process writes them with `dagster_pipes.PipesS3MessageWriter`, given an
+    S3 client for the Scaleway endpoint. Message chunks are not deleted once read, add a
+    lifecycle rule expiring the prefix.
+    """
+
+    def __init__(
+        self,
+        bucket: str,
+        region: str = REGION_FR_PAR,
+        key_prefix: str = DEFAULT_PIPES_KEY_PREFIX,
+        interval: float = 10,
+        client: Optional[Any] = None,
+        log_readers: Optional[Sequence[PipesLogReader]] = None,
+    ):
+        super().__init__(interval=interval, log_readers=log_readers)
+        self.bucket = check.str_param(bucket, "bucket")
+        self.key_prefix = key_prefix.rstrip("/")
+        self._s3 = client or get_object_storage_client(region)
+
+    @contextmanager
+    def get_params(self) -> Iterator[PipesParams]:
+        yield {
+            "bucket": self.bucket,
+            "key_prefix": f"{self.key_prefix}/{uuid.uuid4()}",
+        }
+
+    def download_messages_chunk(self, index: int, params: PipesParams) -> Optional[str]:
+        key = f"{params['key_prefix']}/{index}.json"
+        try:
+            obj = self._s3.get_object(Bucket=params["bucket"], Key=key)
+        except self._s3.exceptions.NoSuchKey:
+            return None
+        return obj["Body"].read().decode("utf-8")
+
+    def no_messages_debug_text(self) -> str:
+        return (
+            "Attempted to read messages from Scaleway Object Storage. Expected a "
+            "PipesS3MessageWriter to be explicitly passed to open_dagster_pipes in the "
+            "external process."
+        )
+
+
+@experimental
+class _PipesScalewayServerlessJobClient(PipesClient):
+    """A Pipes client running a workload from any image as a Scaleway Serverless Job.
+
+    Job definitions are ensured and started like the ones of the run launcher: the
+    instance's `ScalewayServerlessJobRunLauncher` is used when configured, sharing its
+    job definition index, rate limits, job run slots and metrics, otherwise the client
+    uses its own. Job runs are polled through the launcher's job run cache, which
+    refreshes all the job runs in flight with a few list calls.
+
+    The job run's output only reaches Scaleway Cockpit, so messages must go through a
+    channel readable from here, e.g. :py:class:`PipesObjectStorageMessageReader`. Logs
+    sent by the external process with `context.log` are relayed through it.
+
+    Args:
+        message_reader (PipesMessageReader): Reads the messages of the external process.
+        context_injector (Optional[PipesContextInjector]): Passes the context to the
+            external process. Defaults to :py:class:`PipesEnvContextInjector`.
+        region (Optional[str]): Region of the job runs. Defaults to the run's region.
+        env_vars (Optional[Sequence[str]]): Environment variables of the job definition,
+            added to the launcher's, as `KEY=VALUE` or `KEY` to read it from here.
+        memory_limit (Optional[int]): Memory limit in MiB. Defaults to the run's.
+        cpu_limit (Optional[int]): CPU limit in mCPU. Defaults to the run's.
+        poll_interval (float): Maximum time in seconds between two job run state checks.
+        forward_termination (bool): Whether to stop the job run when the op is
+            interrupted or canceled.
+    """
+
+    def __init__(
+        self,
+        message_reader: PipesMessageReader,
+        context_injector: Optional[PipesContextInjector] = None,
+        region: Optional[str] = None,
+        env_vars: Optional[Sequence[str]] = None,
+        memory_limit: Optional[int] = None,
+        cpu_limit: Optional[int] = None,
+        poll_interval: float = DEFAULT_POLL_INTERVAL,
+        forward_termination: bool = True,
+    ):
+        self.message_reader = check.inst_param(
+            message_reader, "message_reader", PipesMessageReader
+        )
+        self.context_injector = (
+            check.opt_inst_param(
+                context_injector, "context_injector", PipesContextInjector
+            )
+            or PipesEnvContextInjector()
+        )
+        self.config = {
+            key: value
+            for key, value in (
+                ("region", check.opt_str_param(region, "region")),
+                ("env_vars", check.opt_sequence_param(env_vars, "env_vars") or None),
+                ("memory_limit", check.opt_int_param(memory_limit, "memory_limit")),
+                ("cpu_limit", check.opt_int_param(cpu_limit, "cpu_limit")),
+            )
+            if value is not None
+        }
+        self.poll_interval = check.numeric_param(poll_interval, "poll_interval")
+        self.forward_termination = check.bool_param(
+            forward_termination, "forward_termination"
+        )
+        self._launcher: Optional[ScalewayServerlessJobRunLauncher] = None
+
+    @classmethod
+    def _is_dagster_maintained(cls) -> bool:
+        return False
+
+    def _get_launcher(
+        self, context: OpExecutionContext
+    ) -> ScalewayServerlessJobRunLauncher:
+        run_launcher = context.instance.run_launcher
+        if isinstance(run_launcher, ScalewayServerlessJobRunLauncher):
+            return run_launcher
+        if self._launcher is None:
+            self._launcher = ScalewayServerlessJobRunLauncher()
+            self._launcher.register_instance(context.instance)
+        return self._launcher
+
+    @public
+    def run(
+        self,
+        *,
+        context: OpExecutionContext,
+        image: str,
+        command: Union[str, Sequence[str]],
+        extras: Optional[PipesExtras] = None,
+        env: Optional[Mapping[str, str]] = None,
+        memory_limit: Optional[int] = None,
+        cpu_limit: Optional[int] = None,
+        job_definition_name: Optional[str] = None,
+    ) -> PipesClientCompletedInvocation:
+        """Runs `command` in a serverless job of `image` and waits for it to complete.
+
+        Args:
+            context (OpExecutionContext): The context of the executing op or asset.
+            image (str): The image of the job.
+            command (Union[str, Sequence[str]]): The command of the job.
+            extras (Optional[PipesExtras]): Extra parameters passed to the external process.
+            env (Optional[Mapping[str, str]]): Environment variables of this job run only.
+            memory_limit (Optional[int]): Memory limit in MiB, overriding the client's.
+            cpu_limit (Optional[int]): CPU limit in mCPU, overriding the client's.
+            job_definition_name (Optional[str]): Name of the job definition, suffixed
+                with the fingerprint of its spec. Shared by the invocations of the op
+                by default.
+
+        Returns:
+            PipesClientCompletedInvocation: Wrapper containing the results reported by the
+            external process.
+        """
+        launcher = self._get_launcher(context)
+        run = context.dagster_run
+        serverless_job_context = launcher.get_serverless_job_context(run).merge_config(
+            {
+                **self.config,
+                **{
+                    key: value
+                    for key, value in (
+                        ("memory_limit", memory_limit),
+                        ("cpu_limit", cpu_limit),
+                    )
+                    if value is not None
+                },
+            }
+        )
+        api = launcher._get_api(serverless_job_context)
+        scope = launcher._get_job_definition_scope(api.client)
+
+        name = job_definition_name or f"{run.job_name}.{context.op.name}.pipes"
+        spec = build_job_definition_spec(
+            name,
+            f"Pipes workload of op {context.op.name} in {run.job_name}",
+            {
+                "image_uri": image,
+                "environment_variables": launcher._get_job_definition_env(
+                    run, serverless_job_context
+                ),
+                "command": command if isinstance(command, str) else shlex.join(command),
+                "memory_limit": serverless_job_context.memory_limit,
+                "cpu_limit": serverless_job_context.cpu_limit,
+            },
+        )
+
+        with open_pipes_session(
+            context=context,
+            context_injector=self.context_injector,
+            message_reader=self.message_reader,
+            extras=extras,
+        ) as pipes_session:
+            # The session parameters change with every invocation, they are passed to
+            # the job run so that the job definition is reused
+            job_def, job_run = launcher._start_external_job(
+                api,
+                run,
+                spec,
+                {
+                    "DAGSTER_RUN_ID": run.run_id,
+                    **(env or {}),
+                    **pipes_session.get_bootstrap_env_vars(),
+                },
+            )
+            context.log.info(
+                f"[pipes] Started Scaleway job run {job_run.id} of job definition {job_def.name}"
+            )
+
+            try:
+                job_run = self._wait_for_job_run(launcher, api, scope, job_run)
+            except DagsterExecutionInterruptedError:
+                if self.forward_termination:
+                    context.log.info(
+                        f"[pipes] Execution interrupted, stopping Scaleway job run {job_run.id}"
+                    )
+                    self._stop_job_run(launcher, api, scope, job_run)
+                raise
+
+            if job_run.state != scw.JobRunState.SUCCEEDED:
+                message = f"Scaleway job run {job_run.id} is {job_run.state}"
+                if job_run.exit_code is not None:
+                    message += f" with exit code {job_run.exit_code}"
+                if job_run.error_message:
+                    message += f": {job_run.error_message}"
+                raise DagsterPipesExecutionError(message)
+
+        return PipesClientCompletedInvocation(pipes_session)
+
+    def _wait_for_job_run(
+        self,
+        launcher: ScalewayServerlessJobRunLauncher,
+        api: scw.JobsV1Alpha1API,
+        scope: Scope,
+        job_run: scw.JobRun,
+    ) -> scw.JobRun:
+        interval = min(FIRST_POLL_INTERVAL, self.poll_interval)
+        while job_run.state in scw.JOB_RUN_TRANSIENT_STATUSES:
+            time.sleep(interval)
+            interval = min(interval * POLL_BACKOFF, self.poll_interval)
+            job_run = launcher._job_run_cache.get(api, scope, job_run.id)
+        return job_run
+
+    def _stop_job_run(
+        self,
+        launcher: ScalewayServerlessJobRunLauncher,
+        api: scw.JobsV1Alpha1API,
+        scope: Scope,
+        job_run: scw.JobRun,
+    ) -> None:
+        try:
+            job_run = api.stop_job_run(job_run_id=job_run.id)
+        except scaleway.ScalewayException:
+            # Already over
+            return
+        launcher._job_run_cache.track(scope, job_run)
+
+
+PipesScalewayServerlessJobClient = ResourceParam[_PipesScalewayServerlessJobClient]
@@ -0,0 +1,107 @@
+import threading
+import time
+from typing import Callable, NamedTuple, Optional, Sequence
+
+PLACEMENT_BALANCED = "balanced"
+PLACEMENT_ORDERED = "ordered"
+PLACEMENT_STRATEGIES = (PLACEMENT_BALANCED, PLACEMENT_ORDERED)
+
+DEFAULT_SATURATION_COOLDOWN = 60
+
+# Weight of the last launch in the average launch latency of a region
+LATENCY_SMOOTHING = 0.3
+
+
+class RegionWeight(NamedTuple):
+    region: str
+    weight: float = 1.0
+
+
+class RegionLoad(NamedTuple):
+    # Job runs of the launcher waiting in the region's queue
+    queued: int
+    # Whether a job run slot of the region is free, see max_concurrent_job_runs
+    has_free_slot: bool = True
+
+
+class _RegionStats:
+    def __init__(self):
+        self.launching = 0
+        self.latency: Optional[float] = None
+        self.saturated_until = 0.0
+
+
+class RegionPlacer:
+    """Ranks the regions a run can be launched in.
+
+    Regions that recently reached a quota, then regions without a free job run slot,
+    are ranked last. The `ordered` strategy keeps the configured order otherwise, the
+    `balanced` one ranks regions by their queued and launching job runs, scaled by their
+    recent launch latency and divided by their weight.
+    """
+
+    def __init__(
+        self,
+        regions: Sequence[RegionWeight],
+        strategy: str = PLACEMENT_BALANCED,
+        saturation_cooldown: float = DEFAULT_SATURATION_COOLDOWN,
+    ):
+        if strategy not in PLACEMENT_STRATEGIES:
+            raise ValueError(
+                f"Unknown region placement {strategy}, expected one of {', '.join(PLACEMENT_STRATEGIES)}"
+            )
+        self.regions = list(regions)
+        self.strategy = strategy
+        self.saturation_cooldown = saturation_cooldown
+        self._lock = threading.Lock()
+        self._stats = {region.region: _RegionStats() for region in self.regions}
+
+    def _score(self, region: RegionWeight, load: RegionLoad) -> float:
+        stats = self._stats[region.region]
+        pending = load.queued + stats.launching + 1
+        return pending * (1 + (stats.latency or 0.0)) / max(region.weight, 1e-9)
+
+    def rank(self, get_load: Callable[[str], RegionLoad]) -> list[str]:
+        """Regions from the best to the worst placement for the next launch."""
+        loads = {region.region: get_load(region.region) for region in self.regions}
+        now = time.monotonic()
+        with self._lock:
+            keys = {
+                region.region: (
+                    self._stats[region.region].saturated_until > now,
+                    not loads[region.region].has_free_slot,
+                    self._score(region, loads[region.region])
+                    if self.strategy == PLACEMENT_BALANCED
+                    else 0.0,
+                    index,
+                )
+                for index, region in enumerate(self.regions)
+            }
+        return sorted(keys, key=keys.__getitem__)
+
+    def acquire(self, region: str) -> None:
+        """Counts a launch in progress in the region, until `release`."""
+        with self._lock:
+            if region in self._stats:
+                self._stats[region].launching += 1
+
+    def release(
+        self,
+        region: str,
+        latency: Optional[float] = None,
+        saturated: bool = False,
+    ) -> None:
+        with self._lock:
+            stats = self._stats.get(region)
+            if stats is None:
+                return
+            stats.launching -= 1
+            if latency is not None:
+                stats.latency = (
+                    latency
+                    if stats.latency is None
+                    else LATENCY_SMOOTHING * latency
+                    + (1 - LATENCY_SMOOTHING) * stats.latency
+                )
+            if saturated:
+                stats.saturated_until = time.monotonic() + self.saturation_cooldown
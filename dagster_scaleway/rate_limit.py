@@ -0,0 +1,228 @@
+import random
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Iterator, NamedTuple, Optional
+
+import requests
+
+DEFAULT_API_MAX_RETRIES = 5
+DEFAULT_BACKOFF_BASE_DELAY = 0.5
+DEFAULT_BACKOFF_MAX_DELAY = 30.0
+
+# Error type returned by Scaleway APIs when a quota (e.g. concurrent job runs) is reached
+QUOTAS_EXCEEDED_ERROR_TYPE = "quotas_exceeded"
+
+
+class RegionRateLimit(NamedTuple):
+    """Client-side limits applied to the calls made to one region."""
+
+    requests_per_second: Optional[float] = None
+    burst: Optional[int] = None
+    max_concurrent_job_runs: Optional[int] = None
+
+
+class ThrottleStats:
+    """Time spent waiting on the rate limiter and retries done by the current thread."""
+
+    def __init__(self):
+        self.waited = 0.0
+        self.retries = 0
+        self.statuses: list[int] = []
+
+    @property
+    def throttled(self) -> bool:
+        return self.waited > 0 or self.retries > 0
+
+    def __str__(self) -> str:
+        message = f"waited {self.waited:.2f}s for the Scaleway API"
+        if self.retries:
+            statuses = ", ".join(str(status) for status in sorted(set(self.statuses)))
+            message += f", retried {self.retries} times after HTTP {statuses}"
+        return message
+
+
+_local = threading.local()
+
+
+def get_throttle_stats() -> ThrottleStats:
+    stats = getattr(_local, "stats", None)
+    if stats is None:
+        stats = _local.stats = ThrottleStats()
+    return stats
+
+
+def reset_throttle_stats() -> ThrottleStats:
+    """Starts a new measurement on the current thread and returns the previous one."""
+    stats = get_throttle_stats()
+    _local.stats = ThrottleStats()
+    return stats
+
+
+class TokenBucket:
+    def __init__(self, rate: float, burst: int):
+        self._rate = rate
+        self._capacity = max(burst, 1)
+        self._tokens = float(self._capacity)
+        self._updated_at = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> float:
+        """Takes a token, blocking until one is available. Returns the time waited."""
+        waited = 0.0
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(
+                    self._capacity, self._tokens + (now - self._updated_at) * self._rate
+                )
+                self._updated_at = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return waited
+                delay = (1 - self._tokens) / self._rate
+            time.sleep(delay)
+            waited += delay
+
+
+def is_quota_error(response: requests.Response) -> bool:
+    if response.status_code not in (403, 409):
+        return False
+    try:
+        return response.json().get("type") == QUOTAS_EXCEEDED_ERROR_TYPE
+    except ValueError:
+        return False
+
+
+@contextmanager
+def no_quota_retries(enabled: bool = True) -> Iterator[None]:
+    """Returns quota errors of the current thread's requests at once instead of retrying
+    them, for callers that can start their job run in another region.
+    """
+    previous = getattr(_local, "no_quota_retries", False)
+    _local.no_quota_retries = enabled
+    try:
+        yield
+    finally:
+        _local.no_quota_retries = previous
+
+
+def _is_retryable(method: str, response: requests.Response) -> bool:
+    if response.status_code == 429:
+        return True
+
+    if response.status_code >= 500:
+        # A write may have been applied before the error, only reads are safe to replay
+        return method == "GET"
+
+    return (
+        method == "POST"
+        and is_quota_error(response)
+        and not getattr(_local, "no_quota_retries", False)
+    )
+
+
+class RateLimiter:
+    """Token bucket on outgoing requests, with exponential backoff and full jitter on
+    429, quota errors (unless disabled by `no_quota_retries`) and, for reads, 5xx
+    responses.
+    """
+
+    def __init__(
+        self,
+        limit: RegionRateLimit,
+        max_retries: int = DEFAULT_API_MAX_RETRIES,
+        base_delay: float = DEFAULT_BACKOFF_BASE_DELAY,
+        max_delay: float = DEFAULT_BACKOFF_MAX_DELAY,
+    ):
+        self.limit = limit
+        self._bucket = (
+            TokenBucket(
+                limit.requests_per_second,
+                limit.burst or int(limit.requests_per_second) or 1,
+            )
+            if limit.requests_per_second
+            else None
+        )
+        self._max_retries = max_retries
+        self._base_delay = base_delay
+        self._max_delay = max_delay
+
+    def _get_backoff_delay(self, attempt: int, response: requests.Response) -> float:
+        retry_after = response.headers.get("Retry-After")
+        if retry_after:
+            try:
+                return min(self._max_delay, float(retry_after))
+            except ValueError:
+                pass
+        cap = min(self._max_delay, self._base_delay * 2**attempt)
+        return random.uniform(0, cap)
+
+    def send(
+        self, method: str, send: Callable[[], requests.Response]
+    ) -> requests.Response:
+        stats = get_throttle_stats()
+        attempt = 0
+        while True:
+            if self._bucket:
+                stats.waited += self._bucket.acquire()
+
+            response = send()
+
+            if attempt >= self._max_retries or not _is_retryable(method, response):
+                return response
+
+            delay = self._get_backoff_delay(attempt, response)
+            stats.retries += 1
+            stats.statuses.append(response.status_code)
+            stats.waited += delay
+            time.sleep(delay)
+            attempt += 1
+
+
+class ConcurrencyGate:
+    """Caps the number of job runs active at once, counting starts still in flight."""
+
+    def __init__(self, limit: int):
+        self.limit = limit
+        self._lock = threading.Lock()
+        self._reserved = 0
+
+    def has_free_slot(self, active: int) -> bool:
+        with self._lock:
+            return active + self._reserved < self.limit
+
+    @contextmanager
+    def slot(
+        self,
+        count_active: Callable[[], int],
+        poll_interval: float,
+        timeout: float,
+        on_wait: Callable[[int], None],
+    ) -> Iterator[bool]:
+        """Waits until fewer than `limit` job runs are active, then holds a reservation.
+
+        Yields False if `timeout` expired first, in which case the caller proceeds
+        anyway and relies on the API to enforce the quota.
+        """
+        deadline = time.monotonic() + timeout
+        reported = False
+        while True:
+            active = count_active()
+            with self._lock:
+                if active + self._reserved < self.limit:
+                    self._reserved += 1
+                    break
+            if time.monotonic() > deadline:
+                yield False
+                return
+            if not reported:
+                on_wait(active + self._reserved)
+                reported = True
+            time.sleep(poll_interval)
+
+        try:
+            yield True
+        finally:
+            with self._lock:
+                self._reserved -= 1
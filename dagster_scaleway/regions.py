@@ -0,0 +1,3 @@
+# Same value as scaleway_core.bridge.region.REGION_FR_PAR, whose import loads the whole
+# Scaleway SDK core
+REGION_FR_PAR = "fr-par"
@@ -1,3 +1,5 @@
+import functools
+import json
 from typing import TYPE_CHECKING, Any, Mapping, NamedTuple, Optional, Sequence, cast
 
 from dagster import (
@@ -9,7 +11,7 @@ from dagster._core.container_context import process_shared_container_context_con
 from dagster._core.errors import DagsterInvalidConfigError
 from dagster._core.storage.dagster_run import DagsterRun
 
-from scaleway_core.bridge.region import REGION_FR_PAR
+from .regions import REGION_FR_PAR
 
 if TYPE_CHECKING:
     from . import ScalewayServerlessJobRunLauncher
@@ -47,9 +49,16 @@ SCALEWAY_SERVERLESS_JOB_CONTEXT_SCHEMA = {
     ),
 }
 
+# Tag holding a JSON object with any of the keys of the schema above, set on jobs, runs,
+# ops or assets (through `op_tags`) to override the serverless job config
+SCALEWAY_CONFIG_TAG = "dagster-scaleway/config"
+
 DEFAULT_CPU_LIMIT = 1000
 DEFAULT_MEMORY_LIMIT = 512
 
+# Number of resolved contexts kept, there is usually one per code location
+CONTEXT_CACHE_SIZE = 256
+
 
 class ScalewayServerlessJobContext(
     NamedTuple(
@@ -111,24 +120,34 @@ class ScalewayServerlessJobContext(
             else self.cpu_limit,
         )
 
+    def merge_config(self, config: Mapping[str, Any]) -> "ScalewayServerlessJobContext":
+        """Overrides this context with the keys explicitly set in `config`."""
+        return self.merge(
+            ScalewayServerlessJobContext(
+                docker_image=config.get("docker_image"),
+                env_vars=config.get("env_vars", []),
+                region=config.get("region"),
+                memory_limit=config.get("memory_limit", self.memory_limit),
+                cpu_limit=config.get("cpu_limit", self.cpu_limit),
+            )
+        )
+
     @staticmethod
     def create_for_run(
         dagster_run: DagsterRun,
         run_launcher: Optional["ScalewayServerlessJobRunLauncher"],
     ):
-        context = ScalewayServerlessJobContext()
-
-        # First apply the instance / run_launcher-level context
-        if run_launcher:
-            context = context.merge(
-                ScalewayServerlessJobContext(
-                    docker_image=run_launcher.docker_image,
-                    env_vars=run_launcher.env_vars,
-                    region=run_launcher.region,
-                    memory_limit=run_launcher.memory_limit,
-                    cpu_limit=run_launcher.cpu_limit,
-                )
+        launcher_config = (
+            (
+                run_launcher.docker_image,
+                tuple(run_launcher.env_vars or []),
+                run_launcher.region,
+                run_launcher.memory_limit,
+                run_launcher.cpu_limit,
             )
+            if run_launcher
+            else None
+        )
 
         run_container_context = (
             dagster_run.job_code_origin.repository_origin.container_context
@@ -136,52 +155,126 @@ class ScalewayServerlessJobContext(
             else None
         )
 
-        if not run_container_context:
-            return context
+        # Runs of a single op or asset are sized like that op
+        step_config_tag = (
+            run_launcher.get_single_step_config_tag(
+                dagster_run.execution_plan_snapshot_id
+            )
+            if run_launcher and dagster_run.execution_plan_snapshot_id
+            else None
+        )
 
-        return context.merge(
-            ScalewayServerlessJobContext.create_from_config(run_container_context)
+        # Resolving the context validates the container context against the schema, which
+        # is slow enough to matter when it is done several times per launch
+        return _create_for_config(
+            launcher_config,
+            json.dumps(run_container_context, sort_keys=True)
+            if run_container_context
+            else None,
+            (dagster_run.tags.get(SCALEWAY_CONFIG_TAG), step_config_tag),
         )
 
     @staticmethod
-    def create_from_config(run_container_context):
+    def get_config_from_container_context(
+        run_container_context: Optional[Mapping[str, Any]],
+    ) -> Mapping[str, Any]:
         processed_shared_container_context = process_shared_container_context_config(
             run_container_context or {}
         )
-        shared_container_context = ScalewayServerlessJobContext(
-            env_vars=processed_shared_container_context.get("env_vars", [])
-        )
+        shared_env_vars = processed_shared_container_context.get("env_vars", [])
 
         run_docker_container_context = (
             run_container_context.get("docker", {}) if run_container_context else {}
         )
 
         if not run_docker_container_context:
-            return shared_container_context
+            return {"env_vars": shared_env_vars}
 
-        processed_container_context = process_config(
-            SCALEWAY_SERVERLESS_JOB_CONTEXT_SCHEMA, run_docker_container_context
+        config = _process_context_config(
+            run_docker_container_context, "Docker container context"
         )
+        return {
+            **config,
+            "env_vars": [*shared_env_vars, *config.get("env_vars", [])],
+        }
 
-        if not processed_container_context.success:
+    @staticmethod
+    def get_config_from_tag(tag_value: Optional[str]) -> Mapping[str, Any]:
+        """Parses the JSON config of a `dagster-scaleway/config` tag."""
+        if not tag_value:
+            return {}
+
+        try:
+            config = json.loads(tag_value)
+        except json.JSONDecodeError as e:
             raise DagsterInvalidConfigError(
-                "Errors while parsing Docker container context",
-                processed_container_context.errors,
-                run_docker_container_context,
+                f"Invalid JSON in the {SCALEWAY_CONFIG_TAG} tag: {e}", [], tag_value
+            ) from e
+
+        return _process_context_config(config, f"{SCALEWAY_CONFIG_TAG} tag")
+
+    @staticmethod
+    def create_from_config(run_container_context):
+        return ScalewayServerlessJobContext().merge_config(
+            ScalewayServerlessJobContext.get_config_from_container_context(
+                run_container_context
             )
+        )
+
 
-        processed_context_value = cast(
-            Mapping[str, Any], processed_container_context.value
+def _process_context_config(
+    config: Mapping[str, Any], source: str
+) -> Mapping[str, Any]:
+    """Validates `config` against the schema, only returning the keys it sets.
+
+    Defaults of the schema are left out so that they don't override values set at a
+    higher level, e.g. the limits of the run launcher.
+    """
+    processed_config = process_config(SCALEWAY_SERVERLESS_JOB_CONTEXT_SCHEMA, config)
+
+    if not processed_config.success:
+        raise DagsterInvalidConfigError(
+            f"Errors while parsing {source}",
+            processed_config.errors,
+            config,
         )
 
-        return shared_container_context.merge(
+    processed_value = cast(Mapping[str, Any], processed_config.value)
+    return {key: value for key, value in processed_value.items() if key in config}
+
+
+@functools.lru_cache(maxsize=CONTEXT_CACHE_SIZE)
+def _create_for_config(
+    launcher_config: Optional[tuple],
+    run_container_context_json: Optional[str],
+    config_tags: tuple[Optional[str], ...] = (),
+) -> ScalewayServerlessJobContext:
+    context = ScalewayServerlessJobContext()
+
+    # First apply the instance / run_launcher-level context
+    if launcher_config:
+        docker_image, env_vars, region, memory_limit, cpu_limit = launcher_config
+        context = context.merge(
             ScalewayServerlessJobContext(
-                docker_image=processed_context_value.get("docker_image"),
-                env_vars=processed_context_value.get("env_vars", []),
-                region=processed_context_value.get("region", REGION_FR_PAR),
-                memory_limit=processed_context_value.get(
-                    "memory_limit", DEFAULT_MEMORY_LIMIT
-                ),
-                cpu_limit=processed_context_value.get("cpu_limit", DEFAULT_CPU_LIMIT),
+                docker_image=docker_image,
+                env_vars=list(env_vars),
+                region=region,
+                memory_limit=memory_limit,
+                cpu_limit=cpu_limit,
+            )
+        )
+
+    if run_container_context_json:
+        context = context.merge_config(
+            ScalewayServerlessJobContext.get_config_from_container_context(
+                json.loads(run_container_context_json)
             )
         )
+
+    # Then the dagster-scaleway/config tags, from the least to the most specific
+    for config_tag in config_tags:
+        context = context.merge_config(
+            ScalewayServerlessJobContext.get_config_from_tag(config_tag)
+        )
+
+    return context
@@ -1,6 +1,28 @@
-from typing import Any, Mapping, Optional
+import hashlib
+import json
+import re
+import sys
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from datetime import timedelta
+from typing import Any, Callable, Iterator, Mapping, NamedTuple, Optional, Sequence
 
 import dagster._check as check
+from dagster import (
+    Array,
+    DagsterRunStatus,
+    Field,
+    Map,
+    MetadataValue,
+    RunsFilter,
+    Shape,
+)
+from dagster._core.events import EngineEventData
+from dagster._core.instance.config import config_field_for_configurable_class
+from dagster._core.instance.ref import configurable_class_data
 from dagster._core.launcher.base import (
     CheckRunHealthResult,
     LaunchRunContext,
@@ -15,30 +37,417 @@ from dagster._core.utils import parse_env_var
 from dagster._grpc.types import ExecuteRunArgs, ResumeRunArgs
 from dagster._serdes import ConfigurableClass
 from dagster._serdes.config_class import ConfigurableClassData
-from typing_extensions import Self
+from dagster._utils.error import serializable_error_info_from_exc_info
+from typing_extensions import Self, TypeGuard
 
 
 import scaleway.jobs.v1alpha1 as scw
 import scaleway
 
+from .autosizing import AutosizingConfig, ResourceAutosizer
+from .bounded_executor import BoundedThreadPoolExecutor
+from .client_pool import ScalewayClientPool
+from .job_definition_cache import (
+    DEFAULT_JOB_DEFINITION_CACHE_SIZE,
+    DEFAULT_JOB_DEFINITION_CACHE_TTL,
+    JobDefinitionCache,
+    Scope,
+)
+from .job_definition_gc import (
+    DEFAULT_GC_MAX_AGE,
+    JOB_DEFINITION_DESCRIPTION_MARKER,
+    JobDefinitionGcReport,
+    collect_job_definitions,
+)
+from .job_run_cache import (
+    DEFAULT_JOB_RUN_CACHE_TTL,
+    QUEUED_JOB_RUN_STATES,
+    JobRunStateCache,
+    get_job_run_queue_duration,
+)
+from .metrics import LaunchMetrics, MetricsSink
+from .payload import (
+    compress_payload,
+    encode_compressed_payload,
+    encode_payload_url,
+)
+from .payload_store import PayloadStore
+from .placement import (
+    DEFAULT_SATURATION_COOLDOWN,
+    PLACEMENT_BALANCED,
+    RegionLoad,
+    RegionPlacer,
+    RegionWeight,
+)
+from .rate_limit import (
+    DEFAULT_API_MAX_RETRIES,
+    ConcurrencyGate,
+    RateLimiter,
+    RegionRateLimit,
+    is_quota_error,
+    no_quota_retries,
+    reset_throttle_stats,
+)
 from .serverless_job_context import (
+    SCALEWAY_CONFIG_TAG,
     ScalewayServerlessJobContext,
     SCALEWAY_SERVERLESS_JOB_CONTEXT_SCHEMA,
 )
+from .termination import (
+    TERMINATED_OUTCOMES,
+    TERMINATION_ALREADY_FINISHED,
+    TERMINATION_FAILED,
+    TERMINATION_NOT_FOUND,
+    TERMINATION_NOT_LAUNCHED,
+    TERMINATION_STOP_DEFERRED,
+    TERMINATION_STOPPED,
+    TERMINATION_STOPPED_QUEUED,
+    DeferredStops,
+    TerminationReport,
+)
+from .usage import AUTOSIZING_KEY_TAG, CPU_LIMIT_TAG, MEMORY_LIMIT_TAG, USAGE_OOM_TAG
 
 SERVERLESS_JOBS_RUN_ID = "scaleway/serverless-jobs/run-id"
 SERVERLESS_JOBS_DEFINITION_ID = "scaleway/serverless-jobs/definition-id"
+SERVERLESS_JOBS_REGION = "scaleway/serverless-jobs/region"
 
 COMMAND_WRAPPER = "dagster-scaleway"
+IN_PROCESS_FLAG = "--in-process"
+RECORD_USAGE_FLAG = "--record-usage"
+
+# Exit code of a job run whose container was killed with SIGKILL, usually by the OOM killer
+OOM_KILLED_EXIT_CODE = 137
 
 SERVERLESS_JOBS_STATES_TO_WORKER_STATUS = {
     scw.JobRunState.QUEUED: WorkerStatus.RUNNING,
+    scw.JobRunState.SCHEDULED: WorkerStatus.RUNNING,
     scw.JobRunState.RUNNING: WorkerStatus.RUNNING,
     scw.JobRunState.SUCCEEDED: WorkerStatus.SUCCESS,
     scw.JobRunState.FAILED: WorkerStatus.FAILED,
+    scw.JobRunState.INTERNAL_ERROR: WorkerStatus.FAILED,
+    scw.JobRunState.CANCELED: WorkerStatus.FAILED,
     scw.JobRunState.UNKNOWN_STATE: WorkerStatus.UNKNOWN,
 }
 
+JOB_DEFINITIONS_PAGE_SIZE = 100
+
+DEFAULT_LAUNCH_CONCURRENCY = 8
+DEFAULT_LAUNCH_QUEUE_DEPTH = 64
+
+DEFAULT_MAX_ADMISSION_WAIT = 600
+# How often the job run states are checked while waiting for a slot
+ADMISSION_POLL_INTERVAL = 5
+
+DEFAULT_INPUT_JSON_OFFLOAD_THRESHOLD = 16 * 1024
+
+# Number of execution plans whose single step config tag is kept
+STEP_CONFIG_TAG_CACHE_SIZE = 1024
+
+JOB_DEFINITION_FINGERPRINT_PREFIX = "spec:"
+JOB_DEFINITION_FINGERPRINT_RE = re.compile(
+    r"\[" + re.escape(JOB_DEFINITION_FINGERPRINT_PREFIX) + r"([0-9a-f]+)\]"
+)
+
+SCALEWAY_SERVERLESS_JOB_LAUNCHER_SCHEMA = {
+    **SCALEWAY_SERVERLESS_JOB_CONTEXT_SCHEMA,
+    "job_definition_cache_ttl": Field(
+        int,
+        is_required=False,
+        default_value=DEFAULT_JOB_DEFINITION_CACHE_TTL,
+        description="How long in seconds a job definition looked up by name is reused before being fetched again",
+    ),
+    "job_definition_cache_size": Field(
+        int,
+        is_required=False,
+        default_value=DEFAULT_JOB_DEFINITION_CACHE_SIZE,
+        description="The maximum number of job definitions kept in the launcher's name index",
+    ),
+    "job_run_cache_ttl": Field(
+        int,
+        is_required=False,
+        default_value=DEFAULT_JOB_RUN_CACHE_TTL,
+        description=(
+            "How long in seconds job run states are reused by run monitoring before all "
+            "in-flight job runs are refreshed in bulk"
+        ),
+    ),
+    "in_process_execution": Field(
+        bool,
+        is_required=False,
+        default_value=False,
+        description=(
+            "Run the Dagster run worker inside the dagster-scaleway wrapper's interpreter "
+            "instead of a subprocess, which saves a Python startup and a Dagster import per run"
+        ),
+    ),
+    "async_launch": Field(
+        bool,
+        is_required=False,
+        default_value=False,
+        description=(
+            "Submit runs to Scaleway from a background thread pool instead of blocking the "
+            "run queue while the Scaleway API is called"
+        ),
+    ),
+    "launch_concurrency": Field(
+        int,
+        is_required=False,
+        default_value=DEFAULT_LAUNCH_CONCURRENCY,
+        description="The number of runs submitted to Scaleway concurrently when async_launch is enabled",
+    ),
+    "launch_queue_depth": Field(
+        int,
+        is_required=False,
+        default_value=DEFAULT_LAUNCH_QUEUE_DEPTH,
+        description=(
+            "The number of runs waiting for a submission slot before launch_run blocks "
+            "when async_launch is enabled"
+        ),
+    ),
+    "rate_limits": Field(
+        Map(
+            str,
+            Shape(
+                {
+                    "requests_per_second": Field(
+                        float,
+                        is_required=False,
+                        description="Sustained rate of Scaleway API requests",
+                    ),
+                    "burst": Field(
+                        int,
+                        is_required=False,
+                        description="Number of requests allowed above the sustained rate",
+                    ),
+                    "max_concurrent_job_runs": Field(
+                        int,
+                        is_required=False,
+                        description=(
+                            "Number of job runs allowed to be queued or running at once, "
+                            "further starts wait for a slot"
+                        ),
+                    ),
+                }
+            ),
+            key_label_name="region",
+        ),
+        is_required=False,
+        description="Client-side limits applied to the Scaleway API, per region",
+    ),
+    "regions": Field(
+        Array(
+            Shape(
+                {
+                    "region": Field(str, description="A Scaleway region, e.g. nl-ams"),
+                    "weight": Field(
+                        float,
+                        is_required=False,
+                        default_value=1.0,
+                        description="Share of the runs placed in the region when balanced",
+                    ),
+                }
+            )
+        ),
+        is_required=False,
+        description=(
+            "Regions runs are placed in, in order of preference. Each run is launched in the "
+            "best region according to region_placement, and spills over to the next ones "
+            "when a quota is reached. Runs whose region is set by their code location or "
+            "tags to another region than the launcher's stay in it"
+        ),
+    ),
+    "region_placement": Field(
+        str,
+        is_required=False,
+        default_value=PLACEMENT_BALANCED,
+        description=(
+            "`balanced` places runs in the region with the fewest queued and launching job "
+            "runs per weight, penalizing slow launches, `ordered` in the first region with "
+            "a free job run slot"
+        ),
+    ),
+    "region_saturation_cooldown": Field(
+        int,
+        is_required=False,
+        default_value=DEFAULT_SATURATION_COOLDOWN,
+        description=(
+            "How long in seconds a region that reached a quota is ranked last by the "
+            "placement"
+        ),
+    ),
+    "api_max_retries": Field(
+        int,
+        is_required=False,
+        default_value=DEFAULT_API_MAX_RETRIES,
+        description=(
+            "How many times a Scaleway API call is retried with exponential backoff after "
+            "a 429, a quota error in the last region to spill over to or (for reads) a 5xx"
+        ),
+    ),
+    "max_admission_wait": Field(
+        int,
+        is_required=False,
+        default_value=DEFAULT_MAX_ADMISSION_WAIT,
+        description=(
+            "How long in seconds a run waits for a job run slot of its region before "
+            "being started anyway"
+        ),
+    ),
+    "compress_input_json": Field(
+        bool,
+        is_required=False,
+        default_value=False,
+        description=(
+            "Compress the serialized Dagster arguments passed to job runs in INPUT_JSON, "
+            "and offload them to the payload_store when still too large. Only enable it "
+            "once the images are rebuilt with a dagster-scaleway wrapper able to decode them"
+        ),
+    ),
+    "input_json_offload_threshold": Field(
+        int,
+        is_required=False,
+        default_value=DEFAULT_INPUT_JSON_OFFLOAD_THRESHOLD,
+        description=(
+            "Size in bytes of the compressed INPUT_JSON above which it is uploaded to the "
+            "payload_store and only its URL is passed to the job run"
+        ),
+    ),
+    "payload_store": config_field_for_configurable_class(),
+    "metrics_sink": config_field_for_configurable_class(),
+    "report_launch_metrics": Field(
+        bool,
+        is_required=False,
+        default_value=False,
+        description=(
+            "Report the time spent in each step of a launch (API calls, admission, tagging) "
+            "as metadata of an engine event on the launched run"
+        ),
+    ),
+    "skip_memoized_runs": Field(
+        bool,
+        is_required=False,
+        default_value=False,
+        description=(
+            "Mark runs whose assets all are up to date (same code version, no new upstream "
+            "data version) as succeeded instead of launching them"
+        ),
+    ),
+    "autosizing": Field(
+        Shape(
+            {
+                "percentile": Field(
+                    float,
+                    is_required=False,
+                    default_value=AutosizingConfig().percentile,
+                    description="Percentile of the past usage the limits are based on",
+                ),
+                "headroom": Field(
+                    float,
+                    is_required=False,
+                    default_value=AutosizingConfig().headroom,
+                    description="Factor applied to that percentile",
+                ),
+                "history_size": Field(
+                    int,
+                    is_required=False,
+                    default_value=AutosizingConfig().history_size,
+                    description="Number of past runs considered",
+                ),
+                "min_samples": Field(
+                    int,
+                    is_required=False,
+                    default_value=AutosizingConfig().min_samples,
+                    description="Number of past runs with a recorded usage needed to resize",
+                ),
+                "oom_memory_factor": Field(
+                    float,
+                    is_required=False,
+                    default_value=AutosizingConfig().oom_memory_factor,
+                    description="Factor applied to the memory limit after an out of memory failure",
+                ),
+                "max_memory_limit": Field(
+                    int,
+                    is_required=False,
+                    description="Upper bound in MiB of the recommended memory limit",
+                ),
+                "max_cpu_limit": Field(
+                    int,
+                    is_required=False,
+                    description="Upper bound in mCPU of the recommended CPU limit",
+                ),
+            }
+        ),
+        is_required=False,
+        description=(
+            "Size runs from the CPU and memory used by their past runs, as recorded by the "
+            "dagster-scaleway wrapper. Limits set with the dagster-scaleway/config run tag "
+            "are kept as is."
+        ),
+    ),
+}
+
+
+class JobDefinitionSpec(NamedTuple):
+    """Everything needed to create or update the job definition of a run."""
+
+    name: str
+    description: str
+    fingerprint: str
+    # Keyword arguments shared by create_job_definition and update_job_definition
+    fields: Mapping[str, Any]
+
+    def matches(
+        self, job_def: Optional[scw.JobDefinition]
+    ) -> TypeGuard[scw.JobDefinition]:
+        return (
+            job_def is not None
+            and get_job_definition_fingerprint_from_description(job_def.description)
+            == self.fingerprint
+        )
+
+
+def get_job_definition_fingerprint(job_def_spec: Mapping[str, Any]) -> str:
+    """Stable hash of everything that makes up a job definition, stored in its description."""
+    serialized = json.dumps(job_def_spec, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(serialized.encode("utf8")).hexdigest()[:16]
+
+
+def get_job_definition_fingerprint_from_description(description: str) -> Optional[str]:
+    match = JOB_DEFINITION_FINGERPRINT_RE.search(description or "")
+    return match.group(1) if match else None
+
+
+def _is_canceled(run: Optional[DagsterRun]) -> bool:
+    return run is not None and run.status in (
+        DagsterRunStatus.CANCELING,
+        DagsterRunStatus.CANCELED,
+    )
+
+
+def build_job_definition_spec(
+    name: str, target: str, fields: Mapping[str, Any]
+) -> JobDefinitionSpec:
+    """Spec of a job definition named after `name` and its fingerprint.
+
+    Job runs are started after the definition is ensured, outside of any lock, so runs
+    of the same op with different images or limits must never share a definition that
+    one of them could rewrite in between.
+    """
+    fingerprint = get_job_definition_fingerprint(fields)
+    description = (
+        f"JobDefinition for {target}."
+        + " "
+        + JOB_DEFINITION_DESCRIPTION_MARKER
+        + " "
+        + f"[{JOB_DEFINITION_FINGERPRINT_PREFIX}{fingerprint}]"
+    )
+    return JobDefinitionSpec(
+        name=f"{name}.{fingerprint}",
+        description=description,
+        fingerprint=fingerprint,
+        fields=fields,
+    )
+
 
 class ScalewayServerlessJobRunLauncher(RunLauncher, ConfigurableClass):
     """Launches runs as Scaleway Serverless Jobs."""
@@ -52,6 +461,26 @@ class ScalewayServerlessJobRunLauncher(RunLauncher, ConfigurableClass):
         region: Optional[str] = None,
         memory_limit: Optional[int] = None,
         cpu_limit: Optional[int] = None,
+        job_definition_cache_ttl: int = DEFAULT_JOB_DEFINITION_CACHE_TTL,
+        job_definition_cache_size: int = DEFAULT_JOB_DEFINITION_CACHE_SIZE,
+        job_run_cache_ttl: int = DEFAULT_JOB_RUN_CACHE_TTL,
+        in_process_execution: bool = False,
+        async_launch: bool = False,
+        launch_concurrency: int = DEFAULT_LAUNCH_CONCURRENCY,
+        launch_queue_depth: int = DEFAULT_LAUNCH_QUEUE_DEPTH,
+        rate_limits: Optional[Mapping[str, Mapping[str, Any]]] = None,
+        regions: Optional[Sequence[Mapping[str, Any]]] = None,
+        region_placement: str = PLACEMENT_BALANCED,
+        region_saturation_cooldown: int = DEFAULT_SATURATION_COOLDOWN,
+        api_max_retries: int = DEFAULT_API_MAX_RETRIES,
+        max_admission_wait: int = DEFAULT_MAX_ADMISSION_WAIT,
+        autosizing: Optional[Mapping[str, Any]] = None,
+        compress_input_json: bool = False,
+        input_json_offload_threshold: int = DEFAULT_INPUT_JSON_OFFLOAD_THRESHOLD,
+        payload_store: Optional[Mapping[str, Any]] = None,
+        metrics_sink: Optional[Mapping[str, Any]] = None,
+        report_launch_metrics: bool = False,
+        skip_memoized_runs: bool = False,
     ):
         self._inst_data = inst_data
         self.docker_image = docker_image
@@ -60,6 +489,80 @@ class ScalewayServerlessJobRunLauncher(RunLauncher, ConfigurableClass):
         self.memory_limit = memory_limit
         self.cpu_limit = cpu_limit
 
+        self._job_definition_cache = JobDefinitionCache(
+            ttl=job_definition_cache_ttl, max_size=job_definition_cache_size
+        )
+        self.metrics_sink = metrics_sink
+        self.report_launch_metrics = report_launch_metrics
+        self.skip_memoized_runs = skip_memoized_runs
+        self._metrics = LaunchMetrics(
+            configurable_class_data(metrics_sink).rehydrate(as_type=MetricsSink)
+            if metrics_sink
+            else None
+        )
+        self._job_run_cache = JobRunStateCache(
+            ttl=job_run_cache_ttl, on_dequeued=self._on_job_run_dequeued
+        )
+        self.rate_limits = {
+            region: RegionRateLimit(**limit)
+            for region, limit in (rate_limits or {}).items()
+        }
+        self.regions = regions
+        self.region_placement = region_placement
+        self.region_saturation_cooldown = region_saturation_cooldown
+        self._placer = (
+            RegionPlacer(
+                [RegionWeight(**region) for region in regions],
+                strategy=region_placement,
+                saturation_cooldown=region_saturation_cooldown,
+            )
+            if regions
+            else None
+        )
+        self.api_max_retries = check.int_param(api_max_retries, "api_max_retries")
+        self.max_admission_wait = check.int_param(
+            max_admission_wait, "max_admission_wait"
+        )
+        self._rate_limiters: dict[Optional[str], RateLimiter] = {}
+        self._concurrency_gates: dict[Scope, ConcurrencyGate] = {}
+        self._rate_limit_lock = threading.Lock()
+        self._client_pool = ScalewayClientPool(
+            get_rate_limiter=self._get_rate_limiter, metrics=self._metrics
+        )
+
+        self.autosizing = autosizing
+
+        self.compress_input_json = compress_input_json
+        self.input_json_offload_threshold = check.int_param(
+            input_json_offload_threshold, "input_json_offload_threshold"
+        )
+        self.payload_store = payload_store
+        self._payload_store = (
+            configurable_class_data(payload_store).rehydrate(as_type=PayloadStore)
+            if payload_store
+            else None
+        )
+        self._autosizer = (
+            ResourceAutosizer(AutosizingConfig(**autosizing))
+            if autosizing is not None
+            else None
+        )
+
+        self.in_process_execution = in_process_execution
+        self.async_launch = async_launch
+        self.launch_concurrency = check.int_param(
+            launch_concurrency, "launch_concurrency"
+        )
+        self.launch_queue_depth = check.int_param(
+            launch_queue_depth, "launch_queue_depth"
+        )
+        self._launch_executor: Optional[BoundedThreadPoolExecutor] = None
+        self._launch_executor_lock = threading.Lock()
+        self._deferred_stops = DeferredStops(self._stop_dequeued_job_runs)
+        # Config tag of the op of single step execution plans, by snapshot ID
+        self._step_config_tags: OrderedDict[str, Optional[str]] = OrderedDict()
+        self._step_config_tags_lock = threading.Lock()
+
         super().__init__()
 
     @property
@@ -68,7 +571,7 @@ class ScalewayServerlessJobRunLauncher(RunLauncher, ConfigurableClass):
 
     @classmethod
     def config_type(cls):
-        return SCALEWAY_SERVERLESS_JOB_CONTEXT_SCHEMA
+        return SCALEWAY_SERVERLESS_JOB_LAUNCHER_SCHEMA
 
     @classmethod
     def from_config_value(
@@ -81,16 +584,216 @@ class ScalewayServerlessJobRunLauncher(RunLauncher, ConfigurableClass):
     ) -> ScalewayServerlessJobContext:
         return ScalewayServerlessJobContext.create_for_run(dagster_run, self)
 
+    def get_single_step_config_tag(
+        self, execution_plan_snapshot_id: str
+    ) -> Optional[str]:
+        """The dagster-scaleway/config tag of the op of a single step run, if any.
+
+        Op tags are not propagated to the run, they are read from its execution plan.
+        Plans never change once stored, so lookups are cached unless the plan is not
+        stored yet.
+        """
+        with self._step_config_tags_lock:
+            if execution_plan_snapshot_id in self._step_config_tags:
+                self._step_config_tags.move_to_end(execution_plan_snapshot_id)
+                return self._step_config_tags[execution_plan_snapshot_id]
+
+        if not self.has_instance or not self._instance.has_snapshot(
+            execution_plan_snapshot_id
+        ):
+            return None
+        steps = self._instance.get_execution_plan_snapshot(
+            execution_plan_snapshot_id
+        ).steps
+        config_tag = (
+            (steps[0].tags or {}).get(SCALEWAY_CONFIG_TAG) if len(steps) == 1 else None
+        )
+
+        with self._step_config_tags_lock:
+            self._step_config_tags[execution_plan_snapshot_id] = config_tag
+            if len(self._step_config_tags) > STEP_CONFIG_TAG_CACHE_SIZE:
+                self._step_config_tags.popitem(last=False)
+        return config_tag
+
     def _get_client(
         self, serverless_job_context: ScalewayServerlessJobContext
     ) -> scaleway.Client:
         # TODO?: is support config file useful? We might want to be able to provide the Scaleway config
         # directly in the dagster config. In that case, we'll need to add the complete config in ScalewayServerlessJobContext
         # for now, we'll use environment variables
-        client = scaleway.Client.from_config_file_and_env()
-        if serverless_job_context.region:
-            client.default_region = serverless_job_context.region
-        return client
+        return self._get_api(serverless_job_context).client
+
+    def _get_api(
+        self, serverless_job_context: ScalewayServerlessJobContext
+    ) -> scw.JobsV1Alpha1API:
+        with self._metrics.span("get_client", serverless_job_context.region):
+            return self._client_pool.get_api(serverless_job_context.region)
+
+    def _get_rate_limit(self, region: Optional[str]) -> RegionRateLimit:
+        return self.rate_limits.get(region or "", RegionRateLimit())
+
+    def _get_rate_limiter(self, region: Optional[str]) -> RateLimiter:
+        # Shared by the APIs of a region so that the limit survives client rotation
+        with self._rate_limit_lock:
+            rate_limiter = self._rate_limiters.get(region)
+            if rate_limiter is None:
+                rate_limiter = self._rate_limiters[region] = RateLimiter(
+                    self._get_rate_limit(region), max_retries=self.api_max_retries
+                )
+            return rate_limiter
+
+    def _get_concurrency_gate(self, scope: Scope) -> Optional[ConcurrencyGate]:
+        limit = self._get_rate_limit(scope[0]).max_concurrent_job_runs
+        if not limit:
+            return None
+        with self._rate_limit_lock:
+            return self._concurrency_gates.setdefault(scope, ConcurrencyGate(limit))
+
+    @contextmanager
+    def _admit_job_run(
+        self, api: scw.JobsV1Alpha1API, run: DagsterRun
+    ) -> Iterator[None]:
+        """Holds a job run slot of the region while the job run is started.
+
+        Active job runs are counted from the state shared with the run monitoring.
+        """
+        scope = self._get_job_definition_scope(api.client)
+        gate = self._get_concurrency_gate(scope)
+        if gate is None:
+            yield
+            return
+
+        def on_wait(active: int):
+            self._instance.report_engine_event(
+                message=f"Waiting for a Scaleway job run slot in {scope[0] or 'the default region'} for Dagster run {run.run_id}: {active}/{gate.limit} active",
+                dagster_run=run,
+                cls=self.__class__,
+            )
+
+        started = time.perf_counter()
+        with gate.slot(
+            count_active=lambda: self._job_run_cache.count_active(api, scope),
+            poll_interval=ADMISSION_POLL_INTERVAL,
+            timeout=self.max_admission_wait,
+            on_wait=on_wait,
+        ) as admitted:
+            self._metrics.record_span(
+                "admission", scope[0], time.perf_counter() - started
+            )
+            if not admitted:
+                self._instance.report_engine_event(
+                    message=f"No Scaleway job run slot freed up after {self.max_admission_wait}s, starting Dagster run {run.run_id} anyway",
+                    dagster_run=run,
+                    cls=self.__class__,
+                )
+            yield
+
+    def _get_region_load(self, region: str) -> RegionLoad:
+        api = self._client_pool.get_api(region)
+        scope = self._get_job_definition_scope(api.client)
+        gate = self._get_concurrency_gate(scope)
+        return RegionLoad(
+            queued=self._job_run_cache.count_queued(api, scope),
+            has_free_slot=gate is None
+            or gate.has_free_slot(self._job_run_cache.count_active(api, scope)),
+        )
+
+    def _get_placement_regions(
+        self, serverless_job_context: ScalewayServerlessJobContext
+    ) -> list[Optional[str]]:
+        """Regions to launch a run in, from the best to the last resort."""
+        if self._placer is None or serverless_job_context.region != self.region:
+            return [serverless_job_context.region]
+        with self._metrics.span("placement", self.region):
+            return list(self._placer.rank(self._get_region_load))
+
+    @contextmanager
+    def _placed_in(self, region: Optional[str], acquired: bool = False):
+        """Accounts a launch in the region for the placement of the next ones."""
+        placer = self._placer
+        if placer is None or region is None:
+            yield
+            return
+
+        if not acquired:
+            placer.acquire(region)
+        started = time.perf_counter()
+        latency = None
+        saturated = False
+        try:
+            yield
+            latency = time.perf_counter() - started
+        except scaleway.ScalewayException as e:
+            saturated = is_quota_error(e.response)
+            raise
+        finally:
+            placer.release(region, latency=latency, saturated=saturated)
+
+    def _start_placed_job_run(
+        self,
+        run: DagsterRun,
+        docker_image: str,
+        command: list[str],
+        serverless_job_context: ScalewayServerlessJobContext,
+    ) -> tuple[scw.JobsV1Alpha1API, scw.JobDefinition, scw.JobRun]:
+        """Starts the job run in the best region, spilling over to the next ones when a
+        quota is reached.
+
+        Quota errors are only retried in the last region, the others are skipped at once.
+        """
+        regions = self._get_placement_regions(serverless_job_context)
+        for i, region in enumerate(regions):
+            region_context = serverless_job_context._replace(region=region)
+            api = self._get_api(region_context)
+            try:
+                with self._placed_in(region), no_quota_retries(i < len(regions) - 1):
+                    job_def, job_run = self._start_job_run(
+                        api,
+                        run,
+                        docker_image,
+                        command,
+                        serverless_job_context=region_context,
+                    )
+                return api, job_def, job_run
+            except scaleway.ScalewayException as e:
+                if not is_quota_error(e.response) or i == len(regions) - 1:
+                    raise
+                self._instance.report_engine_event(
+                    message=f"Scaleway quota reached in {region}, spilling Dagster run {run.run_id} over to {regions[i + 1]}",
+                    dagster_run=run,
+                    cls=self.__class__,
+                )
+        check.failed("No region to launch the run in")
+
+    def _report_throttling(self, run: DagsterRun):
+        stats = reset_throttle_stats()
+        if stats.throttled:
+            self._instance.report_engine_event(
+                message=f"Scaleway API throttled while launching Dagster run {run.run_id}: {stats}",
+                dagster_run=run,
+                cls=self.__class__,
+            )
+
+    def _report_launch_metrics(self, run: DagsterRun):
+        spans = self._metrics.collect_spans()
+        if not self.report_launch_metrics or not spans:
+            return
+        self._instance.report_engine_event(
+            message=f"Launch timings of Dagster run {run.run_id}",
+            dagster_run=run,
+            engine_event_data=EngineEventData(
+                metadata={
+                    f"{name} (s)": MetadataValue.float(round(duration, 4))
+                    for name, duration in spans.items()
+                }
+            ),
+            cls=self.__class__,
+        )
+
+    def _on_job_run_dequeued(self, scope: Scope, job_run: scw.JobRun):
+        queued = get_job_run_queue_duration(job_run)
+        if queued is not None:
+            self._metrics.job_run_dequeued(scope[0], queued)
 
     def _get_docker_image(self, job_code_origin: JobPythonOrigin) -> str:
         docker_image = job_code_origin.repository_origin.container_image
@@ -115,104 +818,529 @@ class ScalewayServerlessJobRunLauncher(RunLauncher, ConfigurableClass):
             return list(dagster_run.asset_selection)[-1].to_user_string()
         return dagster_run.run_id
 
-    def _create_or_update_job_definition(
+    def _get_autosizing_key(self, dagster_run: DagsterRun) -> str:
+        # Runs of a whole job get a definition per run, their history is kept per job
+        name = self._get_semantic_job_name(dagster_run)
+        return dagster_run.job_name if name == dagster_run.run_id else name
+
+    def _autosize(
         self,
-        client: scaleway.Client,
         run: DagsterRun,
-        docker_image: str,
-        command: list[str],
-    ) -> scw.JobDefinition:
-        serverless_job_context = self.get_serverless_job_context(run)
-        api = scw.JobsV1Alpha1API(client)
+        serverless_job_context: ScalewayServerlessJobContext,
+    ) -> ScalewayServerlessJobContext:
+        autosizer = check.not_none(self._autosizer)
+        recommendation = autosizer.recommend(
+            self._instance, self._get_autosizing_key(run)
+        )
+        if recommendation is None:
+            return serverless_job_context
 
+        explicit_config = ScalewayServerlessJobContext.get_config_from_tag(
+            run.tags.get(SCALEWAY_CONFIG_TAG)
+        )
+        limits = {
+            key: value
+            for key, value in (
+                ("memory_limit", recommendation.memory_limit),
+                ("cpu_limit", recommendation.cpu_limit),
+            )
+            if value is not None and key not in explicit_config
+        }
+        resized = serverless_job_context._replace(**limits)
+        if resized != serverless_job_context:
+            reason = (
+                "after an out of memory failure"
+                if recommendation.after_oom
+                else f"from {recommendation.samples} past runs"
+            )
+            self._instance.report_engine_event(
+                message=f"Autosized Dagster run {run.run_id} to {resized.cpu_limit} mCPU and {resized.memory_limit} MiB {reason}",
+                dagster_run=run,
+                cls=self.__class__,
+            )
+        return resized
+
+    def _get_job_definition_scope(self, client: scaleway.Client) -> Scope:
+        return (client.default_region or "", client.default_project_id or "")
+
+    def _find_job_definition(
+        self, api: scw.JobsV1Alpha1API, scope: Scope, name: str
+    ) -> Optional[scw.JobDefinition]:
+        """Looks up a job definition by name, only listing the project on cache misses.
+
+        The v1alpha1 API cannot filter definitions by name, so misses page through the
+        definitions newest first, indexing every page and stopping at the first match.
+        """
+        hit, job_def = self._job_definition_cache.lookup(scope, name)
+        if hit:
+            return job_def
+
+        with self._job_definition_cache.listing(scope):
+            # Indexed by the listing this thread waited for
+            hit, job_def = self._job_definition_cache.lookup(scope, name)
+            if hit:
+                return job_def
+
+            with self._metrics.span("list_job_definitions", scope[0]):
+                return self._list_job_definitions_until(api, scope, name)
+
+    def _list_job_definitions_until(
+        self, api: scw.JobsV1Alpha1API, scope: Scope, name: str
+    ) -> Optional[scw.JobDefinition]:
+        generation = self._job_definition_cache.generation(scope)
+        region, project_id = scope
+        found = None
+        seen = set()
+        page = 1
+        while True:
+            res = api.list_job_definitions(
+                region=region or None,
+                project_id=project_id or None,
+                page=page,
+                page_size=JOB_DEFINITIONS_PAGE_SIZE,
+                order_by=scw.ListJobDefinitionsRequestOrderBy.CREATED_AT_DESC,
+            )
+            for job_def in res.job_definitions:
+                # Keep the newest definition when names are duplicated
+                if job_def.name in seen:
+                    continue
+                seen.add(job_def.name)
+                self._job_definition_cache.put(scope, job_def)
+                if job_def.name == name:
+                    found = job_def
+
+            if found:
+                return found
+
+            if (
+                len(res.job_definitions) < JOB_DEFINITIONS_PAGE_SIZE
+                or page * JOB_DEFINITIONS_PAGE_SIZE >= res.total_count
+            ):
+                break
+            page += 1
+
+        self._job_definition_cache.mark_complete(scope, generation, seen)
+        return None
+
+    def _get_job_definition_env(
+        self,
+        run: DagsterRun,
+        serverless_job_context: ScalewayServerlessJobContext,
+    ) -> dict[str, str]:
         job_def_env = dict(
             [parse_env_var(env_var) for env_var in serverless_job_context.env_vars]
         )
         job_def_env["DAGSTER_RUN_JOB_NAME"] = run.job_name
-        job_def_env["DAGSTER_RUN_ID"] = run.run_id
-        job_def_env["INPUT_JSON"] = command[-1]
+        return job_def_env
 
-        api = scw.JobsV1Alpha1API(client)
+    def _encode_input_json(self, run: DagsterRun, input_json: str) -> str:
+        """Compresses the payload, offloading it to the payload store when still too large."""
+        if not self.compress_input_json:
+            return input_json
 
-        wrapped_command = [COMMAND_WRAPPER] + command[:-1]
-        description = (
-            f"JobDefinition for {run.job_name}."
-            + " "
-            + "Created by the ServerlessJobRunLauncher from dagster-scaleway."
-        )
-        job_def_name = self._get_semantic_job_name(run)
+        compressed = compress_payload(input_json)
+        if self._payload_store and len(compressed) > self.input_json_offload_threshold:
+            key = f"{run.run_id}/{hashlib.sha256(compressed).hexdigest()[:16]}"
+            return encode_payload_url(self._payload_store.put(key, compressed))
 
-        for job_def in api.list_job_definitions_all():
-            if job_def.name != job_def_name:
-                continue
+        encoded = encode_compressed_payload(compressed)
+        # Small payloads can grow with the base64 encoding
+        return encoded if len(encoded) < len(input_json) else input_json
 
-            job_def = api.update_job_definition(
-                job_definition_id=job_def.id,
-                name=job_def_name,
-                image_uri=docker_image,
-                environment_variables=job_def_env,
-                command=" ".join(wrapped_command),
-                memory_limit=serverless_job_context.memory_limit,
-                cpu_limit=serverless_job_context.cpu_limit,
-                description=description,
-            )
+    def _get_job_run_env(self, run: DagsterRun, command: list[str]) -> dict[str, str]:
+        # Values that change with every run are passed when starting the job definition
+        # so that the definition itself can be shared between runs
+        return {
+            "DAGSTER_RUN_ID": run.run_id,
+            "INPUT_JSON": self._encode_input_json(run, command[-1]),
+        }
+
+    def _get_job_definition_spec(
+        self,
+        run: DagsterRun,
+        docker_image: str,
+        command: list[str],
+        serverless_job_context: Optional[ScalewayServerlessJobContext] = None,
+        step_key: Optional[str] = None,
+    ) -> JobDefinitionSpec:
+        """Builds the definition of a run, or of a single step when `step_key` is set."""
+        if serverless_job_context is None:
+            serverless_job_context = self.get_serverless_job_context(run)
+
+        job_def_env = self._get_job_definition_env(run, serverless_job_context)
+        name = self._get_semantic_job_name(run)
+        target = run.job_name
+        if step_key:
+            job_def_env["DAGSTER_RUN_STEP_KEY"] = step_key
+            # One definition per step so that differently sized steps don't overwrite each other
+            name = f"{run.job_name}.{step_key}"
+            target = f"step {step_key} of {run.job_name}"
+
+        # Steps are sized by the step executor, only whole runs are autosized
+        autosize = self._autosizer is not None and not step_key
+        if autosize:
+            serverless_job_context = self._autosize(run, serverless_job_context)
+
+        wrapped_command = [COMMAND_WRAPPER] + command[:-1]
+        if self.in_process_execution:
+            wrapped_command.insert(1, IN_PROCESS_FLAG)
+        if autosize:
+            wrapped_command.insert(1, RECORD_USAGE_FLAG)
+        job_def_spec = {
+            "image_uri": docker_image,
+            "environment_variables": job_def_env,
+            "command": " ".join(wrapped_command),
+            "memory_limit": serverless_job_context.memory_limit,
+            "cpu_limit": serverless_job_context.cpu_limit,
+        }
+        return build_job_definition_spec(name, target, job_def_spec)
 
+    def _report_to_runs(self, runs: Sequence[DagsterRun], message: str):
+        for run in runs:
             self._instance.report_engine_event(
-                message=f"Updated job {job_def.id} for Dagster run {run.run_id}",
+                message=f"{message} for Dagster run {run.run_id}",
                 dagster_run=run,
                 cls=self.__class__,
             )
 
-            return job_def
+    def _ensure_job_definition(
+        self,
+        api: scw.JobsV1Alpha1API,
+        spec: JobDefinitionSpec,
+        runs: Sequence[DagsterRun],
+    ) -> scw.JobDefinition:
+        """Returns a job definition matching the spec, only writing to the API if needed."""
+        client = api.client
+        scope = self._get_job_definition_scope(client)
+
+        job_def = self._find_job_definition(api, scope, spec.name)
+        if not spec.matches(job_def):
+            with self._job_definition_cache.writing(scope, spec.name):
+                # Written by the launch this thread waited for
+                job_def = self._find_job_definition(api, scope, spec.name)
+                if not spec.matches(job_def):
+                    return self._write_job_definition(api, scope, spec, job_def, runs)
+
+        self._report_to_runs(runs, f"Reusing job {job_def.id}")
+        return job_def
+
+    def _write_job_definition(
+        self,
+        api: scw.JobsV1Alpha1API,
+        scope: Scope,
+        spec: JobDefinitionSpec,
+        job_def: Optional[scw.JobDefinition],
+        runs: Sequence[DagsterRun],
+    ) -> scw.JobDefinition:
+        """Updates `job_def` if it was changed outside of the launcher, or creates the
+        definition if there is none."""
+        client = api.client
+        if job_def:
+            try:
+                with self._metrics.span("update_job_definition", scope[0]):
+                    job_def = api.update_job_definition(
+                        job_definition_id=job_def.id,
+                        name=spec.name,
+                        description=spec.description,
+                        **spec.fields,
+                    )
+            except scaleway.ScalewayException as e:
+                # The definition was deleted since it was indexed, create it again
+                if e.status_code != 404:
+                    raise
+                self._job_definition_cache.invalidate(scope, spec.name)
+            else:
+                self._job_definition_cache.put(scope, job_def)
+                self._report_to_runs(runs, f"Updated job {job_def.id}")
+                return job_def
+
+        with self._metrics.span("create_job_definition", scope[0]):
+            job_def = api.create_job_definition(
+                name=spec.name,
+                description=spec.description,
+                project_id=client.default_project_id,
+                **spec.fields,
+            )
+        self._job_definition_cache.put(scope, job_def)
+        self._report_to_runs(runs, f"Created job {job_def.id}")
+
+        return job_def
 
-        job_def = api.create_job_definition(
-            name=job_def_name,
-            image_uri=docker_image,
-            environment_variables=job_def_env,
-            command=" ".join(wrapped_command),
-            memory_limit=serverless_job_context.memory_limit,
-            cpu_limit=serverless_job_context.cpu_limit,
-            description=description,
-            project_id=client.default_project_id,
+    def _create_or_update_job_definition(
+        self,
+        api: scw.JobsV1Alpha1API,
+        run: DagsterRun,
+        docker_image: str,
+        command: list[str],
+        serverless_job_context: Optional[ScalewayServerlessJobContext] = None,
+        step_key: Optional[str] = None,
+    ) -> scw.JobDefinition:
+        return self._ensure_job_definition(
+            api,
+            self._get_job_definition_spec(
+                run,
+                docker_image,
+                command,
+                serverless_job_context=serverless_job_context,
+                step_key=step_key,
+            ),
+            [run],
         )
 
+    def _start_job_definition(
+        self,
+        api: scw.JobsV1Alpha1API,
+        job_def: scw.JobDefinition,
+        run: DagsterRun,
+        command: list[str],
+    ) -> scw.JobRun:
+        region = api.client.default_region
+        with self._metrics.span("encode_input_json", region):
+            job_run_env = self._get_job_run_env(run, command)
+        with self._metrics.span("start_job_definition", region):
+            res = api.start_job_definition(
+                job_definition_id=job_def.id,
+                environment_variables={
+                    **job_def.environment_variables,
+                    **job_run_env,
+                },
+            )
+        return res.job_runs[0]
+
+    def _record_job_run(
+        self,
+        api: scw.JobsV1Alpha1API,
+        run: DagsterRun,
+        job_def: scw.JobDefinition,
+        job_run: scw.JobRun,
+        docker_image: str,
+    ):
         self._instance.report_engine_event(
-            message=f"Created job {job_def.id} for Dagster run {run.run_id}",
+            message=f"Started job definition {job_def.name} with run id {job_run.id} for Dagster run {run.run_id}",
             dagster_run=run,
             cls=self.__class__,
         )
 
-        return job_def
+        region = api.client.default_region
+        with self._metrics.span("add_run_tags", region):
+            self._instance.add_run_tags(
+                run.run_id,
+                {
+                    SERVERLESS_JOBS_RUN_ID: job_run.id,
+                    SERVERLESS_JOBS_DEFINITION_ID: job_def.id,
+                    **({SERVERLESS_JOBS_REGION: region} if region else {}),
+                    DOCKER_IMAGE_TAG: docker_image,
+                    MEMORY_LIMIT_TAG: str(job_def.memory_limit),
+                    CPU_LIMIT_TAG: str(job_def.cpu_limit),
+                    **(
+                        {AUTOSIZING_KEY_TAG: self._get_autosizing_key(run)}
+                        if self._autosizer
+                        else {}
+                    ),
+                },
+            )
+
+    def _start_job_run(
+        self,
+        api: scw.JobsV1Alpha1API,
+        run: DagsterRun,
+        docker_image: str,
+        command: list[str],
+        serverless_job_context: Optional[ScalewayServerlessJobContext] = None,
+        step_key: Optional[str] = None,
+    ) -> tuple[scw.JobDefinition, scw.JobRun]:
+        """Ensures the job definition then starts it once a job run slot is available."""
+        return self._ensure_and_start(
+            api,
+            run,
+            ensure=lambda: self._create_or_update_job_definition(
+                api,
+                run,
+                docker_image,
+                command,
+                serverless_job_context=serverless_job_context,
+                step_key=step_key,
+            ),
+            start=lambda job_def: self._start_job_definition(
+                api, job_def, run, command
+            ),
+        )
+
+    def _start_external_job(
+        self,
+        api: scw.JobsV1Alpha1API,
+        run: DagsterRun,
+        spec: JobDefinitionSpec,
+        environment_variables: Mapping[str, str],
+    ) -> tuple[scw.JobDefinition, scw.JobRun]:
+        """Starts a job that is not a Dagster run or step, e.g. a Pipes workload, on
+        behalf of `run`. It shares the job definitions, rate limits and job run slots of
+        the launcher.
+        """
+
+        def start(job_def: scw.JobDefinition) -> scw.JobRun:
+            with self._metrics.span("start_job_definition", api.client.default_region):
+                res = api.start_job_definition(
+                    job_definition_id=job_def.id,
+                    environment_variables={
+                        **job_def.environment_variables,
+                        **environment_variables,
+                    },
+                )
+            return res.job_runs[0]
+
+        return self._ensure_and_start(
+            api,
+            run,
+            ensure=lambda: self._ensure_job_definition(api, spec, [run]),
+            start=start,
+        )
+
+    def _ensure_and_start(
+        self,
+        api: scw.JobsV1Alpha1API,
+        run: DagsterRun,
+        ensure: Callable[[], scw.JobDefinition],
+        start: Callable[[scw.JobDefinition], scw.JobRun],
+    ) -> tuple[scw.JobDefinition, scw.JobRun]:
+        job_def = ensure()
+        scope = self._get_job_definition_scope(api.client)
+
+        with self._admit_job_run(api, run):
+            try:
+                job_run = start(job_def)
+            except scaleway.ScalewayException as e:
+                if e.status_code != 404:
+                    raise
+                # The indexed definition no longer exists, create it again and retry once
+                self._job_definition_cache.invalidate(scope, job_def.name)
+                job_def = ensure()
+                job_run = start(job_def)
+
+            # Tracked before the slot is released so that it is counted as active
+            self._job_run_cache.track(scope, job_run)
+
+        return job_def, job_run
 
     def _launch_serverless_job_with_command(
-        self, run: DagsterRun, docker_image: str, command: list[str]
+        self,
+        run: DagsterRun,
+        docker_image: str,
+        command: list[str],
+        stop_if_canceled: bool = False,
+    ):
+        reset_throttle_stats()
+        self._metrics.start_spans()
+        try:
+            self._launch_placed_job_run(run, docker_image, command, stop_if_canceled)
+        finally:
+            self._report_throttling(run)
+            self._report_launch_metrics(run)
+
+    def _launch_placed_job_run(
+        self,
+        run: DagsterRun,
+        docker_image: str,
+        command: list[str],
+        stop_if_canceled: bool = False,
     ):
         serverless_job_context = self.get_serverless_job_context(run)
-        client = self._get_client(serverless_job_context)
-        api = scw.JobsV1Alpha1API(client)
+        with self._metrics.span("launch", serverless_job_context.region):
+            api, job_def, job_run = self._start_placed_job_run(
+                run, docker_image, command, serverless_job_context
+            )
+            if stop_if_canceled:
+                self._stop_if_canceled(api, run, job_run)
+            self._record_job_run(api, run, job_def, job_run, docker_image)
+
+    def _stop_if_canceled(
+        self, api: scw.JobsV1Alpha1API, run: DagsterRun, job_run: scw.JobRun
+    ):
+        """Stops the job run just started if the run was canceled meanwhile.
+
+        The termination found no job run to stop since its tags are not written yet.
+        """
+        current_run = self._instance.get_run_by_id(run.run_id)
+        if not _is_canceled(current_run):
+            return
 
-        job_def = self._create_or_update_job_definition(
-            client, run, docker_image, command
+        scope = self._get_job_definition_scope(api.client)
+        outcome = self._stop_job_run(api, scope, job_run)
+        self._report_canceled_launch(
+            current_run,
+            f"Dagster run {run.run_id} was canceled while being submitted to Scaleway, job run {job_run.id}: {outcome}",
         )
 
-        job_run = api.start_job_definition(job_definition_id=job_def.id)
+    def _get_launch_executor(self) -> BoundedThreadPoolExecutor:
+        with self._launch_executor_lock:
+            if self._launch_executor is None:
+                self._launch_executor = BoundedThreadPoolExecutor(
+                    max_workers=self.launch_concurrency,
+                    max_queue_depth=self.launch_queue_depth,
+                    thread_name_prefix="dagster-scaleway-launch",
+                )
+            return self._launch_executor
+
+    def _submit_serverless_job_with_command(
+        self, run: DagsterRun, docker_image: str, command: list[str]
+    ):
+        if not self.async_launch:
+            self._launch_serverless_job_with_command(run, docker_image, command)
+            return
+
+        executor = self._get_launch_executor()
+        executor.submit(
+            self._launch_serverless_job_in_background, run, docker_image, command
+        )
 
         self._instance.report_engine_event(
-            message=f"Started job definition {job_def.name} with run id {job_run.id} for Dagster run {run.run_id}",
+            message=f"Queued submission of Dagster run {run.run_id} to Scaleway ({executor.pending} submissions in flight)",
             dagster_run=run,
             cls=self.__class__,
         )
 
-        self._instance.add_run_tags(
-            run.run_id,
-            {
-                SERVERLESS_JOBS_RUN_ID: job_run.id,
-                SERVERLESS_JOBS_DEFINITION_ID: job_def.id,
-                DOCKER_IMAGE_TAG: docker_image,
-            },
+    def _launch_serverless_job_in_background(
+        self, run: DagsterRun, docker_image: str, command: list[str]
+    ):
+        current_run = self._instance.get_run_by_id(run.run_id)
+        if _is_canceled(current_run):
+            self._report_canceled_launch(
+                current_run,
+                f"Dagster run {run.run_id} was canceled before being submitted to Scaleway",
+            )
+            return
+
+        try:
+            # Terminations racing with the start find no job run to stop
+            self._launch_serverless_job_with_command(
+                run, docker_image, command, stop_if_canceled=True
+            )
+        except Exception:
+            self._report_launch_failure(run)
+
+    def _report_canceled_launch(self, run: DagsterRun, message: str):
+        if run.status == DagsterRunStatus.CANCELING:
+            # No run worker will ever report the cancellation
+            self._instance.report_run_canceled(run, message=message)
+        else:
+            self._instance.report_engine_event(
+                message=message, dagster_run=run, cls=self.__class__
+            )
+
+    def _report_launch_failure(self, run: DagsterRun):
+        """Marks the run as failed, to be called while handling the launch exception."""
+        error = serializable_error_info_from_exc_info(sys.exc_info())
+        self._instance.report_engine_event(
+            message=f"Failed to submit Dagster run {run.run_id} to Scaleway",
+            dagster_run=run,
+            engine_event_data=EngineEventData.engine_error(error),
+            cls=self.__class__,
         )
+        self._instance.report_run_failed(run)
 
-    def launch_run(self, context: LaunchRunContext) -> None:
+    def _get_execute_run_command(
+        self, context: LaunchRunContext
+    ) -> tuple[DagsterRun, str, list[str]]:
         run = context.dagster_run
         job_code_origin = check.not_none(context.job_code_origin)
         docker_image = self._get_docker_image(job_code_origin)
@@ -223,7 +1351,152 @@ class ScalewayServerlessJobRunLauncher(RunLauncher, ConfigurableClass):
             instance_ref=self._instance.get_ref(),
         ).get_command_args()
 
-        self._launch_serverless_job_with_command(run, docker_image, command)
+        return run, docker_image, command
+
+    def _skip_memoized_run(self, context: LaunchRunContext) -> bool:
+        """Marks the run as succeeded without launching it if its assets are up to date."""
+        if not self.skip_memoized_runs:
+            return False
+
+        # The asset graph and staleness modules take a while to import
+        from .memoization import get_launch_reason, report_memoized_run
+
+        run = context.dagster_run
+        with self._metrics.span("memoization_check", self.region):
+            try:
+                reason = get_launch_reason(self._instance, context.workspace, run)
+            except Exception:
+                # The check must never prevent a run from being launched
+                self._instance.report_engine_event(
+                    message=f"Failed to check whether the assets of Dagster run {run.run_id} are up to date, launching it",
+                    dagster_run=run,
+                    engine_event_data=EngineEventData.engine_error(
+                        serializable_error_info_from_exc_info(sys.exc_info())
+                    ),
+                    cls=self.__class__,
+                )
+                return False
+
+        if reason is not None:
+            self._instance.report_engine_event(
+                message=f"Launching Dagster run {run.run_id} as {reason}",
+                dagster_run=run,
+                cls=self.__class__,
+            )
+            return False
+
+        self._instance.report_engine_event(
+            message=f"All the assets of Dagster run {run.run_id} are up to date, skipped launching a Scaleway job",
+            dagster_run=run,
+            cls=self.__class__,
+        )
+        report_memoized_run(self._instance, run)
+        return True
+
+    def launch_run(self, context: LaunchRunContext) -> None:
+        if self._skip_memoized_run(context):
+            return
+        run, docker_image, command = self._get_execute_run_command(context)
+        self._submit_serverless_job_with_command(run, docker_image, command)
+
+    def launch_runs(self, contexts: Sequence[LaunchRunContext]) -> None:
+        """Launches many runs at once, e.g. the runs of a backfill or a burst of sensor runs.
+
+        Runs are grouped by the job definition they resolve to, each definition is
+        ensured once per group, then all job runs are started concurrently. Runs that
+        fail to start are marked as failed, the others are tagged like `launch_run` does.
+        """
+        groups: dict[tuple, list[tuple[DagsterRun, str, list[str]]]] = {}
+        specs: dict[tuple, tuple[scw.JobsV1Alpha1API, JobDefinitionSpec]] = {}
+        for context in contexts:
+            run = context.dagster_run
+            acquired: Optional[str] = None
+            grouped = False
+            try:
+                if self._skip_memoized_run(context):
+                    continue
+                run, docker_image, command = self._get_execute_run_command(context)
+                serverless_job_context = self.get_serverless_job_context(run)
+                # Placed one by one, launches of the batch are accounted until started
+                region = self._get_placement_regions(serverless_job_context)[0]
+                api = self._get_api(serverless_job_context._replace(region=region))
+                if self._placer is not None and api.client.default_region:
+                    acquired = api.client.default_region
+                    self._placer.acquire(acquired)
+                spec = self._get_job_definition_spec(run, docker_image, command)
+                # Names end with the fingerprint, groups never write the same definition
+                key = (self._get_job_definition_scope(api.client), spec.name)
+                groups.setdefault(key, []).append((run, docker_image, command))
+                specs[key] = (api, spec)
+                grouped = True
+            except Exception:
+                # Only this run fails, the rest of the batch is still launched
+                self._report_launch_failure(run)
+            finally:
+                # Released once started otherwise
+                if acquired and not grouped:
+                    check.not_none(self._placer).release(acquired)
+
+        to_start = []
+        for key, launches in groups.items():
+            api, spec = specs[key]
+            runs = [run for run, _, _ in launches]
+            try:
+                job_def = self._ensure_job_definition(api, spec, runs)
+            except Exception:
+                for run in runs:
+                    if self._placer is not None and api.client.default_region:
+                        self._placer.release(api.client.default_region)
+                    self._report_launch_failure(run)
+                continue
+            to_start.extend(
+                (api, job_def, run, docker_image, command)
+                for run, docker_image, command in launches
+            )
+
+        def start(api, job_def, run, docker_image, command):
+            reset_throttle_stats()
+            self._metrics.start_spans()
+            try:
+                try:
+                    # Spilled over by the single-run path when other regions remain
+                    with self._placed_in(
+                        api.client.default_region, acquired=True
+                    ), no_quota_retries(len(self.regions or []) > 1):
+                        with self._admit_job_run(api, run):
+                            job_run = self._start_job_definition(
+                                api, job_def, run, command
+                            )
+                            self._job_run_cache.track(
+                                self._get_job_definition_scope(api.client), job_run
+                            )
+                            return job_run
+                except scaleway.ScalewayException as e:
+                    if e.status_code != 404 and not is_quota_error(e.response):
+                        raise
+                # Let the single-run path recreate the definition or spill over, its
+                # throttling and timings are reported with the batch attempt's
+                self._launch_placed_job_run(run, docker_image, command)
+                return None
+            finally:
+                self._report_throttling(run)
+                self._report_launch_metrics(run)
+
+        with ThreadPoolExecutor(
+            max_workers=self.launch_concurrency,
+            thread_name_prefix="dagster-scaleway-launch-batch",
+        ) as executor:
+            futures = [executor.submit(start, *launch) for launch in to_start]
+
+        # Tags are written once all the job runs are started to keep the fan-out tight
+        for (api, job_def, run, docker_image, _), future in zip(to_start, futures):
+            try:
+                job_run = future.result()
+            except Exception:
+                self._report_launch_failure(run)
+                continue
+            if job_run is not None:
+                self._record_job_run(api, run, job_def, job_run, docker_image)
 
     @property
     def supports_resume_run(self):
@@ -241,9 +1514,54 @@ class ScalewayServerlessJobRunLauncher(RunLauncher, ConfigurableClass):
             instance_ref=self._instance.get_ref(),
         ).get_command_args()
 
-        self._launch_serverless_job_with_command(run, docker_image, command)
+        self._submit_serverless_job_with_command(run, docker_image, command)
+
+    def dispose(self) -> None:
+        with self._launch_executor_lock:
+            if self._launch_executor is not None:
+                self._launch_executor.shutdown(wait=True)
+                self._launch_executor = None
 
-    def _get_scaleway_job_run_from_dagster_run(self, run) -> Optional[scw.JobRun]:
+        self._deferred_stops.close()
+        self._client_pool.close()
+
+    def collect_job_definitions(
+        self,
+        max_age: timedelta = DEFAULT_GC_MAX_AGE,
+        dry_run: bool = False,
+        region: Optional[str] = None,
+    ) -> JobDefinitionGcReport:
+        """Deletes the job definitions created by this launcher that had no recent job run.
+
+        Runs without an op or asset selection get a job definition per run, which this
+        cleans up. Defaults to the launcher's region.
+        """
+        api = self._client_pool.get_api(region or self.region)
+        scope = self._get_job_definition_scope(api.client)
+        report = collect_job_definitions(
+            api,
+            region=scope[0] or None,
+            project_id=scope[1] or None,
+            max_age=max_age,
+            dry_run=dry_run,
+            concurrency=self.launch_concurrency,
+        )
+        if not dry_run:
+            for job_def in report.deleted:
+                self._job_definition_cache.invalidate(scope, job_def.name)
+        return report
+
+    def _get_api_for_run(self, run: DagsterRun) -> scw.JobsV1Alpha1API:
+        """API of the region the run was launched in."""
+        serverless_job_context = self.get_serverless_job_context(run)
+        region = run.tags.get(SERVERLESS_JOBS_REGION)
+        if region:
+            serverless_job_context = serverless_job_context._replace(region=region)
+        return self._get_api(serverless_job_context)
+
+    def _get_scaleway_job_run_from_dagster_run(
+        self, run, refresh: bool = False
+    ) -> Optional[scw.JobRun]:
         if not run or run.is_finished:
             return None
 
@@ -252,53 +1570,214 @@ class ScalewayServerlessJobRunLauncher(RunLauncher, ConfigurableClass):
         if not job_run_id:
             return None
 
-        serverless_job_context = self.get_serverless_job_context(run)
-        client = self._get_client(serverless_job_context)
-        api = scw.JobsV1Alpha1API(client)
+        api = self._get_api_for_run(run)
+        client = api.client
 
         try:
-            return api.get_job_run(job_run_id=job_run_id)
+            return self._job_run_cache.get(
+                api,
+                self._get_job_definition_scope(client),
+                job_run_id,
+                refresh=refresh,
+            )
         except scaleway.ScalewayException:
             return None
 
-    def terminate(self, run_id):
-        run = self._instance.get_run_by_id(run_id)
+    def _report_termination(self, run: DagsterRun, message: str):
+        self._instance.report_engine_event(
+            message=message, dagster_run=run, cls=self.__class__
+        )
 
-        if not run:
-            return False
+    def _get_job_runs_to_terminate(
+        self, api: scw.JobsV1Alpha1API, scope: Scope, job_run_ids: list[str]
+    ) -> dict[str, scw.JobRun]:
+        if len(job_run_ids) == 1:
+            # A single GET is cheaper than paging through the project's job runs
+            try:
+                job_run = self._job_run_cache.get(
+                    api, scope, job_run_ids[0], refresh=True
+                )
+            except scaleway.ScalewayException as e:
+                if e.status_code != 404:
+                    raise
+                return {}
+            return {job_run.id: job_run}
+        return self._job_run_cache.get_many(api, scope, job_run_ids)
 
-        self._instance.report_run_canceling(run)
+    def _stop_job_run(
+        self, api: scw.JobsV1Alpha1API, scope: Scope, job_run: scw.JobRun
+    ) -> str:
+        queued = job_run.state in QUEUED_JOB_RUN_STATES
+        try:
+            stopped = api.stop_job_run(job_run_id=job_run.id)
+        except scaleway.ScalewayException as e:
+            if e.status_code == 404:
+                return TERMINATION_NOT_FOUND
+            if not queued or e.status_code >= 500:
+                raise
+            # The API refused to stop a job run that has not started yet
+            self._deferred_stops.add(scope, job_run.id)
+            return TERMINATION_STOP_DEFERRED
+        self._job_run_cache.track(scope, stopped)
+        return TERMINATION_STOPPED_QUEUED if queued else TERMINATION_STOPPED
 
-        job_run = self._get_scaleway_job_run_from_dagster_run(run)
+    def _stop_dequeued_job_runs(
+        self, scope: Scope, job_run_ids: list[str]
+    ) -> list[str]:
+        """Stops the deferred job runs that left the queue, see `DeferredStops`."""
+        api = self._client_pool.get_api(scope[0] or None)
+        job_runs = self._job_run_cache.get_many(api, scope, job_run_ids)
+        done = []
+        for job_run_id in job_run_ids:
+            job_run = job_runs.get(job_run_id)
+            if job_run is not None and job_run.state in QUEUED_JOB_RUN_STATES:
+                continue
+            if job_run is not None and job_run.state in scw.JOB_RUN_TRANSIENT_STATUSES:
+                try:
+                    self._job_run_cache.track(
+                        scope, api.stop_job_run(job_run_id=job_run_id)
+                    )
+                except scaleway.ScalewayException as e:
+                    if e.status_code != 404:
+                        # Retried on the next poll
+                        continue
+            done.append(job_run_id)
+        return done
 
-        if not job_run:
-            self._instance.report_engine_event(
-                message=f"Unable to get Scaleway job run for Dagster run {run_id} to send termination signal",
-                dagster_run=run,
-                cls=self.__class__,
-            )
-            return False
+    def terminate_runs(self, run_ids: Sequence[str]) -> TerminationReport:
+        """Terminates many runs at once, e.g. the runs of a canceled backfill.
 
-        if job_run.state != scw.JobRunState.RUNNING:
-            self._instance.report_engine_event(
-                message=f"Scaleway job run {job_run.id} for Dagster run {run_id} is not running, cannot terminate",
-                dagster_run=run,
-                cls=self.__class__,
-            )
-            return False
+        Job run IDs are read from the run tags and their states refreshed with a few list
+        calls per region, then all job runs are stopped concurrently
+        (`launch_concurrency` at a time). Job runs still queued on Scaleway are stopped
+        before they start, or as soon as they start when the API refuses, and their
+        Dagster runs are marked as canceled right away since no run worker will.
+        """
+        outcomes: dict[str, str] = {}
+        errors: dict[str, str] = {}
 
-        serverless_job_context = self.get_serverless_job_context(run)
-        client = self._get_client(serverless_job_context)
-        api = scw.JobsV1Alpha1API(client)
+        runs = {
+            run.run_id: run
+            for run in self._instance.get_runs(RunsFilter(run_ids=list(run_ids)))
+        }
+        to_resolve: dict[Scope, tuple[scw.JobsV1Alpha1API, dict[str, DagsterRun]]] = {}
+        for run_id in run_ids:
+            run = runs.get(run_id)
+            if run is None:
+                outcomes[run_id] = TERMINATION_NOT_FOUND
+                continue
 
-        api.stop_job_run(job_run_id=job_run.id)
+            self._instance.report_run_canceling(run)
 
-        return True
+            job_run_id = run.tags.get(SERVERLESS_JOBS_RUN_ID)
+            if not job_run_id:
+                # Asynchronous launches skip the runs canceled while waiting
+                outcomes[run_id] = TERMINATION_NOT_LAUNCHED
+                self._report_termination(
+                    run,
+                    f"Dagster run {run_id} has no Scaleway job run to send termination signal to",
+                )
+                continue
+
+            api = self._get_api_for_run(run)
+            scope = self._get_job_definition_scope(api.client)
+            to_resolve.setdefault(scope, (api, {}))[1][job_run_id] = run
+
+        to_stop = []
+        for scope, (api, runs_by_job_run) in to_resolve.items():
+            try:
+                job_runs = self._get_job_runs_to_terminate(
+                    api, scope, list(runs_by_job_run)
+                )
+            except scaleway.ScalewayException as e:
+                for run in runs_by_job_run.values():
+                    outcomes[run.run_id] = TERMINATION_FAILED
+                    errors[run.run_id] = str(e)
+                continue
+
+            for job_run_id, run in runs_by_job_run.items():
+                job_run = job_runs.get(job_run_id)
+                if job_run is None:
+                    outcomes[run.run_id] = TERMINATION_NOT_FOUND
+                    self._report_termination(
+                        run,
+                        f"Unable to get Scaleway job run for Dagster run {run.run_id} to send termination signal",
+                    )
+                elif job_run.state not in scw.JOB_RUN_TRANSIENT_STATUSES:
+                    outcomes[run.run_id] = TERMINATION_ALREADY_FINISHED
+                    self._report_termination(
+                        run,
+                        f"Scaleway job run {job_run.id} for Dagster run {run.run_id} already finished, cannot terminate",
+                    )
+                else:
+                    to_stop.append((api, scope, run, job_run))
+
+        with ThreadPoolExecutor(
+            max_workers=self.launch_concurrency,
+            thread_name_prefix="dagster-scaleway-terminate",
+        ) as executor:
+            futures = [
+                executor.submit(self._stop_job_run, api, scope, job_run)
+                for api, scope, _, job_run in to_stop
+            ]
+
+        for (_, _, run, job_run), future in zip(to_stop, futures):
+            try:
+                outcome = future.result()
+            except Exception as e:
+                outcomes[run.run_id] = TERMINATION_FAILED
+                errors[run.run_id] = str(e)
+                self._report_termination(
+                    run,
+                    f"Failed to stop Scaleway job run {job_run.id} for Dagster run {run.run_id}: {e}",
+                )
+                continue
+
+            outcomes[run.run_id] = outcome
+            if outcome == TERMINATION_STOPPED_QUEUED:
+                self._instance.report_run_canceled(
+                    run,
+                    message=f"Stopped Scaleway job run {job_run.id} before it started",
+                )
+            elif outcome == TERMINATION_STOP_DEFERRED:
+                # A run worker started anyway exits without executing a canceled run
+                self._instance.report_run_canceled(
+                    run,
+                    message=f"Scaleway job run {job_run.id} is queued, it will be stopped once it starts",
+                )
+            elif outcome == TERMINATION_NOT_FOUND:
+                self._report_termination(
+                    run,
+                    f"Scaleway job run {job_run.id} for Dagster run {run.run_id} no longer exists",
+                )
+
+        return TerminationReport(outcomes=outcomes, errors=errors)
+
+    def terminate(self, run_id):
+        report = self.terminate_runs([run_id])
+        return report.outcomes[run_id] in TERMINATED_OUTCOMES
 
     @property
     def supports_check_run_worker_health(self):
         return True
 
+    def _record_oom(self, run: DagsterRun, job_run: scw.JobRun):
+        if (
+            self._autosizer is None
+            or job_run.state != scw.JobRunState.FAILED
+            or USAGE_OOM_TAG in run.tags
+        ):
+            return
+
+        error_message = (job_run.error_message or "").lower()
+        if (
+            job_run.exit_code == OOM_KILLED_EXIT_CODE
+            or "out of memory" in error_message
+            or "oom" in error_message
+        ):
+            # The wrapper was killed with the run, record the failure for the autosizer
+            self._instance.add_run_tags(run.run_id, {USAGE_OOM_TAG: "true"})
+
     def check_run_worker_health(self, run: DagsterRun):
         job_run = self._get_scaleway_job_run_from_dagster_run(run)
         if job_run is None:
@@ -308,13 +1787,13 @@ class ScalewayServerlessJobRunLauncher(RunLauncher, ConfigurableClass):
                 msg=f"Unable to find Scaleway job run with id {run.run_id} for Dagster run {run.run_id}",
             )
 
-        health = CheckRunHealthResult(run_worker_id=run.run_id)
-        health.transient = job_run.state in scw.JOB_RUN_TRANSIENT_STATUSES
-        health.status = SERVERLESS_JOBS_STATES_TO_WORKER_STATUS.get(
-            job_run.state, WorkerStatus.UNKNOWN
-        )
-
-        if job_run.error_message:
-            health.msg = job_run.error_message
+        self._record_oom(run, job_run)
 
-        return health
+        return CheckRunHealthResult(
+            SERVERLESS_JOBS_STATES_TO_WORKER_STATUS.get(
+                job_run.state, WorkerStatus.UNKNOWN
+            ),
+            msg=job_run.error_message or None,
+            transient=job_run.state in scw.JOB_RUN_TRANSIENT_STATUSES,
+            run_worker_id=run.run_id,
+        )
@@ -0,0 +1,138 @@
+import logging
+import threading
+import time
+from typing import Callable, Iterable, NamedTuple, Optional
+
+from .job_definition_cache import Scope
+
+logger = logging.getLogger(__name__)
+
+# A running job run was stopped
+TERMINATION_STOPPED = "stopped"
+# A job run was stopped while still queued, its Dagster run is canceled
+TERMINATION_STOPPED_QUEUED = "stopped_queued"
+# A queued job run will be stopped once it starts, its Dagster run is canceled
+TERMINATION_STOP_DEFERRED = "stop_deferred"
+# The Dagster run has no job run yet, e.g. waiting for an asynchronous launch
+TERMINATION_NOT_LAUNCHED = "not_launched"
+TERMINATION_ALREADY_FINISHED = "already_finished"
+TERMINATION_NOT_FOUND = "not_found"
+TERMINATION_FAILED = "failed"
+
+TERMINATED_OUTCOMES = (
+    TERMINATION_STOPPED,
+    TERMINATION_STOPPED_QUEUED,
+    TERMINATION_STOP_DEFERRED,
+)
+
+DEFERRED_STOP_POLL_INTERVAL = 5
+DEFAULT_DEFERRED_STOP_TIMEOUT = 3600
+
+
+class TerminationReport(NamedTuple):
+    # Outcome of each Dagster run, one of the TERMINATION_* values
+    outcomes: dict[str, str]
+    # Error of each Dagster run whose job run could not be stopped
+    errors: dict[str, str]
+
+    @property
+    def terminated(self) -> list[str]:
+        return [
+            run_id
+            for run_id, outcome in self.outcomes.items()
+            if outcome in TERMINATED_OUTCOMES
+        ]
+
+    def format(self) -> str:
+        lines = [
+            f"Failed to terminate Dagster run {run_id}: {error}"
+            for run_id, error in self.errors.items()
+        ]
+        counts: dict[str, int] = {}
+        for outcome in self.outcomes.values():
+            counts[outcome] = counts.get(outcome, 0) + 1
+        lines.append(
+            ", ".join(
+                f"{count} {outcome.replace('_', ' ')}"
+                for outcome, count in sorted(counts.items())
+            )
+            or "No run to terminate"
+        )
+        return "\n".join(lines)
+
+
+class DeferredStops:
+    """Job runs to stop as soon as they leave Scaleway's queue.
+
+    Pending job runs are polled by a background thread, which exits once none is left.
+    `stop_dequeued` gets the pending job run IDs of a scope and returns the ones it is
+    done with, because they were stopped, finished or are gone. Job runs still queued
+    after `timeout` seconds are given up on.
+    """
+
+    def __init__(
+        self,
+        stop_dequeued: Callable[[Scope, list[str]], Iterable[str]],
+        poll_interval: float = DEFERRED_STOP_POLL_INTERVAL,
+        timeout: float = DEFAULT_DEFERRED_STOP_TIMEOUT,
+    ):
+        self._stop_dequeued = stop_dequeued
+        self._poll_interval = poll_interval
+        self._timeout = timeout
+        self._lock = threading.Lock()
+        # Deadline of each pending job run, by scope
+        self._pending: dict[Scope, dict[str, float]] = {}
+        self._thread: Optional[threading.Thread] = None
+        self._closed = threading.Event()
+
+    @property
+    def pending(self) -> int:
+        with self._lock:
+            return sum(len(job_run_ids) for job_run_ids in self._pending.values())
+
+    def add(self, scope: Scope, job_run_id: str) -> None:
+        with self._lock:
+            self._pending.setdefault(scope, {})[job_run_id] = (
+                time.monotonic() + self._timeout
+            )
+            if self._thread is None and not self._closed.is_set():
+                self._thread = threading.Thread(
+                    target=self._watch,
+                    name="dagster-scaleway-deferred-stops",
+                    daemon=True,
+                )
+                self._thread.start()
+
+    def _watch(self) -> None:
+        while not self._closed.wait(self._poll_interval):
+            with self._lock:
+                pending = {
+                    scope: list(job_run_ids)
+                    for scope, job_run_ids in self._pending.items()
+                }
+
+            for scope, job_run_ids in pending.items():
+                try:
+                    done = set(self._stop_dequeued(scope, job_run_ids))
+                except Exception:
+                    logger.exception(
+                        "Failed to stop the dequeued job runs of %s", scope
+                    )
+                    done = set()
+
+                now = time.monotonic()
+                with self._lock:
+                    deadlines = self._pending[scope]
+                    for job_run_id in job_run_ids:
+                        if job_run_id in done or deadlines[job_run_id] <= now:
+                            del deadlines[job_run_id]
+                    if not deadlines:
+                        del self._pending[scope]
+
+            with self._lock:
+                if not self._pending:
+                    self._thread = None
+                    return
+
+    def close(self) -> None:
+        self._closed.set()
@@ -0,0 +1,127 @@
+import resource
+import time
+from typing import NamedTuple, Optional
+
+# Tags written on Dagster runs to size later runs of the same job definition, see
+# ResourceAutosizer
+AUTOSIZING_KEY_TAG = "dagster-scaleway/autosizing-key"
+MEMORY_LIMIT_TAG = "dagster-scaleway/memory-limit"
+CPU_LIMIT_TAG = "dagster-scaleway/cpu-limit"
+USAGE_MAX_MEMORY_TAG = "dagster-scaleway/usage/max-memory"
+USAGE_CPU_SECONDS_TAG = "dagster-scaleway/usage/cpu-seconds"
+USAGE_DURATION_TAG = "dagster-scaleway/usage/duration"
+USAGE_OOM_TAG = "dagster-scaleway/usage/oom"
+
+# cgroup v2 files first, then their cgroup v1 equivalents
+CGROUP_MEMORY_PEAK_FILES = (
+    "/sys/fs/cgroup/memory.peak",
+    "/sys/fs/cgroup/memory/memory.max_usage_in_bytes",
+)
+CGROUP_MEMORY_EVENTS_FILES = (
+    "/sys/fs/cgroup/memory.events",
+    "/sys/fs/cgroup/memory/memory.oom_control",
+)
+CGROUP_CPU_USAGE_V2_FILE = "/sys/fs/cgroup/cpu.stat"
+CGROUP_CPU_USAGE_V1_FILE = "/sys/fs/cgroup/cpuacct/cpuacct.usage"
+
+MIB = 1024 * 1024
+
+
+class ResourceUsage(NamedTuple):
+    """Resources used by a job run, as measured from inside its container."""
+
+    max_memory: int  # MiB
+    cpu_seconds: float
+    duration: float
+    oom: bool
+
+    def to_tags(self) -> dict[str, str]:
+        tags = {
+            USAGE_MAX_MEMORY_TAG: str(self.max_memory),
+            USAGE_CPU_SECONDS_TAG: f"{self.cpu_seconds:.2f}",
+            USAGE_DURATION_TAG: f"{self.duration:.2f}",
+        }
+        if self.oom:
+            tags[USAGE_OOM_TAG] = "true"
+        return tags
+
+
+def _read_first(paths) -> Optional[str]:
+    for path in paths:
+        try:
+            with open(path) as f:
+                return f.read()
+        except OSError:
+            continue
+    return None
+
+
+def _get_cgroup_cpu_seconds() -> Optional[float]:
+    content = _read_first((CGROUP_CPU_USAGE_V2_FILE,))
+    if content:
+        for line in content.splitlines():
+            key, _, value = line.partition(" ")
+            if key == "usage_usec":
+                return int(value) / 1e6
+
+    content = _read_first((CGROUP_CPU_USAGE_V1_FILE,))
+    if content:
+        return int(content) / 1e9
+
+    return None
+
+
+def _get_rusage_cpu_seconds() -> float:
+    cpu_seconds = 0.0
+    for who in (resource.RUSAGE_SELF, resource.RUSAGE_CHILDREN):
+        usage = resource.getrusage(who)
+        cpu_seconds += usage.ru_utime + usage.ru_stime
+    return cpu_seconds
+
+
+def get_cpu_seconds() -> float:
+    """CPU time used by the container so far, or by this process tree outside of one."""
+    cpu_seconds = _get_cgroup_cpu_seconds()
+    return cpu_seconds if cpu_seconds is not None else _get_rusage_cpu_seconds()
+
+
+def get_max_memory() -> int:
+    """Peak memory of the container in MiB, or of the largest process of this tree."""
+    content = _read_first(CGROUP_MEMORY_PEAK_FILES)
+    if content and content.strip().isdigit():
+        return -(-int(content) // MIB)
+
+    # ru_maxrss is in KiB on Linux
+    max_rss = max(
+        resource.getrusage(who).ru_maxrss
+        for who in (resource.RUSAGE_SELF, resource.RUSAGE_CHILDREN)
+    )
+    return -(-max_rss // 1024)
+
+
+def was_oom_killed() -> bool:
+    content = _read_first(CGROUP_MEMORY_EVENTS_FILES)
+    if not content:
+        return False
+    for line in content.splitlines():
+        key, _, value = line.partition(" ")
+        if key == "oom_kill":
+            return int(value or 0) > 0
+    return False
+
+
+class UsageMeter:
+    """Measures the resources used from its creation to `stop()`."""
+
+    def __init__(self):
+        self._started_at = time.monotonic()
+        self._cpu_seconds_at_start = get_cpu_seconds()
+
+    def stop(self, killed_by_sigkill: bool = False) -> ResourceUsage:
+        return ResourceUsage(
+            max_memory=get_max_memory(),
+            cpu_seconds=max(get_cpu_seconds() - self._cpu_seconds_at_start, 0.0),
+            duration=time.monotonic() - self._started_at,
+            # Without cgroup events, a SIGKILL is the best hint of the OOM killer
+            oom=was_oom_killed() or killed_by_sigkill,
+        )
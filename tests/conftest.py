@@ -0,0 +1,220 @@
+import io
+import uuid
+from types import SimpleNamespace
+from typing import Iterator, Optional
+
+import pytest
+import scaleway
+import scaleway.jobs.v1alpha1 as scw
+from dagster import DagsterInstance, instance_for_test
+from dagster._core.definitions.reconstruct import ReconstructableJob
+from dagster._core.storage.dagster_run import DagsterRun
+
+from benchmarks.fake_jobs_api import FAKE_PROJECT_ID, FakeJobsApi, FakeJobsApiConfig
+from benchmarks.harness import benchmark_job
+from dagster_scaleway import ScalewayServerlessJobRunLauncher
+
+
+@pytest.fixture
+def fake_jobs_api_config() -> FakeJobsApiConfig:
+    """Overridden by the test modules needing e.g. job runs that finish."""
+    return FakeJobsApiConfig()
+
+
+@pytest.fixture
+def fake_jobs_api(
+    fake_jobs_api_config: FakeJobsApiConfig, monkeypatch: pytest.MonkeyPatch
+) -> Iterator[FakeJobsApi]:
+    with FakeJobsApi(fake_jobs_api_config) as api:
+        # The launcher builds its clients from the environment
+        for name, value in {
+            "SCW_API_URL": api.url,
+            "SCW_ACCESS_KEY": "SCWXXXXXXXXXXXXXXXXX",
+            "SCW_SECRET_KEY": str(uuid.uuid4()),
+            "SCW_DEFAULT_PROJECT_ID": FAKE_PROJECT_ID,
+            "SCW_DEFAULT_ORGANIZATION_ID": FAKE_PROJECT_ID,
+            "SCW_DEFAULT_REGION": "fr-par",
+        }.items():
+            monkeypatch.setenv(name, value)
+        yield api
+
+
+@pytest.fixture
+def jobs_api(fake_jobs_api: FakeJobsApi) -> scw.JobsV1Alpha1API:
+    return scw.JobsV1Alpha1API(scaleway.Client.from_env())
+
+
+@pytest.fixture
+def job_definition(jobs_api: scw.JobsV1Alpha1API) -> scw.JobDefinition:
+    return jobs_api.create_job_definition(
+        name="test",
+        description="",
+        cpu_limit=1000,
+        memory_limit=2048,
+        image_uri="rg.fr-par.scw.cloud/test/test:latest",
+        command="true",
+        project_id=FAKE_PROJECT_ID,
+    )
+
+
+@pytest.fixture
+def start_job_run(jobs_api: scw.JobsV1Alpha1API, job_definition: scw.JobDefinition):
+    """Starts a job run of the test job definition."""
+
+    def start() -> scw.JobRun:
+        return jobs_api.start_job_definition(
+            job_definition_id=job_definition.id
+        ).job_runs[0]
+
+    return start
+
+
+@pytest.fixture
+def instance() -> Iterator[DagsterInstance]:
+    with instance_for_test() as instance:
+        yield instance
+
+
+@pytest.fixture
+def create_run(instance: DagsterInstance):
+    """Creates a run of the benchmark job, which has an op per job definition."""
+    origin = ReconstructableJob.for_module(
+        "benchmarks.harness", benchmark_job.name
+    ).get_python_origin()
+
+    def create(**kwargs) -> DagsterRun:
+        return instance.create_run_for_job(
+            job_def=benchmark_job, job_code_origin=origin, **kwargs
+        )
+
+    return create
+
+
+@pytest.fixture
+def make_launcher(instance: DagsterInstance, fake_jobs_api: FakeJobsApi):
+    """Builds run launchers registered to the test instance, disposed after the test."""
+    launchers = []
+
+    def make(**config) -> ScalewayServerlessJobRunLauncher:
+        launcher = ScalewayServerlessJobRunLauncher(
+            **{
+                "docker_image": "rg.fr-par.scw.cloud/test/launcher:latest",
+                "region": "fr-par",
+                **config,
+            }
+        )
+        launcher.register_instance(instance)
+        launchers.append(launcher)
+        return launcher
+
+    yield make
+    for launcher in launchers:
+        launcher.dispose()
+
+
+class FakeObjectStorage:
+    """In-memory stand-in for the parts of a boto3 S3 client used with Object Storage."""
+
+    class NoSuchKey(Exception):
+        pass
+
+    exceptions = SimpleNamespace(NoSuchKey=NoSuchKey)
+
+    def __init__(self):
+        self.objects: dict[tuple[str, str], bytes] = {}
+        self.content_types: dict[tuple[str, str], str] = {}
+        # Byte ranges requested with ranged GETs
+        self.ranges: list[str] = []
+        # Number of keys of each delete_objects call
+        self.delete_batches: list[int] = []
+
+    def _get(self, Bucket: str, Key: str) -> bytes:
+        if (Bucket, Key) not in self.objects:
+            raise self.NoSuchKey(Key)
+        return self.objects[Bucket, Key]
+
+    def put_object(self, Bucket: str, Key: str, Body: bytes, **kwargs) -> dict:
+        self.objects[Bucket, Key] = Body
+        return {}
+
+    def get_object(self, Bucket: str, Key: str, Range: str = "", **kwargs) -> dict:
+        data = self._get(Bucket, Key)
+        if Range:
+            self.ranges.append(Range)
+            start, end = Range.removeprefix("bytes=").split("-")
+            data = data[int(start) : int(end) + 1]
+        return {"Body": io.BytesIO(data)}
+
+    def head_object(self, Bucket: str, Key: str) -> dict:
+        return {
+            "ContentLength": len(self._get(Bucket, Key)),
+            "ContentType": self.content_types.get((Bucket, Key), ""),
+        }
+
+    def delete_object(self, Bucket: str, Key: str, **kwargs) -> dict:
+        self.objects.pop((Bucket, Key), None)
+        return {}
+
+    def delete_objects(self, Bucket: str, Delete: dict) -> dict:
+        self.delete_batches.append(len(Delete["Objects"]))
+        for obj in Delete["Objects"]:
+            self.objects.pop((Bucket, obj["Key"]), None)
+        return {}
+
+    def list_objects_v2(
+        self,
+        Bucket: str,
+        Prefix: str = "",
+        StartAfter: str = "",
+        MaxKeys: int = 1000,
+        ContinuationToken: str = "",
+    ) -> dict:
+        keys = sorted(
+            key
+            for bucket, key in self.objects
+            if bucket == Bucket
+            and key.startswith(Prefix)
+            and key > max(StartAfter, ContinuationToken)
+        )
+        page = {
+            "Contents": [
+                {"Key": key, "Size": len(self.objects[Bucket, key])}
+                for key in keys[:MaxKeys]
+            ]
+        }
+        if len(keys) > MaxKeys:
+            page["NextContinuationToken"] = keys[MaxKeys - 1]
+        return page
+
+    def get_paginator(self, operation: str):
+        assert operation == "list_objects_v2"
+
+        def paginate(**kwargs) -> Iterator[dict]:
+            while True:
+                page = self.list_objects_v2(**kwargs)
+                yield page
+                if "NextContinuationToken" not in page:
+                    return
+                kwargs["ContinuationToken"] = page["NextContinuationToken"]
+
+        return SimpleNamespace(paginate=paginate)
+
+    def upload_fileobj(
+        self,
+        Fileobj,
+        Bucket: str,
+        Key: str,
+        ExtraArgs: Optional[dict] = None,
+        Config=None,
+    ) -> None:
+        self.objects[Bucket, Key] = Fileobj.read()
+        if ExtraArgs and "ContentType" in ExtraArgs:
+            self.content_types[Bucket, Key] = ExtraArgs["ContentType"]
+
+    def download_fileobj(self, Bucket: str, Key: str, Fileobj, Config=None) -> None:
+        Fileobj.write(self._get(Bucket, Key))
+
+
+@pytest.fixture
+def object_storage() -> FakeObjectStorage:
+    return FakeObjectStorage()
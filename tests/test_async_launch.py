@@ -0,0 +1,119 @@
+import threading
+
+from dagster import DagsterRunStatus
+from dagster._core.launcher import LaunchRunContext
+
+from dagster_scaleway.bounded_executor import BoundedThreadPoolExecutor
+from dagster_scaleway.serverless_job_launcher import SERVERLESS_JOBS_RUN_ID
+
+
+def _launch(launcher, run):
+    launcher.launch_run(LaunchRunContext(dagster_run=run, workspace=None))
+
+
+def test_async_launch_returns_before_the_job_run_starts(
+    make_launcher, create_run, instance, monkeypatch
+):
+    launcher = make_launcher(async_launch=True)
+    release = threading.Event()
+    launch = launcher._launch_serverless_job_with_command
+
+    def blocked_launch(*args, **kwargs):
+        assert release.wait(10)
+        launch(*args, **kwargs)
+
+    monkeypatch.setattr(launcher, "_launch_serverless_job_with_command", blocked_launch)
+    run = create_run()
+
+    _launch(launcher, run)
+
+    assert SERVERLESS_JOBS_RUN_ID not in instance.get_run_by_id(run.run_id).tags
+    release.set()
+    launcher.dispose()
+    assert SERVERLESS_JOBS_RUN_ID in instance.get_run_by_id(run.run_id).tags
+
+
+def test_runs_canceled_before_submission_are_not_started(
+    make_launcher, create_run, instance, fake_jobs_api
+):
+    launcher = make_launcher(async_launch=True)
+    run = create_run()
+    instance.report_run_canceling(run)
+    fake_jobs_api.reset_counts()
+
+    launcher._launch_serverless_job_in_background(
+        instance.get_run_by_id(run.run_id), "image", ["dagster", "api"]
+    )
+
+    assert instance.get_run_by_id(run.run_id).status == DagsterRunStatus.CANCELED
+    assert not fake_jobs_api.reset_counts()
+
+
+def test_runs_canceled_while_starting_are_stopped_before_being_tagged(
+    make_launcher, create_run, instance, fake_jobs_api, monkeypatch
+):
+    launcher = make_launcher(async_launch=True)
+    run = create_run()
+    start = launcher._start_placed_job_run
+
+    def start_then_terminate(*args):
+        started = start(*args)
+        # The termination finds no job run to stop yet
+        assert not launcher.terminate(run.run_id)
+        return started
+
+    monkeypatch.setattr(launcher, "_start_placed_job_run", start_then_terminate)
+    tagged_states = []
+    add_run_tags = instance.add_run_tags
+
+    def record_state(run_id, new_tags):
+        if SERVERLESS_JOBS_RUN_ID in new_tags:
+            job_run = fake_jobs_api._job_runs[new_tags[SERVERLESS_JOBS_RUN_ID]]
+            tagged_states.append(job_run["state"])
+        add_run_tags(run_id, new_tags)
+
+    monkeypatch.setattr(instance, "add_run_tags", record_state)
+
+    launcher._launch_serverless_job_in_background(run, "image", ["dagster", "api"])
+
+    (job_run,) = fake_jobs_api._job_runs.values()
+    assert job_run["state"] == "canceled"
+    assert tagged_states == ["canceled"]
+    assert instance.get_run_by_id(run.run_id).status == DagsterRunStatus.CANCELED
+
+
+def test_background_launch_failures_fail_the_run(
+    make_launcher, create_run, instance, monkeypatch
+):
+    launcher = make_launcher(async_launch=True)
+
+    def fail(*args):
+        raise RuntimeError("Scaleway is down")
+
+    monkeypatch.setattr(launcher, "_launch_serverless_job_with_command", fail)
+    run = create_run()
+
+    _launch(launcher, run)
+    launcher.dispose()
+
+    assert instance.get_run_by_id(run.run_id).status == DagsterRunStatus.FAILURE
+
+
+def test_bounded_executor_blocks_submissions_when_full():
+    executor = BoundedThreadPoolExecutor(max_workers=1, max_queue_depth=1)
+    release = threading.Event()
+    executor.submit(release.wait)
+    executor.submit(release.wait)
+    submitted = threading.Event()
+
+    thread = threading.Thread(
+        target=lambda: (executor.submit(lambda: None), submitted.set())
+    )
+    thread.start()
+
+    assert not submitted.wait(0.2)
+    assert executor.pending == 2
+    release.set()
+    assert submitted.wait(10)
+    executor.shutdown()
+    assert executor.pending == 0
@@ -0,0 +1,142 @@
+import json
+
+import pytest
+from dagster import DagsterRunStatus
+from dagster._core.launcher import LaunchRunContext
+
+from dagster_scaleway.autosizing import (
+    AutosizingConfig,
+    ResourceAutosizer,
+    SizeRecommendation,
+)
+from dagster_scaleway.serverless_job_context import SCALEWAY_CONFIG_TAG
+from dagster_scaleway.serverless_job_launcher import (
+    SERVERLESS_JOBS_DEFINITION_ID,
+    SERVERLESS_JOBS_RUN_ID,
+)
+from dagster_scaleway.usage import (
+    AUTOSIZING_KEY_TAG,
+    MEMORY_LIMIT_TAG,
+    USAGE_CPU_SECONDS_TAG,
+    USAGE_DURATION_TAG,
+    USAGE_MAX_MEMORY_TAG,
+    USAGE_OOM_TAG,
+    ResourceUsage,
+)
+
+KEY = "op_0"
+
+
+@pytest.fixture
+def add_history(create_run):
+    """Records finished runs of KEY that used `max_memory` MiB and `cpu` mCPU."""
+
+    def add(max_memory: int, cpu: int = 500, **tags):
+        usage = ResourceUsage(
+            max_memory=max_memory, cpu_seconds=cpu / 100, duration=10, oom=False
+        )
+        return create_run(
+            status=DagsterRunStatus.SUCCESS,
+            tags={AUTOSIZING_KEY_TAG: KEY, **usage.to_tags(), **tags},
+        )
+
+    return add
+
+
+def test_limits_follow_the_usage_percentile(instance, add_history):
+    for max_memory, cpu in ((800, 400), (900, 450), (1000, 500)):
+        add_history(max_memory, cpu)
+
+    recommendation = ResourceAutosizer(AutosizingConfig()).recommend(instance, KEY)
+
+    # 1000 MiB and 500 mCPU with 20% headroom, rounded up
+    assert recommendation == SizeRecommendation(
+        memory_limit=1280, cpu_limit=600, samples=3, after_oom=False
+    )
+
+
+def test_limits_need_enough_samples(instance, add_history):
+    for _ in range(2):
+        add_history(1000)
+
+    assert ResourceAutosizer(AutosizingConfig()).recommend(instance, KEY) is None
+
+
+def test_memory_grows_after_an_oom_kill(instance, add_history):
+    for _ in range(3):
+        add_history(1000)
+    add_history(3000, **{USAGE_OOM_TAG: "true", MEMORY_LIMIT_TAG: "2048"})
+
+    recommendation = ResourceAutosizer(
+        AutosizingConfig(max_memory_limit=3072)
+    ).recommend(instance, KEY)
+
+    # Twice the limit the run was killed with, capped
+    assert recommendation.memory_limit == 3072
+    assert recommendation.after_oom
+
+
+def test_usage_tags_round_trip():
+    usage = ResourceUsage(max_memory=512, cpu_seconds=12.345, duration=20, oom=True)
+
+    assert usage.to_tags() == {
+        USAGE_MAX_MEMORY_TAG: "512",
+        USAGE_CPU_SECONDS_TAG: "12.35",
+        USAGE_DURATION_TAG: "20.00",
+        USAGE_OOM_TAG: "true",
+    }
+
+
+def _launch(launcher, instance, run):
+    launcher.launch_run(LaunchRunContext(dagster_run=run, workspace=None))
+    return instance.get_run_by_id(run.run_id)
+
+
+def test_runs_are_launched_with_autosized_limits(
+    make_launcher, create_run, instance, add_history, fake_jobs_api
+):
+    for _ in range(3):
+        add_history(1000)
+    launcher = make_launcher(autosizing={})
+
+    run = _launch(launcher, instance, create_run(op_selection=[KEY]))
+
+    job_def = fake_jobs_api._job_definitions[run.tags[SERVERLESS_JOBS_DEFINITION_ID]]
+    assert (job_def["cpu_limit"], job_def["memory_limit"]) == (600, 1280)
+    assert "--record-usage" in job_def["command"]
+    assert run.tags[AUTOSIZING_KEY_TAG] == KEY
+    assert run.tags[MEMORY_LIMIT_TAG] == "1280"
+
+
+def test_explicit_limits_are_kept(
+    make_launcher, create_run, instance, add_history, fake_jobs_api
+):
+    for _ in range(3):
+        add_history(1000)
+    launcher = make_launcher(autosizing={})
+
+    run = _launch(
+        launcher,
+        instance,
+        create_run(
+            op_selection=[KEY],
+            tags={SCALEWAY_CONFIG_TAG: json.dumps({"memory_limit": 4096})},
+        ),
+    )
+
+    job_def = fake_jobs_api._job_definitions[run.tags[SERVERLESS_JOBS_DEFINITION_ID]]
+    assert (job_def["cpu_limit"], job_def["memory_limit"]) == (600, 4096)
+
+
+def test_oom_killed_job_runs_are_recorded(
+    make_launcher, create_run, instance, fake_jobs_api
+):
+    launcher = make_launcher(autosizing={}, job_run_cache_ttl=0)
+    run = _launch(launcher, instance, create_run(op_selection=[KEY]))
+    fake_jobs_api._job_runs[run.tags[SERVERLESS_JOBS_RUN_ID]].update(
+        state="failed", exit_code=137
+    )
+
+    launcher.check_run_worker_health(run)
+
+    assert instance.get_run_by_id(run.run_id).tags[USAGE_OOM_TAG] == "true"
@@ -0,0 +1,77 @@
+import json
+
+from benchmarks import harness
+
+BASELINE = {
+    "launch_run": {
+        "calls": 500,
+        "errors": 0,
+        "throughput": 100.0,
+        "p50_ms": 1000.0,
+        "p99_ms": 2000.0,
+        "api_requests": 1.08,
+    }
+}
+
+
+def _results(**changes) -> dict:
+    return {"launch_run": {**BASELINE["launch_run"], **changes}}
+
+
+def test_latencies_may_regress_by_the_tolerance():
+    assert not harness.find_regressions(
+        _results(p50_ms=1400.0, p99_ms=2900.0, throughput=70.0), BASELINE, 1.5
+    )
+    assert len(harness.find_regressions(_results(p99_ms=3500.0), BASELINE, 1.5)) == 1
+
+
+def test_latencies_under_the_noise_floor_are_ignored():
+    baseline = {"terminate": {**BASELINE["launch_run"], "p50_ms": 0.1, "p99_ms": 10.0}}
+    results = {"terminate": {**baseline["terminate"], "p50_ms": 1.0, "p99_ms": 200.0}}
+
+    assert not harness.find_regressions(results, baseline, 1.5)
+
+
+def test_api_requests_are_gated_more_strictly_than_latencies():
+    # One more request every 20 launches
+    regressions = harness.find_regressions(_results(api_requests=1.13), BASELINE, 1.5)
+
+    assert regressions == ["launch_run api_requests: 1.13 > 1.08 x 1.02"]
+
+
+def test_benchmark_runs_without_errors(tmp_path, capsys, monkeypatch):
+    output = tmp_path / "results.json"
+    # Restored after the harness points them to its fake API
+    for name in (
+        "SCW_API_URL",
+        "SCW_ACCESS_KEY",
+        "SCW_SECRET_KEY",
+        "SCW_DEFAULT_PROJECT_ID",
+        "SCW_DEFAULT_ORGANIZATION_ID",
+        "SCW_DEFAULT_REGION",
+    ):
+        monkeypatch.delenv(name, raising=False)
+
+    assert (
+        harness.main(
+            [
+                "--runs",
+                "10",
+                "--concurrency",
+                "4",
+                "--job-definitions",
+                "150",
+                "--latency",
+                "0",
+                "--output",
+                str(output),
+            ]
+        )
+        == 0
+    )
+
+    results = json.loads(output.read_text())
+    assert all(result["errors"] == 0 for result in results.values())
+    # Two pages of job definitions listed once, and a definition per op created and
+    # started by each run
+    assert results["launch_run"]["api_requests"] == 2.2
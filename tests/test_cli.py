@@ -0,0 +1,89 @@
+import json
+import subprocess
+import sys
+import types
+
+import pytest
+
+from dagster_scaleway import cli
+
+
+def test_report_startup_does_not_start_a_subprocess(monkeypatch, capsys):
+    def fail(*args, **kwargs):
+        raise AssertionError("The startup report must not start a process")
+
+    monkeypatch.setattr(subprocess, "run", fail)
+    monkeypatch.setattr(subprocess, "Popen", fail)
+
+    cli._report_startup("in-process", 1.234)
+
+    assert capsys.readouterr().err == (
+        "dagster-scaleway: ready to run the Dagster command after 1.23s (in-process)\n"
+    )
+
+
+def test_startup_profile_measures_the_dagster_cli_startup(monkeypatch, capsys):
+    profiled = []
+
+    def probe(command, **kwargs):
+        profiled.append(command[-1])
+        stdout = json.dumps(
+            {
+                "import_seconds": 0.5,
+                "max_rss": 64 * cli.MIB,
+                "modules": 100,
+                "imports_dagster": command[-1].startswith("dagster."),
+                "imports_scaleway": False,
+            }
+        )
+        return subprocess.CompletedProcess(command, 0, stdout=stdout, stderr="")
+
+    monkeypatch.setattr(subprocess, "run", probe)
+    # Each probe process takes 2s
+    clock = iter(range(0, 1000, 2))
+    monkeypatch.setattr(
+        cli, "time", types.SimpleNamespace(perf_counter=lambda: next(clock))
+    )
+    monkeypatch.setattr(
+        sys,
+        "argv",
+        [
+            "dagster-scaleway",
+            "startup-profile",
+            "--repeat",
+            "1",
+            "--top",
+            "0",
+            "--json",
+        ],
+    )
+
+    with pytest.raises(SystemExit) as exit_info:
+        cli.main()
+
+    assert exit_info.value.code == 0
+    assert profiled == list(cli.STARTUP_PROFILE_MODULES.values())
+    profile = json.loads(capsys.readouterr().out)["dagster_cli"]
+    assert profile == {
+        "module": "dagster._cli",
+        "import_seconds": 0.5,
+        "process_seconds": 2,
+        "max_rss": 64 * cli.MIB,
+        "modules": 100,
+        "imports_dagster": True,
+        "imports_scaleway": False,
+    }
+
+
+def test_startup_profile(capsys):
+    assert cli.startup_profile(["--module", "json", "--repeat", "1", "--json"]) == 0
+
+    profile = json.loads(capsys.readouterr().out)["json"]
+    assert profile["module"] == "json"
+    assert profile["import_seconds"] <= profile["process_seconds"]
+    assert not profile["imports_dagster"]
+
+
+def test_startup_profile_reports_failed_imports(capsys):
+    assert cli.startup_profile(["--module", "missing=not_a_module"]) == 1
+    assert "failed" in capsys.readouterr().out
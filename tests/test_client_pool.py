@@ -0,0 +1,88 @@
+import inspect
+import uuid
+
+import requests
+import scaleway
+import scaleway.jobs.v1alpha1 as scw
+import scaleway_core.api
+
+from dagster_scaleway import client_pool
+from dagster_scaleway.client_pool import PooledJobsV1Alpha1API, ScalewayClientPool
+
+
+def _count_calls(monkeypatch, obj, name: str) -> list:
+    calls = []
+    method = getattr(obj, name)
+
+    def counted(*args, **kwargs):
+        calls.append(args)
+        return method(*args, **kwargs)
+
+    monkeypatch.setattr(obj, name, counted)
+    return calls
+
+
+def test_sdk_request_signature_is_unchanged():
+    # PooledJobsV1Alpha1API overrides this private method of the SDK
+    assert inspect.signature(PooledJobsV1Alpha1API._request) == inspect.signature(
+        scaleway_core.api.API._request
+    )
+    # The session is injected in place of this global of the SDK method
+    assert "requests" in scaleway_core.api.API._request.__code__.co_names
+
+
+def test_requests_go_through_the_shared_session(fake_jobs_api, monkeypatch):
+    pool = ScalewayClientPool()
+    api = pool.get_api("fr-par")
+    sent = _count_calls(monkeypatch, api._session, "request")
+
+    api.list_job_runs()
+    pool.get_api("nl-ams").list_job_runs()
+
+    assert len(sent) == 2
+    assert fake_jobs_api.reset_counts() == {"GET job-runs": 2}
+    pool.close()
+
+
+def test_other_apis_do_not_use_the_session(fake_jobs_api, monkeypatch):
+    pool = ScalewayClientPool()
+    sent = _count_calls(monkeypatch, pool.get_api("fr-par")._session, "request")
+
+    scw.JobsV1Alpha1API(scaleway.Client.from_env()).list_job_runs()
+
+    assert not sent
+    # The SDK module is left untouched
+    assert scaleway_core.api.requests is requests
+    assert fake_jobs_api.reset_counts() == {"GET job-runs": 1}
+    pool.close()
+
+
+def test_credentials_are_checked_once_per_interval(fake_jobs_api, monkeypatch):
+    pool = ScalewayClientPool()
+    checks = _count_calls(monkeypatch, client_pool, "_get_credentials_key")
+
+    api = pool.get_api("fr-par")
+    monkeypatch.setenv("SCW_SECRET_KEY", str(uuid.uuid4()))
+
+    # The change is only picked up by the next check
+    assert pool.get_api("fr-par") is api
+    assert pool.get_api("nl-ams") is not None
+    assert len(checks) == 1
+    pool.close()
+
+
+def test_credentials_change_closes_the_previous_session(fake_jobs_api, monkeypatch):
+    monkeypatch.setattr(client_pool, "CREDENTIALS_CHECK_INTERVAL", 0)
+    pool = ScalewayClientPool()
+    api = pool.get_api("fr-par")
+    closes = _count_calls(monkeypatch, api._session, "close")
+
+    assert pool.get_api("fr-par") is api
+    monkeypatch.setenv("SCW_SECRET_KEY", str(uuid.uuid4()))
+    renewed = pool.get_api("fr-par")
+
+    assert renewed is not api
+    assert renewed._session is not api._session
+    assert len(closes) == 1
+    renewed.list_job_runs()
+    pool.close()
@@ -0,0 +1,141 @@
+import os
+import time
+
+import pytest
+from dagster._core.storage.compute_log_manager import ComputeIOType
+from dagster._core.storage.local_compute_log_manager import IO_TYPE_EXTENSION
+
+from dagster_scaleway import compute_log_manager
+from dagster_scaleway.compute_log_manager import ScalewayComputeLogManager
+
+BUCKET = "logs"
+LOG_KEY = ["run", "compute_logs", "step"]
+STDOUT = ComputeIOType.STDOUT
+
+
+@pytest.fixture
+def make_manager(object_storage, monkeypatch, tmp_path):
+    """Builds managers sharing the fake Object Storage, each with its own local dir."""
+    monkeypatch.setattr(
+        compute_log_manager, "get_object_storage_client", lambda region: object_storage
+    )
+    managers = []
+
+    def make(**config) -> ScalewayComputeLogManager:
+        manager = ScalewayComputeLogManager(
+            BUCKET,
+            prefix="logs/",
+            local_dir=str(tmp_path / str(len(managers))),
+            **config,
+        )
+        managers.append(manager)
+        return manager
+
+    yield make
+    for manager in managers:
+        manager.dispose()
+
+
+def _write(manager: ScalewayComputeLogManager, data: bytes) -> None:
+    path = manager.local_manager.get_captured_local_path(
+        LOG_KEY, IO_TYPE_EXTENSION[STDOUT]
+    )
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "ab") as f:
+        f.write(data)
+
+
+def _chunks(object_storage) -> dict[str, bytes]:
+    return {
+        key.rsplit("/", 1)[1]: data
+        for (_, key), data in sorted(object_storage.objects.items())
+        if "/out/" in key
+    }
+
+
+def test_only_full_chunks_are_uploaded_until_flushed(make_manager, object_storage):
+    manager = make_manager(chunk_size=4)
+    _write(manager, b"0123456789")
+
+    manager._upload_chunks(LOG_KEY, STDOUT, flush=False)
+
+    assert _chunks(object_storage) == {
+        "0000000000000000": b"0123",
+        "0000000000000004": b"4567",
+    }
+
+    _write(manager, b"ab")
+    manager.upload_to_cloud_storage(LOG_KEY, STDOUT)
+
+    assert _chunks(object_storage)["0000000000000008"] == b"89ab"
+    assert (BUCKET, "logs/run/compute_logs/step/out.complete") in object_storage.objects
+    assert manager.cloud_storage_has_logs(LOG_KEY, STDOUT)
+
+
+def test_chunks_are_streamed_while_the_step_runs(
+    make_manager, object_storage, monkeypatch
+):
+    monkeypatch.setattr(compute_log_manager, "CHUNK_POLL_INTERVAL", 0.01)
+    manager = make_manager(chunk_size=4, upload_interval=3600)
+
+    with manager._poll_for_local_upload(LOG_KEY):
+        _write(manager, b"01234")
+        deadline = time.monotonic() + 10
+        while not _chunks(object_storage) and time.monotonic() < deadline:
+            time.sleep(0.01)
+
+        # The partial chunk waits for the upload interval
+        assert _chunks(object_storage) == {"0000000000000000": b"0123"}
+        assert not manager.cloud_storage_has_logs(LOG_KEY, STDOUT)
+    assert manager.cloud_storage_has_logs(LOG_KEY, STDOUT, partial=True)
+
+
+def test_logs_are_read_from_a_cursor_with_ranged_gets(make_manager, object_storage):
+    writer = make_manager(chunk_size=4)
+    _write(writer, b"0123456789abcdef")
+    writer.upload_to_cloud_storage(LOG_KEY, STDOUT)
+    reader = make_manager(chunk_size=4)
+
+    assert reader.log_data_for_type(LOG_KEY, STDOUT, 5, 6) == (b"56789a", 11)
+    assert object_storage.ranges == ["bytes=1-3", "bytes=0-2"]
+    assert reader.log_data_for_type(LOG_KEY, STDOUT, 11, None) == (b"bcdef", 16)
+    # Caught up
+    assert reader.log_data_for_type(LOG_KEY, STDOUT, 16, None) == (None, 16)
+
+
+def test_logs_written_with_larger_chunks_are_read(make_manager):
+    writer = make_manager(chunk_size=8)
+    _write(writer, b"0123456789abcdef")
+    writer.upload_to_cloud_storage(LOG_KEY, STDOUT)
+
+    reader = make_manager(chunk_size=2)
+
+    assert reader.log_data_for_type(LOG_KEY, STDOUT, 4, 4) == (b"4567", 8)
+
+
+def test_logs_are_downloaded_whole(make_manager):
+    writer = make_manager(chunk_size=4)
+    _write(writer, b"0123456789")
+    writer.upload_to_cloud_storage(LOG_KEY, STDOUT)
+    reader = make_manager()
+
+    reader.download_from_cloud_storage(LOG_KEY, STDOUT)
+
+    path = reader.local_manager.get_captured_local_path(
+        LOG_KEY, IO_TYPE_EXTENSION[STDOUT]
+    )
+    with open(path, "rb") as f:
+        assert f.read() == b"0123456789"
+
+
+def test_logs_are_deleted_in_batches(make_manager, object_storage, monkeypatch):
+    monkeypatch.setattr(compute_log_manager, "DELETE_BATCH_SIZE", 2)
+    manager = make_manager(chunk_size=1)
+    _write(manager, b"abc")
+    manager.upload_to_cloud_storage(LOG_KEY, STDOUT)
+    object_storage.put_object(Bucket=BUCKET, Key="logs/run-2/step/out/0", Body=b"")
+
+    manager.delete_logs(prefix=["run"])
+
+    assert object_storage.delete_batches == [2, 2]
+    assert list(object_storage.objects) == [(BUCKET, "logs/run-2/step/out/0")]
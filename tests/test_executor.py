@@ -0,0 +1,58 @@
+from types import SimpleNamespace
+
+import pytest
+import scaleway.jobs.v1alpha1 as scw
+
+from dagster_scaleway.executor import ScalewayServerlessStepHandler
+
+STEP_KEY = "op_0"
+
+
+@pytest.fixture
+def step_handler(make_launcher):
+    return ScalewayServerlessStepHandler(make_launcher(job_run_cache_ttl=0), {})
+
+
+@pytest.fixture
+def step_handler_context(create_run):
+    """The parts of a StepHandlerContext the health checks use."""
+    return SimpleNamespace(
+        dagster_run=create_run(),
+        execute_step_args=SimpleNamespace(
+            step_keys_to_execute=[STEP_KEY], known_state=None
+        ),
+        step_tags={STEP_KEY: {}},
+    )
+
+
+def _start_step_job_run(step_handler, step_handler_context, start_job_run):
+    job_run = start_job_run()
+    step_handler._job_run_ids[
+        step_handler._get_step_attempt_key(step_handler_context)
+    ] = job_run.id
+    return job_run
+
+
+def test_running_step_is_healthy(step_handler, step_handler_context, start_job_run):
+    _start_step_job_run(step_handler, step_handler_context, start_job_run)
+
+    assert step_handler.check_step_health(step_handler_context).is_healthy
+
+
+def test_unknown_step_is_unhealthy(step_handler, step_handler_context):
+    result = step_handler.check_step_health(step_handler_context)
+
+    assert not result.is_healthy
+    assert "could not be found" in result.unhealthy_reason
+
+
+def test_canceled_step_is_unhealthy(
+    step_handler, step_handler_context, start_job_run, jobs_api
+):
+    job_run = _start_step_job_run(step_handler, step_handler_context, start_job_run)
+    jobs_api.stop_job_run(job_run_id=job_run.id)
+
+    result = step_handler.check_step_health(step_handler_context)
+
+    assert not result.is_healthy
+    assert str(scw.JobRunState.CANCELED) in result.unhealthy_reason
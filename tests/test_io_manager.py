@@ -0,0 +1,148 @@
+import pickle
+
+import pytest
+from dagster import (
+    AssetIn,
+    MultiPartitionKey,
+    MultiPartitionsDefinition,
+    StaticPartitionsDefinition,
+    asset,
+    materialize,
+)
+
+from dagster_scaleway import io_manager
+from dagster_scaleway.io_manager import (
+    PARQUET_CONTENT_TYPE,
+    PICKLE_CONTENT_TYPE,
+    ScalewayObjectStorageIOManager,
+)
+
+pytest.importorskip("boto3")
+
+BUCKET = "dagster"
+
+
+@pytest.fixture
+def materialize_with(object_storage, monkeypatch):
+    """Materializes assets with an IO manager storing them in the fake Object Storage."""
+    monkeypatch.setattr(
+        io_manager, "get_object_storage_client", lambda region: object_storage
+    )
+
+    def run(assets, partition_key=None, **config):
+        manager = ScalewayObjectStorageIOManager(
+            bucket=BUCKET, prefix="data/", **config
+        )
+        result = materialize(
+            assets, resources={"io_manager": manager}, partition_key=partition_key
+        )
+        assert result.success
+        return result
+
+    return run
+
+
+@asset
+def upstream():
+    return {"a": [1, 2, 3]}
+
+
+@asset
+def downstream(upstream):
+    assert upstream == {"a": [1, 2, 3]}
+    return len(upstream["a"])
+
+
+def test_objects_are_pickled(materialize_with, object_storage):
+    result = materialize_with([upstream, downstream])
+
+    key = (BUCKET, "data/upstream")
+    assert pickle.loads(object_storage.objects[key]) == {"a": [1, 2, 3]}
+    assert object_storage.content_types[key] == PICKLE_CONTENT_TYPE
+    (materialization,) = result.asset_materializations_for_node("upstream")
+    assert materialization.metadata["uri"].path == "s3://dagster/data/upstream"
+    assert materialization.metadata["size_bytes"].value == len(
+        object_storage.objects[key]
+    )
+
+
+def test_objects_above_the_multipart_threshold_round_trip(
+    materialize_with, object_storage
+):
+    materialize_with([upstream, downstream], multipart_threshold=16)
+
+    assert pickle.loads(object_storage.objects[BUCKET, "data/upstream"])
+
+
+partitions = MultiPartitionsDefinition(
+    {
+        "date": StaticPartitionsDefinition(["2024-01-01"]),
+        "color": StaticPartitionsDefinition(["red", "blue"]),
+    }
+)
+
+
+@asset(partitions_def=partitions)
+def partitioned(context):
+    return context.partition_key.keys_by_dimension["color"]
+
+
+@asset
+def merged(partitioned):
+    return partitioned
+
+
+def test_partitions_are_stored_under_their_dimension_keys(
+    materialize_with, object_storage
+):
+    for color in ("red", "blue"):
+        materialize_with(
+            [partitioned],
+            partition_key=MultiPartitionKey({"date": "2024-01-01", "color": color}),
+        )
+
+    assert sorted(key for _, key in object_storage.objects) == [
+        # Dimensions are sorted by name
+        "data/partitioned/blue/2024-01-01",
+        "data/partitioned/red/2024-01-01",
+    ]
+
+    result = materialize_with([partitioned.to_source_asset(), merged])
+
+    assert result.output_for_node("merged") == {
+        MultiPartitionKey({"date": "2024-01-01", "color": "red"}): "red",
+        MultiPartitionKey({"date": "2024-01-01", "color": "blue"}): "blue",
+    }
+
+
+def test_tables_are_stored_as_parquet(materialize_with, object_storage):
+    pa = pytest.importorskip("pyarrow")
+    table = pa.table({"a": list(range(1000)), "b": ["x"] * 1000})
+
+    @asset
+    def table_asset() -> pa.Table:
+        return table
+
+    @asset(ins={"table_asset": AssetIn(metadata={"columns": ["a"]})})
+    def projected(table_asset: pa.Table) -> int:
+        assert table_asset.column_names == ["a"]
+        return table_asset.num_rows
+
+    @asset
+    def whole(table_asset: pa.Table) -> int:
+        assert table_asset.equals(table)
+        return table_asset.num_rows
+
+    result = materialize_with(
+        [table_asset, projected, whole], parquet_row_group_size=100
+    )
+
+    key = (BUCKET, "data/table_asset")
+    assert object_storage.content_types[key] == PARQUET_CONTENT_TYPE
+    parquet = pa.parquet.ParquetFile(pa.BufferReader(object_storage.objects[key]))
+    assert parquet.metadata.num_row_groups == 10
+    (materialization,) = result.asset_materializations_for_node("table_asset")
+    assert materialization.metadata["row_count"].value == 1000
+    assert result.output_for_node("projected") == result.output_for_node("whole")
+    # The projection fetched byte ranges instead of the whole object
+    assert object_storage.ranges
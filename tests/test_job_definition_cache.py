@@ -0,0 +1,101 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+import scaleway.jobs.v1alpha1 as scw
+from dagster._core.launcher import LaunchRunContext
+
+from benchmarks.fake_jobs_api import FAKE_PROJECT_ID, FakeJobsApiConfig
+from dagster_scaleway import serverless_job_launcher
+from dagster_scaleway.job_definition_cache import JobDefinitionCache
+
+SCOPE = ("fr-par", FAKE_PROJECT_ID)
+
+
+def _job_def(name: str) -> scw.JobDefinition:
+    return scw.JobDefinition(
+        id=name,
+        name=name,
+        created_at=None,
+        updated_at=None,
+        cpu_limit=1000,
+        memory_limit=2048,
+        image_uri="",
+        command="",
+        project_id=FAKE_PROJECT_ID,
+        environment_variables={},
+        description="",
+        job_timeout=None,
+        cron_schedule=None,
+        local_storage_capacity=0,
+        region="fr-par",
+    )
+
+
+def _complete(cache: JobDefinitionCache, *names: str) -> None:
+    generation = cache.generation(SCOPE)
+    for name in names:
+        cache.put(SCOPE, _job_def(name))
+    cache.mark_complete(SCOPE, generation, names)
+
+
+def test_names_missing_from_a_complete_listing_do_not_exist():
+    cache = JobDefinitionCache()
+    _complete(cache, "a", "b")
+
+    assert cache.lookup(SCOPE, "a") == (True, _job_def("a"))
+    assert cache.lookup(SCOPE, "c") == (True, None)
+    assert cache.lookup(("nl-ams", FAKE_PROJECT_ID), "c") == (False, None)
+
+
+def test_listing_stays_complete_when_names_are_evicted():
+    cache = JobDefinitionCache(max_size=2)
+    _complete(cache, "a", "b", "c")
+
+    # Evicted, but known to exist
+    assert cache.lookup(SCOPE, "a") == (False, None)
+    assert cache.lookup(SCOPE, "d") == (True, None)
+
+    cache.put(SCOPE, _job_def("d"))
+    cache.put(SCOPE, _job_def("e"))
+    cache.put(SCOPE, _job_def("f"))
+    assert cache.lookup(SCOPE, "d") == (False, None)
+
+
+def test_invalidated_names_are_listed_again():
+    cache = JobDefinitionCache()
+    _complete(cache, "a")
+    generation = cache.generation(SCOPE)
+
+    cache.invalidate(SCOPE, "a")
+    cache.mark_complete(SCOPE, generation, ["a"])
+
+    assert cache.lookup(SCOPE, "b") == (False, None)
+
+
+@pytest.mark.parametrize(
+    "fake_jobs_api_config", [FakeJobsApiConfig(job_definitions=250)]
+)
+def test_concurrent_launches_list_and_create_a_definition_once(
+    fake_jobs_api, make_launcher, create_run
+):
+    # Fewer entries than definitions in the project
+    launcher = make_launcher(job_definition_cache_size=100)
+    runs = [create_run(op_selection=[f"op_{i % 2}"]) for i in range(16)]
+    fake_jobs_api.reset_counts()
+
+    with ThreadPoolExecutor(max_workers=len(runs)) as executor:
+        list(
+            executor.map(
+                lambda run: launcher.launch_run(
+                    LaunchRunContext(dagster_run=run, workspace=None)
+                ),
+                runs,
+            )
+        )
+
+    pages = -(-250 // serverless_job_launcher.JOB_DEFINITIONS_PAGE_SIZE)
+    assert fake_jobs_api.reset_counts() == {
+        "GET job-definitions": pages,
+        "POST job-definitions": 2,
+        "POST job-definitions/{id}/start": 16,
+    }
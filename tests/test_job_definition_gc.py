@@ -0,0 +1,105 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from benchmarks.fake_jobs_api import FAKE_PROJECT_ID
+from dagster_scaleway import job_definition_gc
+from dagster_scaleway.job_definition_gc import (
+    JOB_DEFINITION_DESCRIPTION_MARKER,
+    collect_job_definitions,
+)
+
+MAX_AGE = timedelta(days=1)
+LONG_AGO = datetime.now(timezone.utc) - timedelta(days=3)
+
+
+@pytest.fixture(autouse=True)
+def small_pages(monkeypatch):
+    monkeypatch.setattr(job_definition_gc, "GC_PAGE_SIZE", 2)
+
+
+@pytest.fixture
+def create_job_definition(fake_jobs_api, jobs_api):
+    def create(name: str, updated_at: datetime = LONG_AGO, marked: bool = True):
+        job_def = jobs_api.create_job_definition(
+            name=name,
+            description=f"JobDefinition for {name}. "
+            + (JOB_DEFINITION_DESCRIPTION_MARKER if marked else ""),
+            cpu_limit=1000,
+            memory_limit=2048,
+            image_uri="rg.fr-par.scw.cloud/test/test:latest",
+            command="true",
+            project_id=FAKE_PROJECT_ID,
+        )
+        fake_jobs_api._job_definitions[job_def.id].update(
+            created_at=updated_at.isoformat(), updated_at=updated_at.isoformat()
+        )
+        return job_def
+
+    return create
+
+
+@pytest.fixture
+def start_job_run(fake_jobs_api, jobs_api):
+    def start(job_def, created_at: datetime = LONG_AGO, state: str = "succeeded"):
+        job_run = jobs_api.start_job_definition(job_definition_id=job_def.id).job_runs[
+            0
+        ]
+        fake_jobs_api._job_runs[job_run.id].update(
+            created_at=created_at.isoformat(), state=state
+        )
+        return job_run
+
+    return start
+
+
+def _collect(jobs_api, **kwargs):
+    return collect_job_definitions(
+        jobs_api, region="fr-par", project_id=FAKE_PROJECT_ID, max_age=MAX_AGE, **kwargs
+    )
+
+
+def test_deletes_stale_job_definitions(
+    fake_jobs_api, jobs_api, create_job_definition, start_job_run
+):
+    stale = create_job_definition("stale")
+    start_job_run(stale)
+    recently_updated = create_job_definition(
+        "recently-updated", updated_at=datetime.now(timezone.utc)
+    )
+    recently_run = create_job_definition("recently-run")
+    start_job_run(recently_run, created_at=datetime.now(timezone.utc))
+    create_job_definition("not-from-the-launcher", marked=False)
+
+    report = _collect(jobs_api)
+
+    assert [job_def.id for job_def in report.deleted] == [stale.id]
+    assert report.kept == 2
+    assert stale.id not in fake_jobs_api._job_definitions
+    assert recently_updated.id in fake_jobs_api._job_definitions
+
+
+def test_dry_run_deletes_nothing(fake_jobs_api, jobs_api, create_job_definition):
+    stale = create_job_definition("stale")
+
+    report = _collect(jobs_api, dry_run=True)
+
+    assert [job_def.id for job_def in report.deleted] == [stale.id]
+    assert stale.id in fake_jobs_api._job_definitions
+
+
+@pytest.mark.parametrize("state", ["queued", "scheduled", "running"])
+def test_keeps_job_definitions_of_old_job_runs_in_progress(
+    fake_jobs_api, jobs_api, create_job_definition, start_job_run, state
+):
+    in_progress = create_job_definition("in-progress")
+    start_job_run(in_progress, created_at=LONG_AGO - timedelta(hours=1), state=state)
+    finished = create_job_definition("finished")
+    # Newer finished job runs push the one in progress to the second page
+    for _ in range(3):
+        start_job_run(finished)
+
+    report = _collect(jobs_api)
+
+    assert [job_def.id for job_def in report.deleted] == [finished.id]
+    assert in_progress.id in fake_jobs_api._job_definitions
@@ -0,0 +1,130 @@
+import threading
+
+import pytest
+import scaleway.jobs.v1alpha1 as scw
+
+from benchmarks.fake_jobs_api import FAKE_PROJECT_ID, FakeJobsApiConfig
+from dagster_scaleway import job_run_cache
+from dagster_scaleway.job_run_cache import JobRunStateCache
+
+SCOPE = ("fr-par", FAKE_PROJECT_ID)
+
+LIST = "GET job-runs"
+GET = "GET job-runs/{id}"
+
+
+class BlockingListApi:
+    """Jobs API whose `list_job_runs` calls wait for `release`."""
+
+    def __init__(self, api: scw.JobsV1Alpha1API):
+        self._api = api
+        self.listing = threading.Event()
+        self.release = threading.Event()
+
+    def list_job_runs(self, **kwargs):
+        self.listing.set()
+        assert self.release.wait(10)
+        return self._api.list_job_runs(**kwargs)
+
+    def __getattr__(self, name):
+        return getattr(self._api, name)
+
+
+def test_refreshes_tracked_job_runs_together(fake_jobs_api, jobs_api, start_job_run):
+    cache = JobRunStateCache(ttl=60)
+    job_runs = [start_job_run() for _ in range(3)]
+    for job_run in job_runs:
+        cache.track(SCOPE, job_run)
+    fake_jobs_api.reset_counts()
+
+    for job_run in job_runs:
+        assert cache.get(jobs_api, SCOPE, job_run.id).id == job_run.id
+    assert cache.count_active(jobs_api, SCOPE) == 3
+
+    assert fake_jobs_api.reset_counts() == {LIST: 1}
+
+
+def test_refresh_stops_when_last_tracked_job_run_is_on_a_full_page(
+    fake_jobs_api, jobs_api, start_job_run, monkeypatch
+):
+    monkeypatch.setattr(job_run_cache, "JOB_RUNS_PAGE_SIZE", 2)
+    job_runs = [start_job_run() for _ in range(5)]
+    cache = JobRunStateCache(ttl=0)
+    # The newest job run, on the first of three full pages
+    cache.track(SCOPE, job_runs[-1])
+    fake_jobs_api.reset_counts()
+
+    assert cache.count_active(jobs_api, SCOPE) == 1
+    assert fake_jobs_api.reset_counts() == {LIST: 1}
+
+
+def test_refresh_pages_until_tracked_job_runs_are_found(
+    fake_jobs_api, jobs_api, start_job_run, monkeypatch
+):
+    monkeypatch.setattr(job_run_cache, "JOB_RUNS_PAGE_SIZE", 2)
+    job_runs = [start_job_run() for _ in range(5)]
+    cache = JobRunStateCache(ttl=0)
+    cache.track(SCOPE, job_runs[0])
+    fake_jobs_api.reset_counts()
+
+    assert cache.count_active(jobs_api, SCOPE) == 1
+    assert fake_jobs_api.reset_counts() == {LIST: 3}
+
+
+@pytest.mark.parametrize("fake_jobs_api_config", [FakeJobsApiConfig(run_time=0)])
+def test_finished_job_runs_are_no_longer_tracked(
+    fake_jobs_api, jobs_api, start_job_run
+):
+    cache = JobRunStateCache(ttl=0)
+    job_run = start_job_run()
+    cache.track(SCOPE, job_run)
+
+    assert cache.count_active(jobs_api, SCOPE) == 0
+    assert cache.get(jobs_api, SCOPE, job_run.id).state == scw.JobRunState.SUCCEEDED
+
+
+def test_get_many_lists_unknown_job_runs(fake_jobs_api, jobs_api, start_job_run):
+    job_runs = [start_job_run() for _ in range(3)]
+    cache = JobRunStateCache(ttl=60)
+    fake_jobs_api.reset_counts()
+
+    found = cache.get_many(jobs_api, SCOPE, [job_run.id for job_run in job_runs])
+
+    assert set(found) == {job_run.id for job_run in job_runs}
+    assert fake_jobs_api.reset_counts() == {LIST: 1}
+
+
+def test_get_fetches_unknown_job_runs_individually(
+    fake_jobs_api, jobs_api, start_job_run
+):
+    job_run = start_job_run()
+    cache = JobRunStateCache(ttl=60)
+    fake_jobs_api.reset_counts()
+
+    assert cache.get(jobs_api, SCOPE, job_run.id).id == job_run.id
+    assert cache.get(jobs_api, SCOPE, job_run.id).id == job_run.id
+    # Then kept up to date with the other tracked job runs
+    assert fake_jobs_api.reset_counts()[GET] == 1
+
+
+def test_refresh_does_not_block_readers(fake_jobs_api, jobs_api, start_job_run):
+    job_runs = [start_job_run() for _ in range(2)]
+    cache = JobRunStateCache(ttl=0)
+    for job_run in job_runs:
+        cache.track(SCOPE, job_run)
+    api = BlockingListApi(jobs_api)
+
+    refresh = threading.Thread(target=cache.count_active, args=(api, SCOPE))
+    refresh.start()
+    try:
+        assert api.listing.wait(10)
+        # Served from the cache while the other thread waits for the listing
+        assert cache.get(api, SCOPE, job_runs[0].id).id == job_runs[0].id
+        assert cache.count_queued(api, SCOPE) == 2
+        cache.track(SCOPE, start_job_run())
+    finally:
+        api.release.set()
+        refresh.join(10)
+
+    assert not refresh.is_alive()
+    assert cache.count_active(jobs_api, SCOPE) == 3
@@ -0,0 +1,144 @@
+import json
+
+import requests
+import scaleway
+from dagster import DagsterRunStatus
+from dagster._core.launcher import LaunchRunContext
+
+from dagster_scaleway.serverless_job_context import SCALEWAY_CONFIG_TAG
+from dagster_scaleway.serverless_job_launcher import SERVERLESS_JOBS_RUN_ID
+
+REGIONS = [{"region": "fr-par"}, {"region": "nl-ams"}]
+
+
+def _contexts(runs):
+    return [LaunchRunContext(dagster_run=run, workspace=None) for run in runs]
+
+
+def _launching(launcher) -> int:
+    return sum(stats.launching for stats in launcher._placer._stats.values())
+
+
+def _not_found() -> scaleway.ScalewayException:
+    response = requests.Response()
+    response.status_code = 404
+    response._content = b'{"message": "Job definition not found"}'
+    return scaleway.ScalewayException(response)
+
+
+def test_launch_runs_starts_a_job_run_per_run(make_launcher, create_run, instance):
+    launcher = make_launcher()
+    runs = [create_run(op_selection=[f"op_{i % 2}"]) for i in range(4)]
+
+    launcher.launch_runs(_contexts(runs))
+
+    job_run_ids = {
+        instance.get_run_by_id(run.run_id).tags.get(SERVERLESS_JOBS_RUN_ID)
+        for run in runs
+    }
+    assert len(job_run_ids) == 4 and None not in job_run_ids
+
+
+def test_launch_runs_starts_each_run_with_its_own_spec(
+    make_launcher, create_run, instance, fake_jobs_api
+):
+    launcher = make_launcher()
+    runs = [
+        create_run(
+            op_selection=["op_0"],
+            tags={SCALEWAY_CONFIG_TAG: json.dumps({"cpu_limit": cpu_limit})},
+        )
+        for cpu_limit in (1000, 4000, 1000)
+    ]
+
+    launcher.launch_runs(_contexts(runs))
+
+    job_runs = [
+        fake_jobs_api._job_runs[
+            instance.get_run_by_id(run.run_id).tags[SERVERLESS_JOBS_RUN_ID]
+        ]
+        for run in runs
+    ]
+    assert [job_run["cpu_limit"] for job_run in job_runs] == [1000, 4000, 1000]
+    assert fake_jobs_api.request_counts["POST job-definitions"] == 2
+
+
+def test_launch_runs_fails_only_the_run_that_cannot_be_resolved(
+    make_launcher, create_run, instance, monkeypatch
+):
+    launcher = make_launcher(regions=REGIONS)
+    runs = [create_run() for _ in range(3)]
+    get_command = launcher._get_execute_run_command
+
+    def get_failing_command(context):
+        if context.dagster_run.run_id == runs[1].run_id:
+            raise RuntimeError("Unresolvable")
+        return get_command(context)
+
+    monkeypatch.setattr(launcher, "_get_execute_run_command", get_failing_command)
+
+    launcher.launch_runs(_contexts(runs))
+
+    assert instance.get_run_by_id(runs[1].run_id).status == DagsterRunStatus.FAILURE
+    for run in (runs[0], runs[2]):
+        assert SERVERLESS_JOBS_RUN_ID in instance.get_run_by_id(run.run_id).tags
+    assert _launching(launcher) == 0
+
+
+def test_launch_runs_releases_the_placement_of_failed_runs(
+    make_launcher, create_run, instance, monkeypatch
+):
+    launcher = make_launcher(regions=REGIONS)
+    runs = [create_run() for _ in range(2)]
+    get_spec = launcher._get_job_definition_spec
+
+    def get_failing_spec(run, *args):
+        if run.run_id == runs[0].run_id:
+            raise RuntimeError("Invalid spec")
+        return get_spec(run, *args)
+
+    monkeypatch.setattr(launcher, "_get_job_definition_spec", get_failing_spec)
+
+    launcher.launch_runs(_contexts(runs))
+
+    assert instance.get_run_by_id(runs[0].run_id).status == DagsterRunStatus.FAILURE
+    assert SERVERLESS_JOBS_RUN_ID in instance.get_run_by_id(runs[1].run_id).tags
+    assert _launching(launcher) == 0
+
+
+def test_launch_runs_reports_a_fallback_launch_once(
+    make_launcher, create_run, instance, monkeypatch
+):
+    launcher = make_launcher(report_launch_metrics=True)
+    run = create_run()
+    start = launcher._start_job_definition
+    calls = []
+
+    def start_deleted_once(*args):
+        calls.append(args)
+        if len(calls) == 1:
+            raise _not_found()
+        return start(*args)
+
+    monkeypatch.setattr(launcher, "_start_job_definition", start_deleted_once)
+    reports = []
+    report = launcher._report_launch_metrics
+    monkeypatch.setattr(
+        launcher,
+        "_report_launch_metrics",
+        lambda run: reports.append(run) or report(run),
+    )
+
+    launcher.launch_runs(_contexts([run]))
+
+    assert len(calls) == 2
+    assert len(reports) == 1
+    assert SERVERLESS_JOBS_RUN_ID in instance.get_run_by_id(run.run_id).tags
+    timings = [
+        entry
+        for entry in instance.all_logs(run.run_id)
+        if "Launch timings" in entry.message
+    ]
+    assert len(timings) == 1
+    metadata = timings[0].dagster_event.engine_event_data.metadata
+    assert "launch (s)" in metadata
@@ -0,0 +1,53 @@
+import json
+import subprocess
+import sys
+
+import pytest
+
+import dagster_scaleway
+
+HEAVY_MODULES = ("dagster", "scaleway", "boto3", "dagster_scaleway.memoization")
+
+
+def _loaded_by(module: str) -> set[str]:
+    """The heavy modules loaded by importing `module` in a fresh interpreter."""
+    output = subprocess.check_output(
+        [
+            sys.executable,
+            "-c",
+            f"import json, sys, {module}; "
+            f"print(json.dumps([m for m in {HEAVY_MODULES!r} if m in sys.modules]))",
+        ],
+        timeout=60,
+    )
+    return set(json.loads(output))
+
+
+@pytest.mark.parametrize(
+    "module, expected",
+    [
+        ("dagster_scaleway", set()),
+        # The wrapper starts every job run
+        ("dagster_scaleway.cli", set()),
+        ("dagster_scaleway.io_manager", {"dagster"}),
+        ("dagster_scaleway.compute_log_manager", {"dagster"}),
+        ("dagster_scaleway.payload_store", {"dagster"}),
+        ("dagster_scaleway.serverless_job_launcher", {"dagster", "scaleway"}),
+    ],
+)
+def test_components_only_import_what_they_use(module, expected):
+    assert _loaded_by(module) == expected
+
+
+def test_exports_are_resolved_on_access():
+    from dagster_scaleway.io_manager import ScalewayObjectStorageIOManager
+
+    assert set(dagster_scaleway.__all__) <= set(dir(dagster_scaleway))
+    assert (
+        dagster_scaleway.ScalewayObjectStorageIOManager
+        is ScalewayObjectStorageIOManager
+    )
+    for name in dagster_scaleway.__all__:
+        assert getattr(dagster_scaleway, name) is not None
+    with pytest.raises(AttributeError, match="no attribute 'missing'"):
+        dagster_scaleway.missing  # noqa: B018
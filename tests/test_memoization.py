@@ -0,0 +1,131 @@
+from typing import Iterator
+
+import pytest
+from dagster import AssetKey, DagsterRunStatus, Definitions, asset, materialize
+from dagster._core.launcher import LaunchRunContext
+from dagster._core.test_utils import in_process_test_workspace
+from dagster._core.types.loadable_target_origin import LoadableTargetOrigin
+from dagster._core.workspace.context import WorkspaceRequestContext
+
+from dagster_scaleway.memoization import MEMOIZED_TAG, get_launch_reason
+
+ASSET_JOB = "__ASSET_JOB"
+
+
+@asset(code_version="1")
+def upstream():
+    return 1
+
+
+@asset(code_version="1")
+def downstream(upstream):
+    return upstream + 1
+
+
+@asset(name="upstream", code_version="2")
+def changed_upstream():
+    return 2
+
+
+@asset
+def unversioned():
+    return 0
+
+
+defs = Definitions(assets=[upstream, downstream, unversioned])
+
+
+@pytest.fixture
+def workspace(instance) -> Iterator[WorkspaceRequestContext]:
+    with in_process_test_workspace(
+        instance, LoadableTargetOrigin(python_file=__file__, attribute="defs")
+    ) as workspace:
+        yield workspace
+
+
+@pytest.fixture
+def create_asset_run(instance, workspace):
+    """Creates runs of the asset job, with the origin memoization resolves them from."""
+    (code_location,) = workspace.code_locations
+    external_job = code_location.get_repository("__repository__").get_full_external_job(
+        ASSET_JOB
+    )
+
+    def create(*asset_names: str, **kwargs):
+        return instance.create_run_for_job(
+            job_def=defs.get_implicit_global_asset_job_def(),
+            asset_selection={AssetKey(name) for name in asset_names},
+            external_job_origin=external_job.get_external_origin(),
+            **kwargs,
+        )
+
+    return create
+
+
+def _materialize(instance, *assets):
+    assert materialize(assets, instance=instance).success
+
+
+def test_fresh_assets_need_no_launch(instance, workspace, create_asset_run):
+    _materialize(instance, upstream, downstream)
+
+    assert (
+        get_launch_reason(instance, workspace, create_asset_run("downstream")) is None
+    )
+
+
+def test_stale_assets_are_launched(instance, workspace, create_asset_run):
+    _materialize(instance, upstream, downstream)
+    # A new data version of upstream
+    _materialize(instance, changed_upstream)
+
+    reason = get_launch_reason(instance, workspace, create_asset_run("downstream"))
+
+    assert reason.startswith("downstream is stale, upstream ")
+
+
+@pytest.mark.parametrize(
+    "assets, kwargs, expected",
+    [
+        (
+            ("upstream",),
+            {"parent_run_id": "parent", "root_run_id": "parent"},
+            "it is a re-execution",
+        ),
+        (("unversioned",), {}, "unversioned has no code version"),
+        (
+            ("upstream",),
+            {},
+            "upstream has no materialization with code version 1",
+        ),
+    ],
+)
+def test_launch_reasons(
+    instance, workspace, create_asset_run, assets, kwargs, expected
+):
+    assert (
+        get_launch_reason(instance, workspace, create_asset_run(*assets, **kwargs))
+        == expected
+    )
+
+
+def test_runs_without_a_code_location_are_launched(instance, create_asset_run):
+    assert (
+        get_launch_reason(instance, None, create_asset_run("upstream"))
+        == "its code location is not known"
+    )
+
+
+def test_memoized_runs_are_not_launched(
+    make_launcher, instance, workspace, create_asset_run, fake_jobs_api
+):
+    _materialize(instance, upstream, downstream)
+    launcher = make_launcher(skip_memoized_runs=True)
+    run = create_asset_run("upstream", "downstream")
+
+    launcher.launch_run(LaunchRunContext(dagster_run=run, workspace=workspace))
+
+    run = instance.get_run_by_id(run.run_id)
+    assert run.status == DagsterRunStatus.SUCCESS
+    assert run.tags[MEMOIZED_TAG] == "true"
+    assert not fake_jobs_api._job_runs
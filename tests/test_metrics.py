@@ -0,0 +1,139 @@
+import threading
+
+import pytest
+from dagster._core.launcher import LaunchRunContext
+
+from dagster_scaleway.metrics import (
+    API_ERRORS,
+    API_REQUESTS,
+    LAUNCH_SPAN_DURATION,
+    LaunchMetrics,
+    MetricsSink,
+    PrometheusTextfileMetricsSink,
+    get_api_operation,
+)
+
+
+class ListSink(MetricsSink):
+    def __init__(self):
+        self.metrics = []
+
+    def increment(self, name, value, tags):
+        self.metrics.append(("increment", name, value, dict(tags)))
+
+    def observe(self, name, value, tags):
+        self.metrics.append(("observe", name, value, dict(tags)))
+
+
+class FailingSink(MetricsSink):
+    def increment(self, name, value, tags):
+        raise RuntimeError("Unreachable collector")
+
+    observe = increment
+
+
+@pytest.mark.parametrize(
+    "method, path, expected",
+    [
+        (
+            "POST",
+            "/serverless-jobs/v1alpha1/regions/fr-par/job-definitions/"
+            "0b9e3c6e-2f9a-4f8e-9d3b-8f2c1a7e5d4c/start",
+            ("fr-par", "POST job-definitions/{id}/start"),
+        ),
+        (
+            "GET",
+            "/serverless-jobs/v1alpha1/regions/nl-ams/job-runs",
+            ("nl-ams", "GET job-runs"),
+        ),
+        ("GET", "/account/v3/projects", ("", "GET /account/v3/projects")),
+    ],
+)
+def test_api_operations_have_a_low_cardinality(method, path, expected):
+    assert get_api_operation(method, path) == expected
+
+
+def test_api_requests_are_counted_by_operation_and_status():
+    sink = ListSink()
+
+    LaunchMetrics(sink).api_request(
+        "POST",
+        "/serverless-jobs/v1alpha1/regions/fr-par/job-definitions",
+        "429",
+        0.5,
+        retries=0,
+        waited=0,
+    )
+
+    tags = {"region": "fr-par", "operation": "POST job-definitions"}
+    assert ("increment", API_REQUESTS, 1, {**tags, "status": "429"}) in sink.metrics
+    assert ("increment", API_ERRORS, 1, {**tags, "status": "429"}) in sink.metrics
+
+
+def test_sink_failures_do_not_fail_the_caller(caplog):
+    metrics = LaunchMetrics(FailingSink())
+
+    with metrics.span("launch", "fr-par"):
+        pass
+
+    assert "Failed to record metric" in caplog.text
+
+
+def test_spans_are_collected_per_thread():
+    metrics = LaunchMetrics()
+    metrics.start_spans()
+    metrics.record_span("launch", "fr-par", 1.0)
+    metrics.record_span("launch", "fr-par", 0.5)
+
+    other = threading.Thread(target=metrics.record_span, args=("other", None, 1.0))
+    other.start()
+    other.join()
+
+    assert metrics.collect_spans() == {"launch": 1.5}
+    assert metrics.collect_spans() == {}
+
+
+def test_prometheus_textfile(tmp_path):
+    path = tmp_path / "metrics.prom"
+    sink = PrometheusTextfileMetricsSink(str(path), flush_interval=3600)
+
+    sink.increment(API_REQUESTS, 1, {"operation": 'GET "quoted"', "region": "fr-par"})
+    sink.increment(API_REQUESTS, 2, {"operation": 'GET "quoted"', "region": "fr-par"})
+    sink.observe(LAUNCH_SPAN_DURATION, 0.25, {"span": "launch"})
+    sink.observe(LAUNCH_SPAN_DURATION, 0.5, {"span": "launch"})
+    sink.flush()
+
+    lines = path.read_text().splitlines()
+    assert f"# TYPE {API_REQUESTS} counter" in lines
+    assert f'{API_REQUESTS}{{operation="GET \\"quoted\\"",region="fr-par"}} 3' in lines
+    assert f"# TYPE {LAUNCH_SPAN_DURATION} summary" in lines
+    assert f'{LAUNCH_SPAN_DURATION}_sum{{span="launch"}} 0.750000' in lines
+    assert f'{LAUNCH_SPAN_DURATION}_count{{span="launch"}} 2' in lines
+    assert list(tmp_path.iterdir()) == [path]
+
+
+def test_launches_are_measured(make_launcher, create_run, instance, tmp_path):
+    path = tmp_path / "metrics.prom"
+    launcher = make_launcher(
+        metrics_sink={
+            "module": "dagster_scaleway.metrics",
+            "class": "PrometheusTextfileMetricsSink",
+            "config": {"path": str(path), "flush_interval": 0},
+        },
+        report_launch_metrics=True,
+    )
+    run = create_run()
+
+    launcher.launch_run(LaunchRunContext(dagster_run=run, workspace=None))
+
+    assert (
+        f'{API_REQUESTS}{{operation="POST job-definitions/{{id}}/start",'
+        'region="fr-par",status="200"} 1'
+    ) in path.read_text().splitlines()
+    timings = [
+        entry.dagster_event.engine_event_data.metadata
+        for entry in instance.all_logs(run.run_id)
+        if "Launch timings" in entry.message
+    ]
+    assert len(timings) == 1
+    assert "start_job_definition (s)" in timings[0]
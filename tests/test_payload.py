@@ -0,0 +1,122 @@
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Iterator
+
+import pytest
+from dagster._core.launcher import LaunchRunContext
+
+from dagster_scaleway.payload import (
+    COMPRESSED_PAYLOAD_PREFIX,
+    URL_PAYLOAD_PREFIX,
+    compress_payload,
+    decode_payload,
+    encode_compressed_payload,
+    encode_payload_url,
+)
+from dagster_scaleway.payload_store import PayloadStore
+from dagster_scaleway.serverless_job_launcher import SERVERLESS_JOBS_RUN_ID
+
+PAYLOAD = '{"__class__": "ExecuteRunArgs", "run_id": "' + "x" * 4000 + '"}'
+
+
+class HttpPayloadStore(PayloadStore):
+    """Serves the stored payloads over plain HTTP, like presigned URLs."""
+
+    def __init__(self):
+        self.payloads: dict[str, bytes] = {}
+        store = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                data = store.payloads.get(self.path.lstrip("/"))
+                self.send_response(200 if data is not None else 404)
+                self.send_header("Content-Length", str(len(data or b"")))
+                self.end_headers()
+                self.wfile.write(data or b"")
+
+            def log_message(self, format, *args):
+                pass
+
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+
+    def put(self, key: str, data: bytes) -> str:
+        self.payloads[key] = data
+        return f"http://127.0.0.1:{self._server.server_port}/{key}"
+
+    def close(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+
+@pytest.fixture
+def payload_store() -> Iterator[HttpPayloadStore]:
+    store = HttpPayloadStore()
+    yield store
+    store.close()
+
+
+def _get_input_json(fake_jobs_api, instance, make_launcher, run, **config) -> str:
+    launcher = make_launcher(**config)
+    launcher.launch_run(LaunchRunContext(dagster_run=run, workspace=None))
+    job_run_id = instance.get_run_by_id(run.run_id).tags[SERVERLESS_JOBS_RUN_ID]
+    return fake_jobs_api._job_runs[job_run_id]["environment_variables"]["INPUT_JSON"]
+
+
+def test_plain_payloads_are_passed_through():
+    assert decode_payload(PAYLOAD) == PAYLOAD
+
+
+def test_compressed_payload_round_trip():
+    encoded = encode_compressed_payload(compress_payload(PAYLOAD))
+
+    assert encoded.startswith(COMPRESSED_PAYLOAD_PREFIX)
+    assert len(encoded) < len(PAYLOAD)
+    assert decode_payload(encoded) == PAYLOAD
+
+
+def test_offloaded_payload_round_trip(payload_store):
+    url = payload_store.put("run/payload", compress_payload(PAYLOAD))
+
+    assert decode_payload(encode_payload_url(url)) == PAYLOAD
+
+
+def test_input_json_is_not_compressed_by_default(
+    fake_jobs_api, instance, make_launcher, create_run
+):
+    input_json = _get_input_json(fake_jobs_api, instance, make_launcher, create_run())
+
+    assert not input_json.startswith((COMPRESSED_PAYLOAD_PREFIX, URL_PAYLOAD_PREFIX))
+    assert decode_payload(input_json) == input_json
+
+
+def test_input_json_is_compressed_when_enabled(
+    fake_jobs_api, instance, make_launcher, create_run
+):
+    run = create_run()
+    plain = _get_input_json(fake_jobs_api, instance, make_launcher, run)
+    compressed = _get_input_json(
+        fake_jobs_api, instance, make_launcher, run, compress_input_json=True
+    )
+
+    assert compressed.startswith(COMPRESSED_PAYLOAD_PREFIX)
+    assert decode_payload(compressed) == plain
+
+
+def test_large_input_json_is_offloaded(
+    fake_jobs_api, instance, make_launcher, create_run, payload_store, monkeypatch
+):
+    run = create_run()
+    plain = _get_input_json(fake_jobs_api, instance, make_launcher, run)
+    launcher = make_launcher(compress_input_json=True, input_json_offload_threshold=0)
+    monkeypatch.setattr(launcher, "_payload_store", payload_store)
+
+    launcher.launch_run(LaunchRunContext(dagster_run=run, workspace=None))
+    job_run_id = instance.get_run_by_id(run.run_id).tags[SERVERLESS_JOBS_RUN_ID]
+    offloaded = fake_jobs_api._job_runs[job_run_id]["environment_variables"][
+        "INPUT_JSON"
+    ]
+
+    assert offloaded.startswith(URL_PAYLOAD_PREFIX)
+    assert len(payload_store.payloads) == 1
+    assert decode_payload(offloaded) == plain
@@ -0,0 +1,154 @@
+import dataclasses
+import json
+from typing import Iterator
+
+import pytest
+from dagster import DagsterInstance, OpExecutionContext, instance_for_test, job, op
+from dagster._core.errors import DagsterPipesExecutionError
+
+from benchmarks.fake_jobs_api import FakeJobsApi, FakeJobsApiConfig
+from dagster_scaleway.pipes import (
+    PipesObjectStorageContextInjector,
+    PipesObjectStorageMessageReader,
+    PipesScalewayServerlessJobClient,
+    _PipesScalewayServerlessJobClient,
+)
+
+IMAGE = "rg.fr-par.scw.cloud/test/workload:latest"
+
+
+@pytest.fixture
+def fake_jobs_api_config() -> FakeJobsApiConfig:
+    return FakeJobsApiConfig(run_time=0.1)
+
+
+@pytest.fixture
+def instance(fake_jobs_api: FakeJobsApi) -> Iterator[DagsterInstance]:
+    """An instance running its runs as serverless jobs, which Pipes clients share."""
+    with instance_for_test(
+        overrides={
+            "run_launcher": {
+                "module": "dagster_scaleway",
+                "class": "ScalewayServerlessJobRunLauncher",
+                "config": {
+                    "docker_image": "rg.fr-par.scw.cloud/test/launcher:latest",
+                    "region": "fr-par",
+                    "job_run_cache_ttl": 0,
+                },
+            }
+        }
+    ) as instance:
+        yield instance
+
+
+@pytest.fixture
+def pipes_client(object_storage) -> _PipesScalewayServerlessJobClient:
+    return _PipesScalewayServerlessJobClient(
+        message_reader=PipesObjectStorageMessageReader(
+            "pipes", interval=0.05, client=object_storage
+        ),
+        poll_interval=0.05,
+    )
+
+
+@op
+def pipes_op(
+    context: OpExecutionContext, pipes_client: PipesScalewayServerlessJobClient
+):
+    pipes_client.run(
+        context=context,
+        image=IMAGE,
+        command=["python", "-m", "workload"],
+        env={"WORKLOAD": "1"},
+    )
+
+
+@job
+def pipes_job():
+    pipes_op()
+
+
+def _execute(instance: DagsterInstance, pipes_client, **kwargs):
+    return pipes_job.execute_in_process(
+        instance=instance, resources={"pipes_client": pipes_client}, **kwargs
+    )
+
+
+def test_workloads_run_as_serverless_jobs(instance, pipes_client, fake_jobs_api):
+    result = _execute(instance, pipes_client)
+
+    assert result.success
+    (job_def,) = fake_jobs_api._job_definitions.values()
+    assert job_def["name"].startswith("pipes_job.pipes_op.pipes.")
+    assert (job_def["image_uri"], job_def["command"]) == (IMAGE, "python -m workload")
+    (job_run,) = fake_jobs_api._job_runs.values()
+    assert job_run["state"] == "succeeded"
+    env = job_run["environment_variables"]
+    assert (env["DAGSTER_RUN_ID"], env["WORKLOAD"]) == (result.run_id, "1")
+    assert {"DAGSTER_PIPES_CONTEXT", "DAGSTER_PIPES_MESSAGES"} <= env.keys()
+
+
+def test_job_definitions_are_reused_across_invocations(
+    instance, pipes_client, fake_jobs_api
+):
+    for _ in range(2):
+        assert _execute(instance, pipes_client).success
+
+    assert len(fake_jobs_api._job_definitions) == 1
+    assert len(fake_jobs_api._job_runs) == 2
+    assert fake_jobs_api.request_counts["POST job-definitions"] == 1
+
+
+def test_failed_job_runs_fail_the_op(
+    instance, pipes_client, fake_jobs_api, monkeypatch
+):
+    def fail(job_run):
+        if job_run["state"] == "queued":
+            fake_jobs_api._terminate(job_run, "failed", exit_code=3)
+
+    monkeypatch.setattr(fake_jobs_api, "_advance", fail)
+
+    with pytest.raises(DagsterPipesExecutionError, match="failed with exit code 3"):
+        _execute(instance, pipes_client)
+
+
+def test_interrupted_job_runs_are_stopped(
+    instance, pipes_client, fake_jobs_api, jobs_api, start_job_run
+):
+    launcher = instance.run_launcher
+    scope = launcher._get_job_definition_scope(jobs_api.client)
+    job_run = start_job_run()
+
+    pipes_client._stop_job_run(launcher, jobs_api, scope, job_run)
+    # Job runs that are already gone are left alone
+    pipes_client._stop_job_run(
+        launcher, jobs_api, scope, dataclasses.replace(job_run, id="gone")
+    )
+
+    assert fake_jobs_api._job_runs[job_run.id]["state"] == "canceled"
+
+
+def test_context_is_injected_through_object_storage(object_storage):
+    injector = PipesObjectStorageContextInjector(
+        "pipes", key_prefix="prefix/", client=object_storage
+    )
+
+    with injector.inject_context({"run_id": "abc"}) as params:
+        assert params["bucket"] == "pipes"
+        assert params["key"].startswith("prefix/")
+        stored = object_storage.objects["pipes", params["key"]]
+        assert json.loads(stored) == {"run_id": "abc"}
+
+    assert not object_storage.objects
+
+
+def test_messages_are_read_from_object_storage(object_storage):
+    reader = PipesObjectStorageMessageReader("pipes", client=object_storage)
+
+    with reader.get_params() as params:
+        object_storage.put_object(
+            Bucket="pipes", Key=f"{params['key_prefix']}/1.json", Body=b'{"a": 1}'
+        )
+
+        assert reader.download_messages_chunk(1, params) == '{"a": 1}'
+        assert reader.download_messages_chunk(2, params) is None
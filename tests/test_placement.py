@@ -0,0 +1,81 @@
+import pytest
+import scaleway
+from dagster._core.launcher import LaunchRunContext
+
+from benchmarks.fake_jobs_api import FakeJobsApiConfig
+from dagster_scaleway.rate_limit import RateLimiter
+from dagster_scaleway.serverless_job_launcher import SERVERLESS_JOBS_REGION
+
+REGIONS = [{"region": "fr-par"}, {"region": "nl-ams"}]
+
+START = "POST job-definitions/{id}/start"
+
+
+@pytest.fixture(autouse=True)
+def no_backoff(monkeypatch):
+    monkeypatch.setattr(RateLimiter, "_get_backoff_delay", lambda *args: 0.0)
+
+
+def _engine_messages(instance, run) -> list[str]:
+    return [entry.message for entry in instance.all_logs(run.run_id)]
+
+
+@pytest.mark.parametrize(
+    "fake_jobs_api_config", [FakeJobsApiConfig(quota_exceeded_regions=("fr-par",))]
+)
+def test_quota_errors_spill_over_without_retries(
+    fake_jobs_api, make_launcher, create_run, instance
+):
+    launcher = make_launcher(regions=REGIONS, region_placement="ordered")
+    run = create_run()
+    fake_jobs_api.reset_counts()
+
+    launcher.launch_run(LaunchRunContext(dagster_run=run, workspace=None))
+
+    assert instance.get_run_by_id(run.run_id).tags[SERVERLESS_JOBS_REGION] == "nl-ams"
+    assert fake_jobs_api.reset_counts()[START] == 2
+    messages = _engine_messages(instance, run)
+    assert any("spilling" in message for message in messages)
+    assert not any("retried" in message for message in messages)
+
+
+@pytest.mark.parametrize(
+    "fake_jobs_api_config",
+    [FakeJobsApiConfig(quota_exceeded_regions=("fr-par", "nl-ams"))],
+)
+def test_quota_errors_are_retried_in_the_last_region(
+    fake_jobs_api, make_launcher, create_run
+):
+    launcher = make_launcher(
+        regions=REGIONS, region_placement="ordered", api_max_retries=2
+    )
+    run = create_run()
+    fake_jobs_api.reset_counts()
+
+    with pytest.raises(scaleway.ScalewayException):
+        launcher.launch_run(LaunchRunContext(dagster_run=run, workspace=None))
+
+    # Once in fr-par, then retried twice in nl-ams
+    assert fake_jobs_api.reset_counts()[START] == 4
+
+
+@pytest.mark.parametrize(
+    "fake_jobs_api_config", [FakeJobsApiConfig(quota_exceeded_regions=("fr-par",))]
+)
+def test_launch_runs_spills_over_without_retries(
+    fake_jobs_api, make_launcher, create_run, instance
+):
+    launcher = make_launcher(regions=REGIONS, region_placement="ordered")
+    runs = [create_run() for _ in range(3)]
+    fake_jobs_api.reset_counts()
+
+    launcher.launch_runs(
+        [LaunchRunContext(dagster_run=run, workspace=None) for run in runs]
+    )
+
+    for run in runs:
+        assert (
+            instance.get_run_by_id(run.run_id).tags[SERVERLESS_JOBS_REGION] == "nl-ams"
+        )
+    # Once in fr-par with the batch, then in nl-ams as fr-par is saturated
+    assert fake_jobs_api.reset_counts()[START] == 6
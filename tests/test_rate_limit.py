@@ -0,0 +1,167 @@
+import json
+import threading
+import time
+from typing import Optional
+
+import pytest
+import requests
+from dagster._core.launcher import LaunchRunContext
+
+from benchmarks.fake_jobs_api import FakeJobsApiConfig
+from dagster_scaleway import serverless_job_launcher
+from dagster_scaleway.rate_limit import (
+    ConcurrencyGate,
+    RateLimiter,
+    RegionRateLimit,
+    TokenBucket,
+    reset_throttle_stats,
+)
+
+
+def _response(
+    status: int, body: Optional[dict] = None, headers: Optional[dict] = None
+) -> requests.Response:
+    response = requests.Response()
+    response.status_code = status
+    response._content = json.dumps(body or {}).encode()
+    response.headers.update(headers or {})
+    return response
+
+
+QUOTA_ERROR = _response(403, {"type": "quotas_exceeded"})
+
+
+class Responses:
+    """Sends the given responses in turn, then 200."""
+
+    def __init__(self, *responses: requests.Response):
+        self._responses = list(responses)
+        self.sent = 0
+
+    def __call__(self) -> requests.Response:
+        self.sent += 1
+        return self._responses.pop(0) if self._responses else _response(200)
+
+
+@pytest.fixture
+def limiter(monkeypatch) -> RateLimiter:
+    monkeypatch.setattr(RateLimiter, "_get_backoff_delay", lambda *args: 0.0)
+    reset_throttle_stats()
+    return RateLimiter(RegionRateLimit(), max_retries=2)
+
+
+@pytest.mark.parametrize(
+    "method, response",
+    [("GET", _response(429)), ("POST", _response(429)), ("GET", _response(503))],
+)
+def test_retryable_errors_are_retried(limiter, method, response):
+    send = Responses(response, response)
+
+    assert limiter.send(method, send).status_code == 200
+    assert send.sent == 3
+    stats = reset_throttle_stats()
+    assert stats.retries == 2
+    assert stats.statuses == [response.status_code] * 2
+
+
+def test_retries_are_bounded(limiter):
+    send = Responses(*[_response(429)] * 5)
+
+    assert limiter.send("GET", send).status_code == 429
+    assert send.sent == 3
+
+
+@pytest.mark.parametrize(
+    "method, response",
+    [
+        # The write may have been applied
+        ("POST", _response(503)),
+        ("GET", QUOTA_ERROR),
+        ("POST", _response(403, {"type": "permissions_denied"})),
+        ("GET", _response(404)),
+    ],
+)
+def test_other_errors_are_not_retried(limiter, method, response):
+    send = Responses(response)
+
+    assert limiter.send(method, send) is response
+    assert send.sent == 1
+
+
+def test_quota_errors_of_starts_are_retried(limiter):
+    send = Responses(QUOTA_ERROR)
+
+    assert limiter.send("POST", send).status_code == 200
+    assert send.sent == 2
+
+
+def test_backoff_honours_retry_after():
+    limiter = RateLimiter(RegionRateLimit(), base_delay=0.5, max_delay=10)
+
+    assert (
+        limiter._get_backoff_delay(0, _response(429, headers={"Retry-After": "3"})) == 3
+    )
+    assert (
+        limiter._get_backoff_delay(0, _response(429, headers={"Retry-After": "60"}))
+        == 10
+    )
+    for attempt in range(6):
+        assert (
+            0
+            <= limiter._get_backoff_delay(attempt, _response(429))
+            <= min(10, 0.5 * 2**attempt)
+        )
+
+
+def test_token_bucket_waits_beyond_the_burst():
+    bucket = TokenBucket(rate=20, burst=2)
+
+    assert bucket.acquire() == bucket.acquire() == 0
+    started = time.monotonic()
+    assert bucket.acquire() > 0
+    assert time.monotonic() - started >= 0.04
+
+
+def test_concurrency_gate_waits_for_a_slot():
+    gate = ConcurrencyGate(limit=2)
+    active = [2]
+    waits = []
+
+    def free_a_slot():
+        time.sleep(0.1)
+        active[0] = 1
+
+    threading.Thread(target=free_a_slot).start()
+    with gate.slot(lambda: active[0], 0.01, 10, waits.append) as admitted:
+        assert admitted
+        # Reserved until the job run is started
+        assert not gate.has_free_slot(1)
+
+    assert waits == [2]
+    assert gate.has_free_slot(1)
+
+
+def test_concurrency_gate_gives_up_after_the_timeout():
+    gate = ConcurrencyGate(limit=1)
+
+    with gate.slot(lambda: 1, 0.01, 0.05, lambda _: None) as admitted:
+        assert not admitted
+
+
+@pytest.mark.parametrize("fake_jobs_api_config", [FakeJobsApiConfig(run_time=0.3)])
+def test_launches_wait_for_a_job_run_slot(
+    make_launcher, create_run, instance, monkeypatch
+):
+    monkeypatch.setattr(serverless_job_launcher, "ADMISSION_POLL_INTERVAL", 0.05)
+    launcher = make_launcher(
+        rate_limits={"fr-par": {"max_concurrent_job_runs": 1}},
+        job_run_cache_ttl=0,
+    )
+    runs = [create_run() for _ in range(2)]
+
+    for run in runs:
+        launcher.launch_run(LaunchRunContext(dagster_run=run, workspace=None))
+
+    messages = [entry.message for entry in instance.all_logs(runs[1].run_id)]
+    assert any("Waiting for a Scaleway job run slot in fr-par" in m for m in messages)
+    assert not any("anyway" in m for m in messages)
@@ -0,0 +1,190 @@
+import json
+from types import SimpleNamespace
+from typing import Optional
+
+import pytest
+from dagster import job, op
+from dagster._core.definitions.reconstruct import ReconstructableJob
+from dagster._core.errors import DagsterInvalidConfigError
+from dagster._core.storage.dagster_run import DagsterRun
+
+from benchmarks.harness import benchmark_job
+from dagster_scaleway import serverless_job_context
+from dagster_scaleway.executor import ScalewayServerlessStepHandler
+from dagster_scaleway.serverless_job_context import (
+    SCALEWAY_CONFIG_TAG,
+    ScalewayServerlessJobContext,
+)
+
+
+@pytest.fixture
+def process_config_calls(monkeypatch) -> list:
+    serverless_job_context._create_for_config.cache_clear()
+    calls = []
+    process_config = serverless_job_context.process_config
+
+    def counted(*args):
+        calls.append(args)
+        return process_config(*args)
+
+    monkeypatch.setattr(serverless_job_context, "process_config", counted)
+    return calls
+
+
+def _run(container_context: Optional[dict] = None, **kwargs) -> DagsterRun:
+    origin = ReconstructableJob.for_module(
+        "benchmarks.harness", benchmark_job.name
+    ).get_python_origin()
+    origin = origin._replace(
+        repository_origin=origin.repository_origin._replace(
+            container_context=container_context
+        )
+    )
+    return DagsterRun(job_name=benchmark_job.name, job_code_origin=origin, **kwargs)
+
+
+def test_contexts_are_resolved_once_per_container_context(process_config_calls):
+    container_context = {"docker": {"cpu_limit": 2000, "env_vars": ["A=1"]}}
+
+    contexts = [
+        ScalewayServerlessJobContext.create_for_run(_run(container_context), None)
+        for _ in range(3)
+    ]
+
+    assert len(process_config_calls) == 1
+    assert contexts[0].cpu_limit == 2000
+    assert contexts[0].env_vars == ["A=1"]
+    assert all(context is contexts[0] for context in contexts)
+
+
+def test_equal_container_contexts_share_their_resolution(process_config_calls):
+    ScalewayServerlessJobContext.create_for_run(
+        _run({"docker": {"cpu_limit": 2000, "memory_limit": 4096}}), None
+    )
+    ScalewayServerlessJobContext.create_for_run(
+        _run({"docker": {"memory_limit": 4096, "cpu_limit": 2000}}), None
+    )
+    other = ScalewayServerlessJobContext.create_for_run(
+        _run({"docker": {"cpu_limit": 4000}}), None
+    )
+
+    assert len(process_config_calls) == 2
+    assert other.cpu_limit == 4000
+
+
+def test_launcher_config_is_part_of_the_key(make_launcher, process_config_calls):
+    run = _run({"docker": {"memory_limit": 4096}})
+
+    small = ScalewayServerlessJobContext.create_for_run(run, make_launcher())
+    large = ScalewayServerlessJobContext.create_for_run(
+        run, make_launcher(cpu_limit=4000)
+    )
+
+    assert (small.cpu_limit, small.memory_limit) == (1000, 4096)
+    assert (large.cpu_limit, large.memory_limit) == (4000, 4096)
+
+
+def _config_tag(**config) -> dict:
+    return {SCALEWAY_CONFIG_TAG: json.dumps(config)}
+
+
+@op(tags=_config_tag(cpu_limit=4000, memory_limit=8192))
+def large_op():
+    pass
+
+
+@op
+def small_op():
+    pass
+
+
+@job
+def sized_job():
+    large_op()
+    small_op()
+
+
+def test_config_tags_override_the_container_context(make_launcher):
+    run = _run(
+        {"docker": {"cpu_limit": 2000, "memory_limit": 4096}},
+        tags=_config_tag(memory_limit=16384),
+    )
+
+    context = ScalewayServerlessJobContext.create_for_run(run, make_launcher())
+
+    assert (context.cpu_limit, context.memory_limit) == (2000, 16384)
+
+
+def test_container_context_keeps_the_launcher_values_it_does_not_set(make_launcher):
+    run = _run({"docker": {"env_vars": ["A=1"]}})
+
+    context = ScalewayServerlessJobContext.create_for_run(
+        run, make_launcher(region="nl-ams", cpu_limit=3000)
+    )
+
+    assert (context.region, context.cpu_limit) == ("nl-ams", 3000)
+
+
+@pytest.mark.parametrize(
+    "tag_value", ["{not json", json.dumps({"cpu_limit": "many"}), '{"gpu": 1}']
+)
+def test_invalid_config_tags_are_rejected(tag_value):
+    with pytest.raises(DagsterInvalidConfigError):
+        ScalewayServerlessJobContext.create_for_run(
+            _run(tags={SCALEWAY_CONFIG_TAG: tag_value}), None
+        )
+
+
+@pytest.mark.parametrize(
+    "op_selection, limits",
+    [(["large_op"], (4000, 8192)), (["small_op"], (1000, 512)), (None, (1000, 512))],
+)
+def test_single_step_runs_are_sized_like_their_op(
+    make_launcher, instance, op_selection, limits
+):
+    run = instance.create_run_for_job(job_def=sized_job, op_selection=op_selection)
+
+    context = ScalewayServerlessJobContext.create_for_run(run, make_launcher())
+
+    assert (context.cpu_limit, context.memory_limit) == limits
+
+
+def test_steps_are_sized_from_their_op_tags(make_launcher, create_run):
+    step_handler = ScalewayServerlessStepHandler(
+        make_launcher(), {"memory_limit": 2048}
+    )
+    step_handler_context = SimpleNamespace(
+        dagster_run=create_run(tags=_config_tag(cpu_limit=2000)),
+        execute_step_args=SimpleNamespace(step_keys_to_execute=["op_0"]),
+        step_tags={"op_0": _config_tag(memory_limit=8192)},
+    )
+
+    context = step_handler._get_serverless_job_context(step_handler_context)
+
+    assert (context.cpu_limit, context.memory_limit) == (2000, 8192)
+
+
+def test_step_config_tags_are_cached_once_the_plan_is_stored(
+    make_launcher, instance, monkeypatch
+):
+    launcher = make_launcher()
+    run = instance.create_run_for_job(job_def=sized_job, op_selection=["large_op"])
+    snapshot_id = run.execution_plan_snapshot_id
+    has_snapshot = instance.has_snapshot
+
+    monkeypatch.setattr(instance, "has_snapshot", lambda snapshot_id: False)
+    assert launcher.get_single_step_config_tag(snapshot_id) is None
+
+    monkeypatch.setattr(instance, "has_snapshot", has_snapshot)
+    lookups = []
+    get_snapshot = instance.get_execution_plan_snapshot
+    monkeypatch.setattr(
+        instance,
+        "get_execution_plan_snapshot",
+        lambda snapshot_id: lookups.append(snapshot_id) or get_snapshot(snapshot_id),
+    )
+    for _ in range(2):
+        assert launcher.get_single_step_config_tag(snapshot_id) == json.dumps(
+            {"cpu_limit": 4000, "memory_limit": 8192}
+        )
+    assert lookups == [snapshot_id]
@@ -0,0 +1,145 @@
+import json
+import threading
+
+import pytest
+from dagster._core.launcher import LaunchRunContext, WorkerStatus
+
+from benchmarks.fake_jobs_api import FakeJobsApiConfig
+from dagster_scaleway.serverless_job_context import SCALEWAY_CONFIG_TAG
+from dagster_scaleway.serverless_job_launcher import (
+    SERVERLESS_JOBS_DEFINITION_ID,
+    SERVERLESS_JOBS_RUN_ID,
+)
+
+
+def _launch(launcher, instance, run):
+    launcher.launch_run(LaunchRunContext(dagster_run=run, workspace=None))
+    return instance.get_run_by_id(run.run_id)
+
+
+def test_launched_run_is_running(make_launcher, create_run, instance):
+    launcher = make_launcher(job_run_cache_ttl=0)
+    run = _launch(launcher, instance, create_run())
+
+    result = launcher.check_run_worker_health(run)
+
+    assert result.status == WorkerStatus.RUNNING
+    assert result.transient
+
+
+def test_job_run_stopped_outside_of_dagster_fails_the_run(
+    make_launcher, create_run, instance, jobs_api
+):
+    launcher = make_launcher(job_run_cache_ttl=0)
+    run = _launch(launcher, instance, create_run())
+    jobs_api.stop_job_run(job_run_id=run.tags[SERVERLESS_JOBS_RUN_ID])
+
+    result = launcher.check_run_worker_health(run)
+
+    assert result.status == WorkerStatus.FAILED
+    assert not result.transient
+
+
+def test_unchanged_job_definitions_are_reused(
+    make_launcher, create_run, instance, fake_jobs_api
+):
+    launcher = make_launcher()
+    first = _launch(launcher, instance, create_run(op_selection=["op_0"]))
+    fake_jobs_api.reset_counts()
+
+    second = _launch(launcher, instance, create_run(op_selection=["op_0"]))
+
+    assert fake_jobs_api.reset_counts() == {"POST job-definitions/{id}/start": 1}
+    assert (
+        second.tags[SERVERLESS_JOBS_DEFINITION_ID]
+        == first.tags[SERVERLESS_JOBS_DEFINITION_ID]
+    )
+
+
+def test_changed_job_definitions_are_not_rewritten(
+    make_launcher, create_run, instance, fake_jobs_api
+):
+    first = _launch(make_launcher(), instance, create_run(op_selection=["op_0"]))
+    fake_jobs_api.reset_counts()
+
+    second = _launch(
+        make_launcher(cpu_limit=2000), instance, create_run(op_selection=["op_0"])
+    )
+
+    counts = fake_jobs_api.reset_counts()
+    assert counts["POST job-definitions"] == 1
+    assert "PATCH job-definitions/{id}" not in counts
+    job_defs = [
+        fake_jobs_api._job_definitions[run.tags[SERVERLESS_JOBS_DEFINITION_ID]]
+        for run in (first, second)
+    ]
+    assert [job_def["cpu_limit"] for job_def in job_defs] == [1000, 2000]
+    assert all(job_def["name"].startswith("op_0.") for job_def in job_defs)
+
+
+@pytest.mark.parametrize(
+    "fake_jobs_api_config", [FakeJobsApiConfig(latency=0.01, latency_jitter=0.01)]
+)
+def test_concurrent_launches_start_their_own_spec(
+    make_launcher, create_run, instance, fake_jobs_api
+):
+    launcher = make_launcher()
+
+    for _ in range(5):
+        runs = [
+            create_run(
+                op_selection=["op_0"],
+                tags={SCALEWAY_CONFIG_TAG: json.dumps({"cpu_limit": cpu_limit})},
+            )
+            for cpu_limit in (1000, 4000)
+        ]
+        barrier = threading.Barrier(len(runs))
+
+        def launch(run):
+            barrier.wait()
+            launcher.launch_run(LaunchRunContext(dagster_run=run, workspace=None))
+
+        threads = [threading.Thread(target=launch, args=(run,)) for run in runs]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        job_runs = [
+            fake_jobs_api._job_runs[
+                instance.get_run_by_id(run.run_id).tags[SERVERLESS_JOBS_RUN_ID]
+            ]
+            for run in runs
+        ]
+        assert [job_run["cpu_limit"] for job_run in job_runs] == [1000, 4000]
+
+
+def test_run_payload_is_passed_when_starting_the_job_definition(
+    make_launcher, create_run, instance, fake_jobs_api
+):
+    run = _launch(make_launcher(), instance, create_run(op_selection=["op_0"]))
+
+    job_def = fake_jobs_api._job_definitions[run.tags[SERVERLESS_JOBS_DEFINITION_ID]]
+    job_run = fake_jobs_api._job_runs[run.tags[SERVERLESS_JOBS_RUN_ID]]
+    assert "INPUT_JSON" not in job_def["environment_variables"]
+    assert job_run["environment_variables"]["DAGSTER_RUN_ID"] == run.run_id
+    assert run.run_id in job_run["environment_variables"]["INPUT_JSON"]
+
+
+def test_deleted_job_definitions_are_recreated(
+    make_launcher, create_run, instance, fake_jobs_api
+):
+    launcher = make_launcher()
+    first = _launch(launcher, instance, create_run(op_selection=["op_0"]))
+    del fake_jobs_api._job_definitions[first.tags[SERVERLESS_JOBS_DEFINITION_ID]]
+    fake_jobs_api.reset_counts()
+
+    second = _launch(launcher, instance, create_run(op_selection=["op_0"]))
+
+    # Listed again after the failed start, then created and started
+    assert fake_jobs_api.reset_counts() == {
+        "POST job-definitions/{id}/start": 2,
+        "GET job-definitions": 1,
+        "POST job-definitions": 1,
+    }
+    assert SERVERLESS_JOBS_RUN_ID in second.tags
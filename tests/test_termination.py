@@ -0,0 +1,143 @@
+import threading
+
+import pytest
+from dagster import DagsterRunStatus
+from dagster._core.launcher import LaunchRunContext
+
+from benchmarks.fake_jobs_api import FakeJobsApiConfig
+from dagster_scaleway.serverless_job_launcher import SERVERLESS_JOBS_RUN_ID
+from dagster_scaleway.termination import (
+    TERMINATION_ALREADY_FINISHED,
+    TERMINATION_NOT_FOUND,
+    TERMINATION_NOT_LAUNCHED,
+    TERMINATION_STOP_DEFERRED,
+    TERMINATION_STOPPED,
+    TERMINATION_STOPPED_QUEUED,
+    DeferredStops,
+    TerminationReport,
+)
+
+QUEUED = FakeJobsApiConfig(queue_time=3600)
+
+
+@pytest.fixture
+def launch(make_launcher, create_run, instance):
+    """Launches runs with a launcher shared by the test, returning them up to date."""
+    launcher = make_launcher(job_run_cache_ttl=0)
+
+    def launch_runs(count: int):
+        runs = [create_run() for _ in range(count)]
+        for run in runs:
+            launcher.launch_run(LaunchRunContext(dagster_run=run, workspace=None))
+        return launcher, [instance.get_run_by_id(run.run_id) for run in runs]
+
+    return launch_runs
+
+
+def _job_run(fake_jobs_api, run):
+    return fake_jobs_api._job_runs[run.tags[SERVERLESS_JOBS_RUN_ID]]
+
+
+def test_running_job_runs_are_stopped(launch, instance, fake_jobs_api):
+    launcher, (run,) = launch(1)
+
+    assert launcher.terminate(run.run_id)
+
+    assert _job_run(fake_jobs_api, run)["state"] == "canceled"
+    # The run worker reports the cancellation
+    assert instance.get_run_by_id(run.run_id).status == DagsterRunStatus.CANCELING
+
+
+@pytest.mark.parametrize("fake_jobs_api_config", [QUEUED])
+def test_runs_are_terminated_in_bulk(launch, instance, create_run, fake_jobs_api):
+    launcher, runs = launch(3)
+    _job_run(fake_jobs_api, runs[2]).update(state="succeeded")
+    fake_jobs_api.reset_counts()
+    not_launched = create_run()
+
+    report = launcher.terminate_runs(
+        [*(run.run_id for run in runs), not_launched.run_id, "unknown"]
+    )
+
+    assert report.outcomes == {
+        runs[0].run_id: TERMINATION_STOPPED_QUEUED,
+        runs[1].run_id: TERMINATION_STOPPED_QUEUED,
+        runs[2].run_id: TERMINATION_ALREADY_FINISHED,
+        not_launched.run_id: TERMINATION_NOT_LAUNCHED,
+        "unknown": TERMINATION_NOT_FOUND,
+    }
+    assert report.terminated == [runs[0].run_id, runs[1].run_id]
+    # Job runs are resolved with a listing instead of a GET each
+    assert fake_jobs_api.request_counts["GET job-runs"] == 1
+    assert fake_jobs_api.request_counts["GET job-runs/{id}"] == 0
+    # No run worker will report it
+    for run in runs[:2]:
+        assert instance.get_run_by_id(run.run_id).status == DagsterRunStatus.CANCELED
+
+
+@pytest.mark.parametrize(
+    "fake_jobs_api_config",
+    [FakeJobsApiConfig(queue_time=3600, refuse_stopping_queued=True)],
+)
+def test_queued_job_runs_are_stopped_once_started(launch, instance, fake_jobs_api):
+    launcher, (run,) = launch(1)
+
+    report = launcher.terminate_runs([run.run_id])
+
+    assert report.outcomes == {run.run_id: TERMINATION_STOP_DEFERRED}
+    assert instance.get_run_by_id(run.run_id).status == DagsterRunStatus.CANCELED
+    assert launcher._deferred_stops.pending == 1
+
+    job_run = _job_run(fake_jobs_api, run)
+    scope = ("fr-par", job_run["project_id"])
+    # Still queued
+    assert launcher._stop_dequeued_job_runs(scope, [job_run["id"]]) == []
+    job_run["state"] = "running"
+    assert launcher._stop_dequeued_job_runs(scope, [job_run["id"]]) == [job_run["id"]]
+    assert job_run["state"] == "canceled"
+
+
+def test_deferred_stops_are_polled_until_done():
+    polled = []
+    done = threading.Event()
+
+    def stop_dequeued(scope, job_run_ids):
+        polled.append(sorted(job_run_ids))
+        if len(polled) == 2:
+            done.set()
+            return ["a"]
+        return []
+
+    stops = DeferredStops(stop_dequeued, poll_interval=0.01, timeout=3600)
+    stops.add(("fr-par", "project"), "a")
+    stops.add(("fr-par", "project"), "b")
+
+    assert done.wait(10)
+    assert polled[:2] == [["a", "b"], ["a", "b"]]
+    stops.close()
+
+
+def test_deferred_stops_are_given_up_after_the_timeout():
+    stops = DeferredStops(lambda scope, job_run_ids: [], poll_interval=0.01, timeout=0)
+    stops.add(("fr-par", "project"), "a")
+
+    stops._thread.join(10)
+
+    assert stops.pending == 0
+
+
+def test_termination_report_format():
+    report = TerminationReport(
+        outcomes={
+            "a": TERMINATION_STOPPED,
+            "b": TERMINATION_STOPPED,
+            "c": "failed",
+        },
+        errors={"c": "Internal error"},
+    )
+
+    assert report.format().splitlines() == [
+        "Failed to terminate Dagster run c: Internal error",
+        "1 failed, 2 stopped",
+    ]
+    assert TerminationReport({}, {}).format() == "No run to terminate"
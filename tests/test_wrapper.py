@@ -0,0 +1,65 @@
+import os
+import re
+import signal
+import subprocess
+import sys
+
+import pytest
+
+WRAPPER = [sys.executable, "-c", "from dagster_scaleway.cli import main; main()"]
+
+
+def _wrap(script: str, *options: str, **kwargs) -> subprocess.Popen:
+    # INPUT_JSON is appended to the wrapped command, where the script sees it as $0
+    return subprocess.Popen(
+        [*WRAPPER, *options, "sh", "-c", script],
+        env={**os.environ, "INPUT_JSON": "payload"},
+        stdout=subprocess.PIPE,
+        **kwargs,
+    )
+
+
+def test_output_is_relayed_unchanged():
+    proc = _wrap("printf 'first\\nsecond\\r\\npartial'; printf '\\377\\000' >&2")
+    stdout, _ = proc.communicate(timeout=30)
+
+    assert stdout == b"first\nsecond\r\npartial\xff\x00"
+    assert proc.returncode == 0
+
+
+def test_exit_status_is_propagated():
+    proc = _wrap("echo $0; exit 3")
+    stdout, _ = proc.communicate(timeout=30)
+
+    assert stdout == b"payload\n"
+    assert proc.returncode == 3
+
+
+def test_timestamped_lines():
+    proc = _wrap("printf 'a\\nb\\n'", "--log-mode", "timestamped")
+    stdout, _ = proc.communicate(timeout=30)
+
+    lines = stdout.decode().splitlines()
+    assert [line.split(" ", 1)[1] for line in lines] == ["a", "b"]
+    assert all(re.match(r"\d{4}-\d\d-\d\dT[\d:.]+\+00:00 ", line) for line in lines)
+
+
+def test_wrapper_dies_from_the_signal_that_killed_the_command():
+    proc = _wrap("kill -KILL $$")
+    proc.communicate(timeout=30)
+
+    assert proc.returncode == -signal.SIGKILL
+
+
+@pytest.mark.parametrize("signum", [signal.SIGTERM, signal.SIGINT])
+def test_signals_are_forwarded_to_the_command(signum):
+    proc = _wrap(
+        f"trap 'echo stopped; exit 42' {signum.name[3:]}; echo ready; while :; do sleep 0.05; done"
+    )
+    assert proc.stdout.readline() == b"ready\n"
+
+    proc.send_signal(signum)
+    stdout, _ = proc.communicate(timeout=30)
+
+    assert stdout == b"stopped\n"
+    assert proc.returncode == 42